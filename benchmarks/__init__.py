@@ -0,0 +1,7 @@
+"""
+Benchmarks for the lexical analyzer.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+
+Run one with python -m benchmarks.<name>, or all with make bench.
+"""
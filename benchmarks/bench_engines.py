@@ -0,0 +1,40 @@
+"""
+Benchmark: differential run of every matching engine on random expressions.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+
+Usage: python -m benchmarks.bench_engines [--cases N] [--seed S] [--length L]
+
+Every registered engine runs the same random tags and texts; any case on
+which an engine disagrees with the "nfa" reference is printed and the exit
+status is 1. The timings include building each engine's matchers.
+"""
+
+import argparse
+import sys
+
+from src.application.differential import run_differential
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--length", type=int, default=200)
+    args = parser.parse_args()
+
+    report = run_differential(args.cases, args.seed, max_length=args.length)
+
+    print(f"{report.cases} cases, texts up to {args.length} characters")
+    print(f"  {'engine':<12} {'time':>9}")
+    for name, seconds in report.timings.items():
+        print(f"  {name:<12} {seconds:>8.3f}s")
+
+    for mismatch in report.mismatches:
+        print(f"[MISMATCH] {mismatch.engine}: {mismatch.expressions} on {mismatch.text!r}")
+    if report.mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
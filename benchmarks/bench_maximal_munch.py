@@ -0,0 +1,57 @@
+"""
+Benchmark: plain and memoized (linear_time) longest-match tokenization.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+
+Usage: python -m benchmarks.bench_maximal_munch [--max-size N]
+
+On the pathological cases the plain scan reads to the end of the input for
+every token, so its time grows with the square of the input size; the
+memoized scan grows linearly.
+"""
+
+import argparse
+import time
+
+from src.application.lexer import LexicalAnalyzer
+from src.domain.tag import Tag
+
+# (description, tag definitions, input builder)
+CASES = [
+    ("a^n with a*.b and a", [("AB", "a*b."), ("A", "a")], lambda n: "a" * n),
+    (
+        "(ab)^n with (a.b)*.c, a and b",
+        [("ABC", "ab.*c."), ("A", "a"), ("B", "b")],
+        lambda n: "ab" * (n // 2),
+    ),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-size", type=int, default=8000)
+    args = parser.parse_args()
+
+    sizes = []
+    size = 1000
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 2
+
+    for description, definitions, build in CASES:
+        tags = [Tag(name, expression) for name, expression in definitions]
+        print(description)
+        print(f"  {'size':>8} {'plain':>10} {'linear':>10}")
+        for size in sizes:
+            text = build(size)
+            timings = []
+            for linear_time in (False, True):
+                lexer = LexicalAnalyzer(tags, linear_time=linear_time)
+                start = time.perf_counter()
+                lexer.tokenize(text)
+                timings.append(time.perf_counter() - start)
+            print(f"  {size:>8} {timings[0]:>9.3f}s {timings[1]:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
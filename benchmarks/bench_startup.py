@@ -0,0 +1,69 @@
+"""
+Benchmark: startup time of :c on a large tag file followed by the first :p.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+
+Usage: python -m benchmarks.bench_startup [--tags N]
+
+With lazy compilation :c only parses the expressions, and the first :p
+builds the automata of the few tags its input reaches; eager compilation
+builds every automaton during :c.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.application.command_handler import CommandHandler
+
+DIGITS = "01+2+3+4+5+6+7+8+9+"
+
+
+def concatenation(word: str) -> str:
+    """RPN expression matching exactly word."""
+    return word[0] + "".join(f"{char}." for char in word[1:])
+
+
+def write_tag_file(path: str, count: int):
+    """Keyword tags, plus keyword-prefixed numbered names that need automata."""
+    rng = random.Random(41)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            word = "".join(rng.choice("abcdefghij") for _ in range(rng.randint(3, 8)))
+            if i % 2:
+                f.write(f"KEYWORD{i}: {concatenation(word)}\n")
+            else:
+                f.write(f"NAME{i}: {concatenation(word)}{DIGITS}{DIGITS}*..\n")
+        f.write(f"NUMBER: {DIGITS}{DIGITS}*.\n")
+        f.write("SEPARATOR: ;\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tags", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tags.lex")
+        write_tag_file(path, args.tags)
+        text = ";".join(["1037", "42", "7"] * 50)
+
+        print(f"{args.tags} tags")
+        print(f"  {'mode':<12} {':c':>9} {'first :p':>9} {'total':>9}")
+        for mode in ("lazy", "eager", "background"):
+            handler = CommandHandler()
+            handler.set_compilation(mode)
+            start = time.perf_counter()
+            handler.load_tags_from_file(path, workers=1)
+            loaded = time.perf_counter()
+            handler.process_input(text)
+            done = time.perf_counter()
+            print(
+                f"  {mode:<12} {loaded - start:>8.3f}s {done - loaded:>8.3f}s {done - start:>8.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
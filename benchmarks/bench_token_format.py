@@ -0,0 +1,73 @@
+"""
+Benchmark: size and read speed of the binary token format against text output.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+
+Usage: python -m benchmarks.bench_token_format [--tokens N]
+"""
+
+import argparse
+import io
+import random
+import time
+
+from src.application.token_format import BinaryTokenReader, BinaryTokenWriter
+from src.application.token_stream import TokenStream
+
+NAMES = ("IDENTIFIER", "SPACE", "NUMBER", "EQUALS", "SEMICOLON", "KEYWORD_IF", "STRING", "NEWLINE")
+
+
+def build_stream(count: int) -> list[tuple[int, int, int]]:
+    """Random (token id, start, end) records with contiguous spans."""
+    rng = random.Random(33)
+    records = []
+    pos = 0
+    for _ in range(count):
+        size = rng.randint(1, 8)
+        records.append((rng.randrange(len(NAMES)), pos, pos + size))
+        pos += size
+    return records
+
+
+def timed(label: str, function):
+    """Run function once and print its wall time."""
+    start = time.perf_counter()
+    result = function()
+    print(f"  {label:<32} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=600_000)
+    args = parser.parse_args()
+
+    records = build_stream(args.tokens)
+    stream = TokenStream(NAMES)
+    for token_id, _, _ in records:
+        stream.append(token_id)
+    text = stream.to_text()
+
+    encoded = {}
+    for spans in (False, True):
+        out = io.BytesIO()
+        writer = BinaryTokenWriter(out, NAMES, spans=spans)
+        writer.write_all(records)
+        writer.close()
+        encoded[spans] = out.getvalue()
+
+    print(f"{args.tokens} tokens")
+    print(f"  {'text size':<32} {len(text.encode('utf-8')):8d} bytes")
+    print(f"  {'binary size':<32} {len(encoded[False]):8d} bytes")
+    print(f"  {'binary-spans size':<32} {len(encoded[True]):8d} bytes")
+
+    print("read")
+    timed("text: decode + split", lambda: text.encode("utf-8").decode("utf-8").split())
+    for spans, label in ((False, "binary"), (True, "binary-spans")):
+        data = encoded[spans]
+        timed(f"{label}: ids", lambda d=data: list(BinaryTokenReader(io.BytesIO(d)).iter_ids()))
+        timed(f"{label}: tokens", lambda d=data: list(BinaryTokenReader(io.BytesIO(d))))
+
+
+if __name__ == "__main__":
+    main()
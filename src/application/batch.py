@@ -0,0 +1,172 @@
+"""
+Tokenization of many files, in a process pool with the tags compiled in each worker.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import glob
+import io
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+from ..domain.tag import CompiledExpression, Tag
+from .compiled_lexer import CompiledLexer
+from .lexer import LexError, LexicalAnalyzer
+from .parallel_compile import open_pool, pool_workers
+from .token_format import BinaryTokenWriter
+
+# Fewest files worth a process pool (see pool_workers)
+PARALLEL_FILES = 8
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+@dataclass
+class FileResult:
+    """
+    Outcome of tokenizing one file: its output (str for the text format,
+    a binary frame otherwise) and recovery errors, or why it failed.
+    """
+
+    path: str
+    output: str | bytes | None = None
+    errors: list[LexError] = field(default_factory=list)
+    failure: str | None = None
+
+
+def expand_inputs(patterns: Iterable[str]) -> tuple[list[str], list[str]]:
+    """
+    Files named by paths, directories (every file below them) and glob patterns
+    (** matches directories recursively), each once, in sorted order per pattern.
+    An existing file is taken as named even if its name has glob characters.
+    Plain paths are kept even if missing, so they fail as files.
+    Returns (paths, patterns that matched no file).
+    """
+    paths: dict[str, None] = {}
+    unmatched = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = [
+                os.path.join(root, name) for root, _, names in os.walk(pattern) for name in names
+            ]
+        elif _GLOB_CHARS & set(pattern) and not os.path.isfile(pattern):
+            found = [path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)]
+        else:
+            found = [pattern]
+        if not found:
+            unmatched.append(pattern)
+        paths.update(dict.fromkeys(sorted(found)))
+    return list(paths), unmatched
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def tokenize_file(
+    snapshot: CompiledLexer, path: str, recover: bool = False, output_format: str = "text"
+) -> FileResult:
+    """Tokenize one file in an output format (see CommandHandler.OUTPUT_FORMATS)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return FileResult(path, failure=f"File not found: {path}")
+    except Exception as e:
+        return FileResult(path, failure=f"Error reading file: {e}")
+
+    try:
+        if output_format == "text":
+            output, errors = snapshot.tokenize_to_text(text, recover)
+            return FileResult(path, output, errors)
+
+        lexer = snapshot.lexer
+        found: list[LexError] | None = [] if recover else None
+        frame = io.BytesIO()
+        writer = BinaryTokenWriter(frame, lexer.token_names, spans=output_format == "binary-spans")
+        writer.write_all(lexer.iter_token_spans(text, found))
+        writer.close()
+        return FileResult(path, frame.getvalue(), LexicalAnalyzer.locate_errors(text, found or []))
+    except ValueError as e:
+        return FileResult(path, failure=str(e))
+
+
+# Tag set and options of a worker process, set once by _init_worker
+_worker: tuple[CompiledLexer, bool, str]
+
+
+def _init_worker(
+    definitions: list[tuple[str, str, str, tuple, bool]],
+    max_dfa_states: int | None,
+    recover: bool,
+    output_format: str,
+):
+    """Rebuild the tag set from its compiled automata, so workers never compile."""
+    global _worker
+    tags = [
+        Tag(name, expression, construction, CompiledExpression.from_compact(compact), skip=skip)
+        for name, expression, construction, compact, skip in definitions
+    ]
+    _worker = (CompiledLexer(tags, max_dfa_states), recover, output_format)
+
+
+def _tokenize_in_worker(path: str) -> FileResult:
+    snapshot, recover, output_format = _worker
+    return tokenize_file(snapshot, path, recover, output_format)
+
+
+def tokenize_files(
+    snapshot: CompiledLexer,
+    paths: list[str],
+    recover: bool = False,
+    output_format: str = "text",
+    workers: int | None = None,
+) -> Iterator[FileResult]:
+    """
+    Tokenize files, yielding their results in the order of paths.
+
+    With at least PARALLEL_FILES files and more than one worker (the CPU count
+    by default), files go to a process pool whose workers each load the
+    compiled tag set once. The largest files are submitted first, so no
+    worker is left with a big file at the end, and finished results wait
+    only for the files before them. A failing file is reported in its result
+    and the others still run.
+    """
+    workers = pool_workers(workers, len(paths), PARALLEL_FILES)
+    pool = None
+    if workers:
+        definitions = [
+            (tag.name, tag.expression, tag.construction, tag.compiled.to_compact(), tag.skip)
+            for tag in snapshot.tags
+        ]
+        pool = open_pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(definitions, snapshot.max_dfa_states, recover, output_format),
+        )
+    if pool is None:
+        for path in paths:
+            yield tokenize_file(snapshot, path, recover, output_format)
+        return
+
+    with pool:
+        by_size = sorted(range(len(paths)), key=lambda i: _size(paths[i]), reverse=True)
+        futures = {pool.submit(_tokenize_in_worker, paths[i]): i for i in by_size}
+        done: dict[int, FileResult] = {}
+        next_index = 0
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                result = FileResult(paths[index], failure=f"Worker failed: {e}")
+            done[index] = result
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
@@ -0,0 +1,100 @@
+"""
+Byte-mode lexical analyzer for undecoded input.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import re
+from collections.abc import Iterator
+
+from ..domain.byte_dfa import ByteDFA, ByteInput
+from ..domain.dfa_cache import LazyDFA
+from ..domain.literal_trie import LiteralTrie
+from ..domain.tag import Tag
+from .lexer import LexError, LexicalAnalyzer
+from .line_index import LineIndex
+
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+_NEWLINES = re.compile(b"\n")
+
+
+class ByteLexicalAnalyzer(LexicalAnalyzer):
+    """
+    LexicalAnalyzer over bytes, bytearray, memoryview or mmap input.
+
+    Input is never decoded: literal words live in a trie keyed by byte values,
+    the dispatch index is keyed by the first byte, and every residual automaton
+    runs as a ByteDFA with 256-entry rows. Positions are byte offsets, and the
+    tokens are the same as LexicalAnalyzer produces on the ASCII-decoded text.
+
+    Tag symbols must be ASCII. Non-ASCII input bytes are handled according to
+    non_ascii: ERROR rejects the input with a ValueError naming the first such
+    byte before anything is scanned; WILDCARD treats each byte 0x80-0xff as one
+    symbol that only wildcard transitions match, so a multi-byte UTF-8
+    character is as many wildcard matches as it has bytes.
+    """
+
+    ERROR = "error"
+    WILDCARD = "wildcard"
+    NON_ASCII_POLICIES = (ERROR, WILDCARD)
+
+    def __init__(
+        self,
+        tags: list[Tag],
+        max_dfa_states: int | None = LazyDFA.DEFAULT_MAX_STATES,
+        linear_time: bool = False,
+        non_ascii: str = ERROR,
+    ):
+        if non_ascii not in self.NON_ASCII_POLICIES:
+            raise ValueError(f"Unknown non-ASCII policy: {non_ascii}")
+        for tag in tags:
+            # Escapes are ASCII, so this is checked without building automata
+            if not tag.expression.isascii():
+                raise ValueError(f"Tag '{tag.name}' uses non-ASCII symbols")
+        self.non_ascii = non_ascii
+        super().__init__(tags, max_dfa_states, linear_time)
+
+    @staticmethod
+    def is_ascii(data: ByteInput) -> bool:
+        """Check whether data has no byte 0x80-0xff."""
+        return _NON_ASCII.search(data) is None
+
+    def _build_literal_trie(self):
+        """Collect the literal words of every tag into one trie keyed by byte values."""
+        self._trie = LiteralTrie()
+        for priority, tag in enumerate(self.tags):
+            for word in tag.literals:
+                self._trie.add(word.encode("ascii"), priority)
+
+    @staticmethod
+    def _dispatch_key(char: str) -> str | int:
+        """Dispatch index key of a first character: its byte value."""
+        return ord(char)
+
+    def _tag_matcher(self, tag: Tag) -> ByteDFA:
+        """ByteDFA over a tag's residual automaton, whatever the engine."""
+        return ByteDFA(tag.residual_simulator(), self.max_dfa_states)
+
+    @staticmethod
+    def _line_ends(text: ByteInput) -> Iterator[int]:
+        """Positions just after each line feed byte of text."""
+        return (newline.end() for newline in _NEWLINES.finditer(text))
+
+    @staticmethod
+    def _text(text: ByteInput, start: int, end: int) -> str:
+        """Input between start and end, with non-ASCII bytes escaped."""
+        return bytes(text[start:end]).decode("ascii", "backslashreplace")
+
+    def _scan(
+        self, text: ByteInput, errors: list[LexError] | None = None, start: int = 0
+    ) -> Iterator[tuple[int, int, int]]:
+        """Check the input against the non-ASCII policy, then scan it like LexicalAnalyzer."""
+        if self.non_ascii == self.ERROR:
+            found = _NON_ASCII.search(text)
+            if found is not None:
+                position = found.start()
+                raise ValueError(
+                    f"Non-ASCII byte 0x{text[position]:02x} at position {position}"
+                    f" ({LineIndex(text).describe(position)})"
+                )
+        yield from super()._scan(text, errors, start)
@@ -0,0 +1,190 @@
+"""
+Checkpoints of long file tokenizations, so an interrupted run can resume.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, replace
+
+from ..domain.tag import Tag
+from .compiled_lexer import CompiledLexer
+from .lexer import LexError
+
+# Characters of input scanned between checkpoints
+CHECKPOINT_INTERVAL = 1 << 22
+
+# Appended to the output path to name its checkpoint file
+CHECKPOINT_SUFFIX = ".ckpt"
+
+
+def tag_set_hash(tags: Iterable[Tag]) -> str:
+    """Hash of the tag definitions, in order, and how their automata are built."""
+    digest = hashlib.blake2b(digest_size=16)
+    for tag in tags:
+        digest.update(f"{tag.definition}\0{tag.construction}\n".encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def checkpoint_path(output_path: str) -> str:
+    """Checkpoint file kept next to an output file."""
+    return output_path + CHECKPOINT_SUFFIX
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    A token boundary reached by a tokenization of input_path and written out.
+    input_size and input_mtime_ns identify the version of the input scanned;
+    input_offset is the character offset of the boundary in the input,
+    output_offset the byte size of the output file once the tokens before it
+    were written, and line_offset its size before the run began its line;
+    tokens and errors count what was emitted up to there.
+    """
+
+    input_path: str
+    input_size: int
+    input_mtime_ns: int
+    input_offset: int
+    output_offset: int
+    line_offset: int
+    tag_hash: str
+    recover: bool = False
+    tokens: int = 0
+    errors: int = 0
+
+    def save(self, path: str):
+        """Write the checkpoint, replacing the previous one in a single step."""
+        temporary = path + ".tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(asdict(self), f)
+            os.replace(temporary, path)
+        except OSError as e:
+            raise Exception(f"Error writing checkpoint: {e}") from e
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        """Read a checkpoint written by save. Raises ValueError if it is malformed."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(**json.load(f))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid checkpoint {path}: {e}") from e
+
+
+def tokenize_resumable(
+    snapshot: CompiledLexer,
+    text: str,
+    input_path: str,
+    output_path: str,
+    recover: bool = False,
+    resume: bool = False,
+    interval: int = CHECKPOINT_INTERVAL,
+    on_checkpoint: Callable[[Checkpoint], None] | None = None,
+) -> tuple[Checkpoint, list[LexError]]:
+    """
+    Tokenize text read from input_path into one line of tag names appended to
+    output_path, recording a checkpoint (see checkpoint_path) at the first
+    token boundary after every interval characters of input.
+
+    Tokens are only written at checkpoints, so the output file never holds
+    more than the last checkpoint has recorded. With resume and a checkpoint
+    present, the output file is truncated back to the checkpoint's offset
+    and scanning continues at its input offset, which gives the same output
+    as an uninterrupted run; the checkpoint must be of the same input, left
+    unchanged since (same size and modification time), and of the same tag
+    set and recovery mode, or ValueError is raised. The checkpoint file is
+    removed once the line is complete. If the scan raises ValueError, which
+    a resume would raise again, the output file is truncated back to where
+    the line began and the checkpoint file is removed too.
+
+    on_checkpoint is called with each checkpoint after it is saved.
+    Returns the final counters, as a checkpoint at the end of the input, and
+    the errors found in recovery mode since the run started or resumed.
+    """
+    state_path = checkpoint_path(output_path)
+    tag_hash = tag_set_hash(snapshot.tags)
+    source = os.path.abspath(input_path)
+    try:
+        info = os.stat(input_path)
+    except OSError as e:
+        raise Exception(f"Error reading file: {e}") from e
+    state = None
+    if resume and os.path.exists(state_path):
+        state = Checkpoint.load(state_path)
+        if state.input_path != source:
+            raise ValueError(
+                f"Checkpoint {state_path} belongs to another input: {state.input_path}"
+            )
+        if (state.input_size, state.input_mtime_ns) != (info.st_size, info.st_mtime_ns):
+            raise ValueError(f"Input file {input_path} changed since checkpoint {state_path}")
+        if state.tag_hash != tag_hash:
+            raise ValueError(f"Checkpoint {state_path} was recorded with a different tag set")
+        if state.recover != recover:
+            raise ValueError(f"Checkpoint {state_path} was recorded with another recovery mode")
+
+    errors: list[LexError] | None = [] if recover else None
+    names = snapshot.token_names
+    try:
+        with open(output_path, "ab") as f:
+            if state is None:
+                start = f.tell()
+                state = Checkpoint(
+                    source, info.st_size, info.st_mtime_ns, 0, start, start, tag_hash, recover
+                )
+                state.save(state_path)
+            elif os.fstat(f.fileno()).st_size < state.output_offset:
+                raise ValueError(f"Output file {output_path} is shorter than its checkpoint")
+            else:
+                # Drop whatever was written after the checkpoint
+                f.truncate(state.output_offset)
+
+            tokens = state.tokens
+            earlier_errors = state.errors
+            separator = " " if tokens else ""
+            pending: list[str] = []
+            next_checkpoint = state.input_offset + interval
+            spans = snapshot.lexer.iter_token_spans(text, errors, state.input_offset)
+            try:
+                for token_id, _, end in spans:
+                    pending.append(names[token_id])
+                    if end < next_checkpoint:
+                        continue
+                    f.write((separator + " ".join(pending)).encode("utf-8"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                    tokens += len(pending)
+                    pending.clear()
+                    separator = " "
+                    state = replace(
+                        state,
+                        input_offset=end,
+                        output_offset=f.tell(),
+                        tokens=tokens,
+                        errors=earlier_errors + len(errors or []),
+                    )
+                    state.save(state_path)
+                    if on_checkpoint is not None:
+                        on_checkpoint(state)
+                    next_checkpoint = end + interval
+
+                f.write((separator + " ".join(pending) + "\n").encode("utf-8"))
+                state = replace(
+                    state,
+                    input_offset=len(text),
+                    output_offset=f.tell(),
+                    tokens=tokens + len(pending),
+                    errors=earlier_errors + len(errors or []),
+                )
+            except ValueError:
+                f.truncate(state.line_offset)
+                os.remove(state_path)
+                raise
+    except OSError as e:
+        raise Exception(f"Error writing to output file: {e}") from e
+    os.remove(state_path)
+    return state, errors or []
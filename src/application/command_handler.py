@@ -4,118 +4,565 @@ Command handler for the interactive interpreter.
 Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 """
 
-from ..domain.tag import Tag, TagDefinitionParser
-from .lexer import LexicalAnalyzer
+import hashlib
+import mmap
+import os
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from typing import TextIO
+
+from ..domain.byte_dfa import ByteInput
+from ..domain.dfa_cache import LazyDFA
+from ..domain.tag import CompiledExpression, Tag, TagDefinitionParser
+from .batch import PARALLEL_FILES, FileResult, tokenize_files
+from .byte_lexer import ByteLexicalAnalyzer
+from .checkpoint import CHECKPOINT_INTERVAL, Checkpoint, tokenize_resumable
+from .compiled_lexer import CompiledLexer
+from .lexer import LexError, LexicalAnalyzer
+from .memory_report import MemoryReport, measure
+from .parallel_compile import PARALLEL_THRESHOLD, compile_expressions
+from .result_cache import ResultCache
+from .token_format import BinaryTokenWriter
 
 
 class CommandHandler:
     """Handles all commands for the lexical analyzer."""
 
+    # Output formats: space-separated names, or binary frames with or without spans
+    OUTPUT_FORMATS = ("text", "binary", "binary-spans")
+
+    # When the automata of tags loaded with :c are built: on first use, before
+    # load_tags_from_file returns, or in a background thread (see warm)
+    COMPILATION_MODES = ("lazy", "eager", "background")
+
+    # Characters of text output gathered before each write (see write_output_chunks)
+    OUTPUT_BUFFER = 1 << 16
+
     def __init__(self):
-        self.tags: list[Tag] = []
         self.output_file: str | None = None
-        self.lexer: LexicalAnalyzer | None = None
+        self.output_format = "text"
+        # State budget of each tag's lazy DFA cache (None disables the caches)
+        self.max_dfa_states: int | None = LazyDFA.DEFAULT_MAX_STATES
+        # The current tag set; replaced, never modified, when tags change
+        self._snapshot = CompiledLexer(max_dfa_states=self.max_dfa_states)
+        # Serializes tag set changes; readers never take it
+        self._publish_lock = threading.Lock()
+        self.recover = False
+        self.compilation = "lazy"
+        self.last_errors: list[LexError] = []
+        # Optional cache of process_input/process_file results (see ResultCache)
+        self.result_cache: ResultCache | None = None
+
+    @property
+    def snapshot(self) -> CompiledLexer:
+        """The current tag set; keep it for the whole of an operation."""
+        return self._snapshot
+
+    @property
+    def tags(self) -> list[Tag]:
+        """Tags of the current snapshot, in definition order."""
+        return list(self._snapshot.tags)
+
+    @property
+    def lexer(self) -> LexicalAnalyzer | None:
+        """The calling thread's lexer for the current tags, None without tags."""
+        snapshot = self._snapshot
+        return snapshot.lexer if snapshot else None
+
+    @property
+    def byte_lexer(self) -> ByteLexicalAnalyzer | None:
+        """The calling thread's byte-mode lexer, None without tags or with non-ASCII tags."""
+        snapshot = self._snapshot
+        return snapshot.byte_lexer if snapshot else None
+
+    @property
+    def tag_version(self) -> int:
+        """Bumped whenever the tag set changes, so cached results of older sets never match."""
+        return self._snapshot.version
 
     def add_tag(self, tag: Tag) -> bool:
         """
         Add a tag definition.
         Returns True if added, False if duplicate name.
+        Raises ValueError for the name reserved for recovery error tokens.
         """
-        # Check for duplicate names
-        if any(t.name == tag.name for t in self.tags):
-            return False
+        if tag.name == LexicalAnalyzer.ERROR_TOKEN:
+            raise ValueError(f"Tag name '{tag.name}' is reserved")
 
-        self.tags.append(tag)
-        self.lexer = LexicalAnalyzer(self.tags)
+        with self._publish_lock:
+            # Check for duplicate names
+            if any(t.name == tag.name for t in self._snapshot.tags):
+                return False
+            self._publish([tag])
         return True
 
+    def _publish(self, tags: list[Tag]):
+        """Replace the snapshot with one that also has tags; the caller holds _publish_lock."""
+        self._snapshot = self._snapshot.with_tags(tags, self.max_dfa_states)
+
+    def _current(self) -> CompiledLexer:
+        """The current snapshot. Raises ValueError if it has no tags."""
+        snapshot = self._snapshot
+        if not snapshot:
+            raise ValueError("No tags defined")
+        return snapshot
+
     def parse_tag_line(self, line: str) -> Tag | None:
         """Parse a tag definition line."""
         return TagDefinitionParser.parse(line)
 
-    def load_tags_from_file(self, filepath: str) -> tuple[list[Tag], list[str]]:
+    def load_tags_from_file(
+        self, filepath: str, workers: int | None = None
+    ) -> tuple[list[Tag], list[str]]:
         """
         Load tags from a file.
+        Each expression is parsed once to check it, and the tags are added in
+        definition order; their automata are built according to compilation
+        (see warm, which uses workers).
         Returns (valid_tags, invalid_lines).
         """
-        valid_tags = []
-        invalid_lines = []
-
         try:
             with open(filepath, encoding="utf-8") as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    tag = self.parse_tag_line(line)
-                    if tag:
-                        if self.add_tag(tag):
-                            valid_tags.append(tag)
-                        else:
-                            invalid_lines.append(
-                                f"Line {line_num}: Duplicate tag name '{tag.name}'"
-                            )
-                    else:
-                        invalid_lines.append(f"Line {line_num}: Invalid tag definition")
+                entries = [
+                    (line_num, TagDefinitionParser.split(line))
+                    for line_num, line in enumerate(f, 1)
+                    if line.strip()
+                ]
         except FileNotFoundError as err:
             raise FileNotFoundError(f"File not found: {filepath}") from err
         except Exception as e:
             raise Exception(f"Error reading file: {e}") from e
 
+        with self._publish_lock:
+            valid_tags, invalid_lines = self._define_tags(entries)
+            if valid_tags:
+                self._publish(valid_tags)
+
+        if valid_tags and self.compilation != "lazy":
+            self.warm(workers, background=self.compilation == "background")
+
         return valid_tags, invalid_lines
 
+    def _define_tags(
+        self, entries: list[tuple[int, tuple[str, str, bool] | None]]
+    ) -> tuple[list[Tag], list[str]]:
+        """Tags for the (line number, split line) entries of a tag file, and the invalid lines."""
+        valid_tags = []
+        invalid_lines = []
+        # Tags with the same expression share its analysis and automata
+        analyzed: dict[str, CompiledExpression | None] = {}
+        names = {tag.name for tag in self._snapshot.tags}
+        for line_num, parts in entries:
+            if parts is not None and parts[1] not in analyzed:
+                try:
+                    analyzed[parts[1]] = CompiledExpression.analyze(parts[1])
+                except ValueError:
+                    analyzed[parts[1]] = None
+            compiled = analyzed[parts[1]] if parts else None
+            if parts is None or compiled is None:
+                invalid_lines.append(f"Line {line_num}: Invalid tag definition")
+                continue
+
+            name, expression, skip = parts
+            if name == LexicalAnalyzer.ERROR_TOKEN:
+                invalid_lines.append(f"Line {line_num}: Reserved tag name '{name}'")
+                continue
+            if name in names:
+                invalid_lines.append(f"Line {line_num}: Duplicate tag name '{name}'")
+                continue
+
+            names.add(name)
+            valid_tags.append(Tag(name, expression, compiled=compiled, skip=skip))
+
+        return valid_tags, invalid_lines
+
+    def set_compilation(self, mode: str):
+        """Choose when the automata of loaded tags are built (see COMPILATION_MODES)."""
+        if mode not in self.COMPILATION_MODES:
+            raise ValueError(f"Unknown compilation mode: {mode}")
+        self.compilation = mode
+
+    def warm(self, workers: int | None = None, background: bool = False) -> threading.Thread | None:
+        """
+        Build the automata of every tag not used yet, instead of on first use.
+        Many distinct expressions are compiled in a process pool of workers
+        processes (see compile_expressions). With background this runs in a
+        daemon thread, which is returned; tokenizing meanwhile is safe and
+        builds any automaton it needs first.
+        """
+        pending = [tag for tag in self.tags if not tag.is_compiled]
+        if not background:
+            self._warm_tags(pending, workers)
+            return None
+
+        thread = threading.Thread(
+            target=self._warm_tags, args=(pending, workers), name="tag-warmup", daemon=True
+        )
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _warm_tags(tags: list[Tag], workers: int | None):
+        """Build the automata and simulators of tags."""
+        for construction in {tag.construction for tag in tags}:
+            group = [tag for tag in tags if tag.construction == construction]
+            expressions = {tag.expression for tag in group}
+            # Small sets are built here, from the syntax trees the tags already hold
+            if workers != 1 and len(expressions) >= PARALLEL_THRESHOLD:
+                compiled = compile_expressions(expressions, construction, workers)
+                for tag in group:
+                    if compiled[tag.expression] is not None:
+                        tag.adopt(compiled[tag.expression])
+        for tag in tags:
+            tag.warm()
+
     def save_tags_to_file(self, filepath: str):
         """Save current tags to a file."""
         try:
             with open(filepath, "w", encoding="utf-8") as f:
                 for tag in self.tags:
-                    f.write(f"{tag.name}: {tag.expression}\n")
+                    f.write(tag.definition + "\n")
         except Exception as e:
             raise Exception(f"Error writing file: {e}") from e
 
-    def set_output_file(self, filepath: str):
-        """Set the output file for results."""
+    def set_output_file(self, filepath: str, output_format: str = "text"):
+        """Set the output file and format for results."""
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
         self.output_file = filepath
+        self.output_format = output_format
+
+    def set_recovery(self, enabled: bool):
+        """Enable or disable error recovery during tokenization."""
+        self.recover = enabled
 
     def process_input(self, text: str) -> str:
         """
         Process input text and return tokenized result.
         Returns space-separated tag names.
+        In recovery mode untokenizable runs become error tokens and are kept
+        in last_errors instead of raising ValueError.
         """
-        if not self.lexer:
-            raise ValueError("No tags defined")
+        snapshot = self._current()
+        cache = self.result_cache
+        if cache is None:
+            output, self.last_errors = snapshot.tokenize_to_text(text, self.recover)
+            return output
+
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16)
+        return self._cached(cache, snapshot, ("text", digest.digest(), len(text)), lambda: text)
+
+    def _cached(
+        self, cache: ResultCache, snapshot: CompiledLexer, key: tuple, read: Callable[[], str]
+    ) -> str:
+        """
+        Result for the input identified by key, from the result cache when present.
+        Otherwise the input returned by read is tokenized and the result cached.
+        Keys also hold the tag set version and the recovery mode.
+        """
+        key = (*key, snapshot.version, self.recover)
+        cached = cache.get(key)
+        if cached is not None:
+            output, self.last_errors = cached
+            return output
+
+        output, self.last_errors = snapshot.tokenize_to_text(read(), self.recover)
+        cache.put(key, output, self.last_errors)
+        return output
 
-        tokens = self.lexer.tokenize(text)
-        return " ".join(tokens)
+    def count_tokens(self, text: str | ByteInput) -> dict[str, int]:
+        """
+        Count the tokens of each tag in text without storing them.
+        text may also be bytes, such as a mapped file (see map_input_file).
+        Error tokens are only counted in recovery mode, when there are any.
+        """
+        lexer, text = self._current().lexer_for(text)
+        errors: list[LexError] | None = [] if self.recover else None
+        counts = lexer.count_tokens(text, errors)
+        self.last_errors = LexicalAnalyzer.locate_errors(text, errors or [])
+        return self._named_counts(lexer, counts, keep_zeros=True)
+
+    def token_histograms(
+        self, text: str | ByteInput, window: int | None = None
+    ) -> Iterator[tuple[int, dict[str, int]]]:
+        """
+        Yield (bucket, tag counts) per line of text, or per window of characters.
+        Only non-zero counts are kept; see LexicalAnalyzer.iter_histograms.
+        """
+        lexer, text = self._current().lexer_for(text)
+        errors: list[LexError] | None = [] if self.recover else None
+        self.last_errors = []
+        for bucket, counts in lexer.iter_histograms(text, window, errors):
+            yield bucket, self._named_counts(lexer, counts, keep_zeros=False)
+        self.last_errors = LexicalAnalyzer.locate_errors(text, errors or [])
+
+    @staticmethod
+    def _named_counts(
+        lexer: LexicalAnalyzer, counts: list[int], keep_zeros: bool
+    ) -> dict[str, int]:
+        """Map token counts to their names, dropping an empty error count and skip tags."""
+        shown = [not tag.skip for tag in lexer.tags]
+        return {
+            name: count
+            for i, (name, count) in enumerate(zip(lexer.token_names, counts, strict=True))
+            if count or (keep_zeros and i < len(shown) and shown[i])
+        }
 
     def process_file(self, filepath: str) -> str:
         """
         Process a file and return tokenized result.
         Returns space-separated tag names.
         """
+        snapshot = self._snapshot
+        cache = self.result_cache
+        if cache is None or not snapshot:
+            return self.process_input(self.read_input_file(filepath))
+
+        # An unchanged file is recognized by its path, modification time and size
+        try:
+            info = os.stat(filepath)
+        except FileNotFoundError as err:
+            raise FileNotFoundError(f"File not found: {filepath}") from err
+        except OSError as e:
+            raise Exception(f"Error reading file: {e}") from e
+        key = ("file", os.path.abspath(filepath), info.st_mtime_ns, info.st_size)
+        return self._cached(cache, snapshot, key, partial(self.read_input_file, filepath))
+
+    def read_input_file(self, filepath: str) -> str:
+        """Read an input file to tokenize."""
         try:
             with open(filepath, encoding="utf-8") as f:
-                text = f.read()
-            return self.process_input(text)
+                return f.read()
         except FileNotFoundError as err:
             raise FileNotFoundError(f"File not found: {filepath}") from err
         except Exception as e:
             raise Exception(f"Error reading file: {e}") from e
 
+    @contextmanager
+    def map_input_file(self, filepath: str) -> Iterator[ByteInput]:
+        """Map an input file into memory, so it can be scanned without reading it whole."""
+        with ExitStack() as stack:
+            try:
+                f = stack.enter_context(open(filepath, "rb"))
+            except FileNotFoundError as err:
+                raise FileNotFoundError(f"File not found: {filepath}") from err
+            except Exception as e:
+                raise Exception(f"Error reading file: {e}") from e
+
+            # Empty files cannot be mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+            yield stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def write_file_tokens(self, filepath: str):
+        """
+        Tokenize a file and write the result in the selected output format.
+        With result_cache, text output goes through process_file, so unchanged
+        files are served from the cache without being read.
+        """
+        if self.output_format == "text" and self.result_cache is not None:
+            self.write_output(self.process_file(filepath))
+        else:
+            self.write_tokens(self.read_input_file(filepath))
+
+    def write_file_tokens_resumable(
+        self,
+        filepath: str,
+        resume: bool = False,
+        interval: int = CHECKPOINT_INTERVAL,
+        on_checkpoint: Callable[[Checkpoint], None] | None = None,
+    ) -> Checkpoint:
+        """
+        Tokenize a file to the output file like write_file_tokens, recording
+        checkpoints next to it, and with resume continue from the last one
+        (see tokenize_resumable). Requires text output to a file.
+        Returns the final counters; last_errors only holds the errors found
+        since the run started or resumed.
+        """
+        if self.output_format != "text" or not self.output_file:
+            raise ValueError("Checkpoints require text output to a file")
+        if os.path.isdir(self.output_file):
+            raise ValueError("Checkpoints require an output file, not a directory")
+        snapshot = self._current()
+        text = self.read_input_file(filepath)
+        state, errors = tokenize_resumable(
+            snapshot,
+            text,
+            filepath,
+            self.output_file,
+            self.recover,
+            resume,
+            interval,
+            on_checkpoint,
+        )
+        self.last_errors = LexicalAnalyzer.locate_errors(text, errors)
+        return state
+
+    def process_files(self, paths: list[str], workers: int | None = None) -> Iterator[FileResult]:
+        """
+        Tokenize many files (see tokenize_files, which uses workers) and write
+        each output as its result arrives, in the order of paths.
+        Outputs follow one another in the output file or on stdout, as :d
+        writes them; when the output file is a directory, each file's output
+        goes to its own file there instead, at its path relative to the
+        directory common to the inputs plus .tokens (text) or .ltb (binary).
+        Yields each FileResult, with last_errors set to its errors; a failure
+        to write is recorded in the result and the next files still run.
+        """
+        snapshot = self._current()
+        if self.output_format != "text" and not self.output_file:
+            raise ValueError("Binary output requires an output file")
+        output_dir = (
+            self.output_file if self.output_file and os.path.isdir(self.output_file) else None
+        )
+        base = None
+        if output_dir and paths:
+            base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+        if workers != 1 and len(paths) >= PARALLEL_FILES:
+            # Build every automaton once here, before they are shipped to the workers
+            self.warm(workers)
+
+        for result in tokenize_files(snapshot, paths, self.recover, self.output_format, workers):
+            if result.failure is None:
+                try:
+                    self._write_result(result, output_dir, base)
+                except Exception as e:
+                    result.failure = str(e)
+            self.last_errors = result.errors
+            yield result
+
+    def _write_result(self, result: FileResult, output_dir: str | None, base: str | None):
+        """Write the output of one file of process_files."""
+        output = result.output
+        if output is None:
+            return
+        if output_dir is None:
+            if isinstance(output, str):
+                self.write_output(output)
+                return
+            if not self.output_file:
+                raise ValueError("Binary output requires an output file")
+            target, mode = self.output_file, "ab"
+        else:
+            relative = os.path.relpath(os.path.abspath(result.path), base)
+            binary = isinstance(output, bytes)
+            target = os.path.join(output_dir, relative + (".ltb" if binary else ".tokens"))
+            mode = "wb" if binary else "w"
+        try:
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            if isinstance(output, bytes):
+                with open(target, mode) as f:
+                    f.write(output)
+            else:
+                with open(target, mode, encoding="utf-8") as f:
+                    f.write(output + "\n")
+        except OSError as e:
+            raise Exception(f"Error writing to output file: {e}") from e
+
+    def write_tokens(self, text: str):
+        """
+        Tokenize text and write the result in the selected output format.
+        Text output is written as tokens are produced, never joined whole,
+        except through result_cache, which keeps whole outputs.
+        Binary formats append one frame per call and require an output file.
+        """
+        if self.output_format == "text":
+            if self.result_cache is not None:
+                self.write_output(self.process_input(text))
+                return
+            snapshot = self._current()
+            errors: list[LexError] | None = [] if self.recover else None
+            self.write_output_chunks(snapshot.iter_text(text, errors))
+            self.last_errors = LexicalAnalyzer.locate_errors(text, errors or [])
+            return
+
+        lexer = self._current().lexer
+        if not self.output_file:
+            raise ValueError("Binary output requires an output file")
+
+        errors = [] if self.recover else None
+        try:
+            with open(self.output_file, "ab") as f:
+                frame_start = f.tell()
+                writer = BinaryTokenWriter(
+                    f, lexer.token_names, spans=self.output_format == "binary-spans"
+                )
+                try:
+                    writer.write_all(lexer.iter_token_spans(text, errors))
+                except ValueError:
+                    # Drop the partially written frame
+                    f.truncate(frame_start)
+                    raise
+                writer.close()
+        except OSError as e:
+            raise Exception(f"Error writing to output file: {e}") from e
+        self.last_errors = LexicalAnalyzer.locate_errors(text, errors or [])
+
     def list_tags(self) -> list[str]:
         """List all tag definitions."""
-        return [f"{tag.name}: {tag.expression}" for tag in self.tags]
+        return [tag.definition for tag in self.tags]
 
     def list_automata(self) -> list[str]:
         """List formal definitions of all automata."""
         return [tag.get_formal_definition() for tag in self.tags]
 
+    def _select_tags(self, names: list[str] | None) -> list[Tag]:
+        """Tags with the given names in that order, or every tag for None."""
+        if names is None:
+            return self.tags
+        by_name = {tag.name: tag for tag in self.tags}
+        for name in names:
+            if name not in by_name:
+                raise ValueError(f"Unknown tag: {name}")
+        return [by_name[name] for name in names]
+
+    def memory_report(self, names: list[str] | None = None, trace: bool = False) -> MemoryReport:
+        """
+        Memory footprint of the tags (the named ones, or all) with the DFA
+        caches of this thread's lexers; the full report also counts the lexers
+        and the result cache. trace also measures allocation while compiling
+        each tag with tracemalloc, which compiles it again.
+        """
+        snapshot = self._snapshot
+        if names is not None:
+            return measure(snapshot, self._select_tags(names), trace)
+        cache_bytes = 0 if self.result_cache is None else self.result_cache.stats.bytes
+        return measure(snapshot, None, trace, cache_bytes)
+
+    def iter_automata(
+        self, names: list[str] | None = None, limit: int | None = None
+    ) -> Iterator[str]:
+        """
+        Yield the formal definitions of the automata one line at a time, with
+        a blank line between tags, so large tag sets never build the whole dump.
+        names selects tags; limit caps the transitions listed per tag.
+        """
+        for i, tag in enumerate(self._select_tags(names)):
+            if i > 0:
+                yield ""
+            yield from tag.iter_formal_definition(limit)
+
+    def export_dot(self, filepath: str, names: list[str] | None = None):
+        """Write the automata of the tags as Graphviz DOT digraphs, line by line."""
+        tags = self._select_tags(names)
+        try:
+            with open(filepath, "w", encoding="utf-8") as f:
+                for tag in tags:
+                    for line in tag.iter_dot():
+                        f.write(line + "\n")
+        except OSError as e:
+            raise Exception(f"Error writing file: {e}") from e
+
     def check_overlaps(self) -> list[tuple[str, str]]:
         """Check for overlapping tag definitions."""
-        if not self.lexer:
+        lexer = self.lexer
+        if not lexer:
             return []
-        return self.lexer.check_overlaps()
+        return lexer.check_overlaps()
 
     def write_output(self, content: str):
         """Write output to file or stdout."""
@@ -127,3 +574,47 @@ class CommandHandler:
                 raise Exception(f"Error writing to output file: {e}") from e
         else:
             print(content)
+
+    def write_output_chunks(self, chunks: Iterable[str]):
+        """
+        Write one output line given in pieces to the output file or stdout,
+        OUTPUT_BUFFER characters at a time, so the line is never held whole.
+        If producing the pieces raises ValueError, the output file is truncated
+        back to where the line started; on stdout, output already written is
+        ended with a newline before the error propagates.
+        """
+        if not self.output_file:
+            self._write_buffered(sys.stdout, chunks)
+            return
+        try:
+            with open(self.output_file, "a", encoding="utf-8") as f:
+                start = f.tell()
+                try:
+                    self._write_buffered(f, chunks)
+                except ValueError:
+                    f.truncate(start)
+                    raise
+        except OSError as e:
+            raise Exception(f"Error writing to output file: {e}") from e
+
+    def _write_buffered(self, f: TextIO, chunks: Iterable[str]):
+        """Write chunks to f in blocks of OUTPUT_BUFFER characters, then a newline."""
+        block: list[str] = []
+        size = 0
+        written = False
+        try:
+            for chunk in chunks:
+                block.append(chunk)
+                size += len(chunk)
+                if size >= self.OUTPUT_BUFFER:
+                    f.write("".join(block))
+                    f.flush()
+                    block.clear()
+                    size = 0
+                    written = True
+        except ValueError:
+            if written:
+                f.write("\n")
+            raise
+        block.append("\n")
+        f.write("".join(block))
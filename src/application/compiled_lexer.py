@@ -0,0 +1,141 @@
+"""
+Immutable snapshots of a tag set and the lexers compiled for it.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import threading
+from collections.abc import Iterable, Iterator
+
+from ..domain.byte_dfa import ByteInput
+from ..domain.dfa_cache import LazyDFA
+from ..domain.tag import Tag
+from .byte_lexer import ByteLexicalAnalyzer
+from .lexer import LexError, LexicalAnalyzer
+
+
+class CompiledLexer:
+    """
+    A tag set frozen at one version, with the lexers that scan it.
+
+    CommandHandler publishes a new snapshot whenever its tags change instead
+    of modifying the current one, so a tokenization keeps the snapshot it
+    started with while tags are added. Tags are shared between snapshots and
+    build their automata under locks. Lexers hold lazy DFA caches, which are
+    not safe to share, so each thread gets its own lexers on first use.
+    """
+
+    # Tag names joined per chunk of iter_text
+    TEXT_CHUNK_TOKENS = 4096
+
+    def __init__(
+        self,
+        tags: Iterable[Tag] = (),
+        max_dfa_states: int | None = LazyDFA.DEFAULT_MAX_STATES,
+        version: int = 0,
+    ):
+        self._tags = tuple(tags)
+        self._max_dfa_states = max_dfa_states
+        self._version = version
+        self._token_names = (*(tag.name for tag in self._tags), LexicalAnalyzer.ERROR_TOKEN)
+        # Byte mode needs tags with ASCII symbols only; escapes are ASCII
+        self._ascii = all(tag.expression.isascii() for tag in self._tags)
+        self._local = threading.local()
+
+    @property
+    def tags(self) -> tuple[Tag, ...]:
+        """Tags in priority (definition) order."""
+        return self._tags
+
+    @property
+    def max_dfa_states(self) -> int | None:
+        """State budget of each lazy DFA cache (see LexicalAnalyzer)."""
+        return self._max_dfa_states
+
+    @property
+    def version(self) -> int:
+        """Number of tag set changes before this snapshot."""
+        return self._version
+
+    @property
+    def token_names(self) -> tuple[str, ...]:
+        """Names indexed by token id, the recovery error token last."""
+        return self._token_names
+
+    def __bool__(self) -> bool:
+        return bool(self._tags)
+
+    def with_tags(
+        self, tags: Iterable[Tag], max_dfa_states: int | None = LazyDFA.DEFAULT_MAX_STATES
+    ) -> "CompiledLexer":
+        """Next snapshot, with tags appended to this one's."""
+        return CompiledLexer((*self._tags, *tags), max_dfa_states, self._version + 1)
+
+    @property
+    def lexer(self) -> LexicalAnalyzer:
+        """The calling thread's lexer."""
+        lexer = getattr(self._local, "lexer", None)
+        if lexer is None:
+            lexer = self._local.lexer = LexicalAnalyzer(list(self._tags), self._max_dfa_states)
+        return lexer
+
+    @property
+    def byte_lexer(self) -> ByteLexicalAnalyzer | None:
+        """The calling thread's byte-mode lexer, None if some tag is not ASCII."""
+        if not self._ascii:
+            return None
+        lexer = getattr(self._local, "byte_lexer", None)
+        if lexer is None:
+            lexer = ByteLexicalAnalyzer(list(self._tags), self._max_dfa_states)
+            self._local.byte_lexer = lexer
+        return lexer
+
+    def built_lexers(self) -> list[LexicalAnalyzer]:
+        """The calling thread's lexers built so far, without building any."""
+        lexers = (getattr(self._local, name, None) for name in ("lexer", "byte_lexer"))
+        return [lexer for lexer in lexers if lexer is not None]
+
+    def lexer_for(self, text: str | ByteInput) -> tuple[LexicalAnalyzer, str | ByteInput]:
+        """
+        Lexer to scan text with, and the text to give it.
+        ASCII bytes are scanned in byte mode without decoding; other bytes,
+        or bytes with tags that use non-ASCII symbols, are decoded as UTF-8.
+        """
+        if isinstance(text, str):
+            return self.lexer, text
+        if ByteLexicalAnalyzer.is_ascii(text):
+            byte_lexer = self.byte_lexer
+            if byte_lexer is not None:
+                return byte_lexer, text
+            return self.lexer, bytes(text).decode("ascii")
+        return self.lexer, bytes(text).decode("utf-8")
+
+    def tokenize_to_text(self, text: str, recover: bool = False) -> tuple[str, list[LexError]]:
+        """
+        Tokenize text into space-separated tag names.
+        Returns the output and, in recovery mode, the located errors; without
+        recovery the first untokenizable character raises ValueError.
+        """
+        lexer = self.lexer
+        errors: list[LexError] | None = [] if recover else None
+        stream = lexer.tokenize_ids(text, errors=errors)
+        # Tag names are only materialized here, at the output boundary
+        return stream.to_text(), LexicalAnalyzer.locate_errors(text, errors or [])
+
+    def iter_text(self, text: str, errors: list[LexError] | None = None) -> Iterator[str]:
+        """
+        Yield the output of tokenize_to_text in pieces that concatenate to it,
+        one per TEXT_CHUNK_TOKENS tokens, as the scan produces them.
+        When errors is given, recovery mode is used and errors are appended to it.
+        """
+        names = self._token_names
+        chunk: list[str] = []
+        separator = ""
+        for token_id, _, _ in self.lexer.iter_token_spans(text, errors):
+            chunk.append(names[token_id])
+            if len(chunk) == self.TEXT_CHUNK_TOKENS:
+                yield separator + " ".join(chunk)
+                chunk.clear()
+                separator = " "
+        if chunk:
+            yield separator + " ".join(chunk)
@@ -0,0 +1,122 @@
+"""
+Differential testing of the matching engines on random expressions.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import random
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from ..domain.engines import engine_names, get_engine
+from ..domain.tag import Tag
+from .lexer import LexError, LexicalAnalyzer
+
+
+def random_expression(rng: random.Random, alphabet: str = "ab", size: int = 6) -> str:
+    """
+    Random RPN expression with size operands drawn from alphabet, λ and the
+    wildcard, joined by randomly chosen operators; stars may nest.
+    """
+    if size <= 1:
+        roll = rng.random()
+        if roll < 0.1:
+            return "\\l"
+        if roll < 0.2:
+            return "\\."
+        return rng.choice(alphabet)
+    operator = rng.choice("+.*")
+    if operator == "*":
+        return random_expression(rng, alphabet, size - 1) + "*"
+    left = rng.randint(1, size - 1)
+    return (
+        random_expression(rng, alphabet, left)
+        + random_expression(rng, alphabet, size - left)
+        + operator
+    )
+
+
+# What one engine found on one case: Tag.match at every position, then the
+# token spans and errors of the lexer, then those of the linear-time lexer
+# (None for engines without state masks)
+Outcome = tuple
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    """A case on which an engine disagrees with the reference engine."""
+
+    engine: str
+    expressions: tuple[str, ...]
+    text: str
+    expected: Outcome
+    actual: Outcome
+
+
+@dataclass
+class DifferentialReport:
+    """Cases run, disagreements found, and seconds spent per engine."""
+
+    cases: int = 0
+    mismatches: list[Mismatch] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+def _outcome(engine: str, expressions: tuple[str, ...], text: str) -> Outcome:
+    """Run one case with fresh tags, so no engine reuses another's caches."""
+    tags = [Tag(f"T{i}", expression, engine=engine) for i, expression in enumerate(expressions)]
+    matches = tuple(tag.match(text, pos) for tag in tags for pos in range(len(text) + 1))
+
+    def lex(linear_time: bool) -> tuple[list[tuple[int, int, int]], list[LexError]]:
+        errors: list[LexError] = []
+        lexer = LexicalAnalyzer(tags, engine=engine, linear_time=linear_time)
+        return list(lexer.iter_token_spans(text, errors=errors)), errors
+
+    linear = lex(True) if get_engine(engine).masks else None
+    return matches, lex(False), linear
+
+
+def run_differential(
+    cases: int = 200,
+    seed: int = 0,
+    engines: Iterable[str] | None = None,
+    alphabet: str = "ab",
+    max_tags: int = 3,
+    max_size: int = 8,
+    max_length: int = 12,
+) -> DifferentialReport:
+    """
+    Run every engine on random cases and compare them with the first one.
+
+    A case is up to max_tags random expressions and a random text over
+    alphabet plus one character outside it. Each engine reports Tag.match at
+    every position and the lexer's tokens and errors, whose spans encode the
+    longest match and the priority of the tag that won it. Engines default to
+    every registered one, with "nfa" (the set simulation) as the reference.
+    """
+    names = list(engine_names() if engines is None else engines)
+    for name in names:
+        get_engine(name)
+    rng = random.Random(seed)
+    report = DifferentialReport(timings=dict.fromkeys(names, 0.0))
+
+    for _ in range(cases):
+        expressions = tuple(
+            random_expression(rng, alphabet, rng.randint(1, max_size))
+            for _ in range(rng.randint(1, max_tags))
+        )
+        text = "".join(rng.choice(alphabet + "#") for _ in range(rng.randint(0, max_length)))
+        outcomes = []
+        for name in names:
+            start = time.perf_counter()
+            outcomes.append((name, _outcome(name, expressions, text)))
+            report.timings[name] += time.perf_counter() - start
+        expected = outcomes[0][1]
+        for name, outcome in outcomes:
+            # Memoized tokens must be those of the reference's plain lexer
+            if outcome[:2] != expected[:2] or outcome[2] not in (None, expected[1]):
+                report.mismatches.append(Mismatch(name, expressions, text, expected, outcome))
+        report.cases += 1
+
+    return report
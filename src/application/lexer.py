@@ -4,15 +4,301 @@ Lexical Analyzer - main component for tokenizing input.
 Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 """
 
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, replace
+from functools import partial
+
+from ..domain.byte_dfa import ByteDFA
+from ..domain.dfa_cache import DFACacheStats, LazyDFA
+from ..domain.engines import Matcher, get_engine
+from ..domain.literal_trie import LiteralTrie
+from ..domain.maximal_munch import DeterministicMatcher, match_memoized
 from ..domain.tag import Tag
+from .line_index import LineIndex
+from .token_stream import TokenStream
+
+# Line breaks that delimit the buckets of line histograms
+_NEWLINES = re.compile("\n")
+
+
+class _DeferredMatcher:
+    """
+    Stand-in for the matcher of a tag whose automaton has not been built.
+
+    match and step build the real matcher on their first call and are then
+    rebound to its own methods, so later calls reach the matcher with no
+    extra indirection. Text is str, or bytes-like for ByteLexicalAnalyzer.
+    """
+
+    def __init__(self, build: Callable[[], Matcher | ByteDFA]):
+        self._build = build
+        self.matcher: Matcher | ByteDFA | None = None
+        self.match: Callable[..., int | None] = self._first_match
+        self.step: Callable[..., int] = self._first_step
+        self._masks: tuple[int, int] | None = None
+
+    def _materialize(self) -> Matcher | ByteDFA:
+        if self.matcher is None:
+            matcher = self._build()
+            self.match = matcher.match
+            # Engines without state masks only ever match
+            if isinstance(matcher, DeterministicMatcher):
+                self.step = matcher.step
+                self._masks = (matcher.start_mask, matcher.final_mask)
+            self.matcher = matcher
+        return self.matcher
+
+    def _state_masks(self) -> tuple[int, int]:
+        """(start_mask, final_mask) of the matcher, built if needed."""
+        self._materialize()
+        if self._masks is None:
+            raise TypeError("Matcher does not step state masks")
+        return self._masks
+
+    def _first_match(self, text, start_pos: int = 0) -> int | None:
+        self._materialize()
+        return self.match(text, start_pos)
+
+    def _first_step(self, mask: int, symbol) -> int:
+        self._state_masks()
+        return self.step(mask, symbol)
+
+    @property
+    def start_mask(self) -> int:
+        return self._state_masks()[0]
+
+    @property
+    def final_mask(self) -> int:
+        return self._state_masks()[1]
+
+
+@dataclass(frozen=True)
+class LexError:
+    """
+    An untokenizable run of input skipped in recovery mode.
+    line and column are only known once located (see LexicalAnalyzer.locate_errors).
+    """
+
+    position: int
+    text: str
+    line: int | None = field(default=None, compare=False)
+    column: int | None = field(default=None, compare=False)
+
+    def __str__(self):
+        where = f"position {self.position}: {self.text!r}"
+        if self.line is None:
+            return where
+        return f"{where} (line {self.line}, column {self.column})"
 
 
 class LexicalAnalyzer:
     """Main lexical analyzer that tokenizes input using defined tags."""
 
-    def __init__(self, tags: list[Tag]):
+    # Token emitted for an untokenizable run in recovery mode
+    ERROR_TOKEN = "<error>"
+
+    def __init__(
+        self,
+        tags: list[Tag],
+        max_dfa_states: int | None = LazyDFA.DEFAULT_MAX_STATES,
+        linear_time: bool = False,
+        engine: str = "dfa",
+    ):
+        """
+        max_dfa_states bounds the lazy DFA cache of each tag (see LazyDFA);
+        None matches with the bit-parallel NFA directly.
+        linear_time memoizes failed scans (see maximal_munch), which bounds
+        tokenization by the input length instead of its square.
+        engine names the registered engine that runs the non-literal branches
+        of each tag (see engines); linear_time needs one that steps state masks.
+        """
+        self.engine = get_engine(engine)
+        if linear_time and not self.engine.masks:
+            raise ValueError(f"Engine '{engine}' does not support linear_time")
         self.tags = tags
+        self.max_dfa_states = max_dfa_states
+        self.linear_time = linear_time
         self.tag_order = {tag.name: i for i, tag in enumerate(tags)}
+        # Token id i names tags[i]; the extra last id is the recovery error token
+        self.token_names = (*(tag.name for tag in tags), self.ERROR_TOKEN)
+        # Skip tags compete for the longest match but their tokens are dropped
+        self._skipped = tuple(tag.skip for tag in tags)
+        self._has_skip = any(self._skipped)
+        self._build_literal_trie()
+        self._build_dispatch_index()
+
+    def _build_literal_trie(self):
+        """Collect the literal words of every tag into one shared trie."""
+        self._trie = LiteralTrie()
+        for priority, tag in enumerate(self.tags):
+            for word in tag.literals:
+                self._trie.add(word, priority)
+
+    def _build_dispatch_index(self):
+        """
+        Index the tags by the characters their matches can start with.
+        Each entry lists the candidate tags in priority (definition) order.
+        """
+        any_start = tuple(tag for tag in self.tags if tag.starts_with_any)
+        chars: set[str] = set()
+        for tag in self.tags:
+            if not tag.starts_with_any:
+                chars.update(tag.first_chars)
+
+        # Keyed by what indexing the input yields (see _dispatch_key)
+        self._dispatch: dict[str | int, tuple[Tag, ...]] = {
+            self._dispatch_key(char): tuple(
+                tag for tag in self.tags if tag.starts_with_any or char in tag.first_chars
+            )
+            for char in chars
+        }
+        self._any_start = any_start
+
+        # Tags with non-literal branches still run their automaton, with their
+        # priority; the automaton is only built when a scan first needs it
+        priority = {id(tag): i for i, tag in enumerate(self.tags)}
+        self._matchers: dict[int, _DeferredMatcher] = {}
+        for i, tag in enumerate(self.tags):
+            if tag.has_residual:
+                self._matchers[i] = _DeferredMatcher(partial(self._tag_matcher, tag))
+
+        def with_residual(
+            candidates: tuple[Tag, ...],
+        ) -> tuple[tuple[int, _DeferredMatcher], ...]:
+            ranks = (priority[id(tag)] for tag in candidates)
+            return tuple((i, self._matchers[i]) for i in ranks if i in self._matchers)
+
+        self._engine_dispatch: dict[str | int, tuple[tuple[int, _DeferredMatcher], ...]] = {
+            key: with_residual(candidates) for key, candidates in self._dispatch.items()
+        }
+        self._engine_any_start = with_residual(any_start)
+        # Nullable tags match the empty prefix anywhere without being tried
+        self._has_nullable = any(tag.nullable for tag in self.tags)
+
+    @staticmethod
+    def _dispatch_key(char: str) -> str | int:
+        """Dispatch index key of a first character: the character itself."""
+        return char
+
+    def _tag_matcher(self, tag: Tag) -> Matcher | ByteDFA:
+        """Matcher of a tag's residual automaton, building the automaton if needed."""
+        return self.engine.build(tag.source(residual=True), self.max_dfa_states)
+
+    def dfa_caches(self) -> dict[int, LazyDFA | ByteDFA]:
+        """Lazy DFA caches built so far, by tag priority."""
+        return {
+            i: deferred.matcher
+            for i, deferred in self._matchers.items()
+            if isinstance(deferred.matcher, LazyDFA | ByteDFA)
+        }
+
+    def dfa_stats(self) -> DFACacheStats:
+        """Counters summed over the lazy DFA caches of every tag."""
+        total = DFACacheStats()
+        for cache in self.dfa_caches().values():
+            total += cache.stats
+        return total
+
+    def candidates(self, char: str) -> tuple[Tag, ...]:
+        """Tags that can match a non-empty prefix starting with char, in priority order."""
+        return self._dispatch.get(self._dispatch_key(char), self._any_start)
+
+    def _longest_match(
+        self, text: str, pos: int, memo: dict[int, set[tuple[int, int]]] | None = None
+    ) -> tuple[int, int] | None:
+        """
+        Find the longest non-empty match at pos, earliest defined tag on ties.
+        memo maps tag priorities to their failed (state, position) pairs in text.
+        Returns (tag priority, end_pos) or None.
+        """
+        best_priority = -1
+        best_end = pos
+
+        literal = self._trie.longest_match(text, pos)
+        if literal is not None:
+            best_priority, best_end = literal
+
+        for priority, matcher in self._engine_dispatch.get(text[pos], self._engine_any_start):
+            if memo is None:
+                end_pos = matcher.match(text, pos)
+            else:
+                failed = memo.get(priority)
+                if failed is None:
+                    failed = memo[priority] = set()
+                end_pos = match_memoized(matcher, text, pos, failed)
+            if end_pos is None:
+                continue
+            # Longer match wins; on equal length the earlier defined tag
+            if end_pos > best_end or (end_pos == best_end and 0 <= priority < best_priority):
+                best_priority = priority
+                best_end = end_pos
+
+        if best_priority < 0:
+            return None
+        return best_priority, best_end
+
+    def _resync(
+        self, text: str, pos: int, memo: dict[int, set[tuple[int, int]]] | None = None
+    ) -> int:
+        """Next position from pos where some tag matches a non-empty prefix."""
+        dispatch = self._dispatch
+        any_start = self._any_start
+        length = len(text)
+
+        while pos < length:
+            # Positions no tag can start with are skipped without matching
+            if (any_start or text[pos] in dispatch) and self._longest_match(text, pos, memo):
+                return pos
+            pos += 1
+
+        return length
+
+    def _scan(
+        self, text: str, errors: list[LexError] | None = None, start: int = 0
+    ) -> Iterator[tuple[int, int, int]]:
+        """
+        Yield (tag priority, start, end) for each token, except those of skip tags.
+        Without an errors list the first untokenizable character raises ValueError;
+        with one, each shortest untokenizable run is recorded there and yielded
+        with priority -1, and scanning resumes at the next tokenizable position.
+        Scanning begins at start, which must be a token boundary.
+        """
+        pos = start
+        length = len(text)
+        memo: dict[int, set[tuple[int, int]]] | None = {} if self.linear_time else None
+        has_skip = self._has_skip
+        skipped = self._skipped
+
+        while pos < length:
+            best_match = self._longest_match(text, pos, memo)
+
+            if best_match is None:
+                if errors is None:
+                    # A nullable tag would have matched the empty prefix here
+                    where = LineIndex(text).describe(pos)
+                    if self._has_nullable:
+                        raise ValueError(f"Cannot advance past position {pos} ({where})")
+                    char = self._text(text, pos, pos + 1)
+                    raise ValueError(
+                        f"Cannot tokenize character at position {pos}: '{char}' ({where})"
+                    )
+
+                end_pos = self._resync(text, pos + 1, memo)
+                errors.append(LexError(pos, self._text(text, pos, end_pos)))
+                yield -1, pos, end_pos
+                pos = end_pos
+                continue
+
+            priority, end_pos = best_match
+            if not (has_skip and skipped[priority]):
+                yield priority, pos, end_pos
+            pos = end_pos
+
+    @staticmethod
+    def _text(text: str, start: int, end: int) -> str:
+        """Input between start and end, as reported in errors."""
+        return text[start:end]
 
     def tokenize(self, text: str) -> list[str]:
         """
@@ -21,40 +307,139 @@ class LexicalAnalyzer:
         Returns list of tag names.
         Raises ValueError if text cannot be fully tokenized.
         """
-        tokens = []
-        pos = 0
-
-        while pos < len(text):
-            best_match: tuple[Tag, int] | None = None
-
-            # Try all tags and find the longest match
-            for tag in self.tags:
-                end_pos = tag.match(text, pos)
-                if end_pos is not None:
-                    length = end_pos - pos
-                    # Only accept matches that advance position (length > 0) or match at current position
-                    if length > 0 or end_pos == pos:
-                        if best_match is None or length > (best_match[1] - pos):
-                            best_match = (tag, end_pos)
-                        elif length == (best_match[1] - pos) and (
-                            self.tag_order[tag.name] < self.tag_order[best_match[0].name]
-                        ):
-                            # Same length: prefer earlier defined tag
-                            best_match = (tag, end_pos)
+        tags = self.tags
+        return [tags[priority].name for priority, _, _ in self._scan(text)]
 
-            if best_match is None:
-                raise ValueError(f"Cannot tokenize character at position {pos}: '{text[pos]}'")
+    def tokenize_with_recovery(self, text: str) -> tuple[list[str], list[LexError]]:
+        """
+        Tokenize the input text, recovering from untokenizable input.
+        Each shortest untokenizable run becomes an ERROR_TOKEN and is reported.
+        Returns (list of tag names, list of errors in input order).
+        """
+        errors: list[LexError] = []
+        names = [tag.name for tag in self.tags]
+        tokens = [
+            names[priority] if priority >= 0 else self.ERROR_TOKEN
+            for priority, _, _ in self._scan(text, errors)
+        ]
+        return tokens, errors
+
+    def tokenize_ids(
+        self, text: str, run_length: bool = False, errors: list[LexError] | None = None
+    ) -> TokenStream:
+        """
+        Tokenize the input text into a compact stream of tag ids.
+        Ids index token_names; with run_length, repeated ids are run-length encoded.
+        When errors is given, recovery mode is used and errors are appended to it.
+        """
+        stream = TokenStream(self.token_names, run_length)
+        append = stream.append
+        error_id = len(self.tags)
+        for priority, _, _ in self._scan(text, errors):
+            append(priority if priority >= 0 else error_id)
+        return stream
+
+    def iter_token_spans(
+        self, text: str, errors: list[LexError] | None = None, start: int = 0
+    ) -> Iterator[tuple[int, int, int]]:
+        """
+        Yield (token id, start, end) for each token; ids index token_names.
+        When errors is given, recovery mode is used and errors are appended to it.
+        Tokens are the same as a scan from the beginning yields, from start on,
+        when start is a token boundary (the end of a token, such as a checkpoint's).
+        """
+        error_id = len(self.tags)
+        for priority, begin, end in self._scan(text, errors, start):
+            yield (priority if priority >= 0 else error_id), begin, end
+
+    def iter_token_locations(
+        self, text: str, errors: list[LexError] | None = None
+    ) -> Iterator[tuple[int, int, int, int, int]]:
+        """
+        Yield (token id, start, end, line, column) for each token, where line and
+        column locate start (see LineIndex).
+        When errors is given, recovery mode is used and errors are appended to it.
+        """
+        index = LineIndex(text)
+        for token_id, start, end in self.iter_token_spans(text, errors):
+            yield (token_id, start, end, *index.location(start))
 
-            tag, end_pos = best_match
-            tokens.append(tag.name)
+    @staticmethod
+    def locate_errors(text: str, errors: list[LexError]) -> list[LexError]:
+        """Copies of errors found in text, with their line and column."""
+        if not errors:
+            return errors
+        index = LineIndex(text)
+        located = []
+        for error in errors:
+            line, column = index.location(error.position)
+            located.append(replace(error, line=line, column=column))
+        return located
 
-            # Prevent infinite loop: must advance position
-            if end_pos <= pos:
-                raise ValueError(f"Cannot advance past position {pos}")
+    def count_tokens(self, text: str, errors: list[LexError] | None = None) -> list[int]:
+        """
+        Count the tokens of each id without storing them; counts index token_names.
+        When errors is given, recovery mode is used and errors are appended to it.
+        """
+        counts = [0] * len(self.token_names)
+        # Error runs have priority -1, which indexes the error token's count
+        for priority, _, _ in self._scan(text, errors):
+            counts[priority] += 1
+        return counts
 
-            pos = end_pos
+    @staticmethod
+    def _line_ends(text: str) -> Iterator[int]:
+        """Positions just after each line break of text."""
+        return (newline.end() for newline in _NEWLINES.finditer(text))
+
+    def iter_histograms(
+        self, text: str, window: int | None = None, errors: list[LexError] | None = None
+    ) -> Iterator[tuple[int, list[int]]]:
+        """
+        Yield (bucket, counts) for consecutive pieces of text, in order.
+        Buckets are the lines of text numbered from 1 or, with window, the
+        windows of that many characters numbered from 0; tokens count in the
+        bucket where they start and counts index token_names. Only one bucket
+        is held at a time.
+        When errors is given, recovery mode is used and errors are appended to it.
+        """
+        if window is not None and window < 1:
+            raise ValueError("window must be positive")
+        length = len(text)
+        if not length:
+            return
+
+        if window is None:
+            line_ends = self._line_ends(text)
+
+            def bucket_end(end: int) -> int:
+                # Lines end after the next line break, whatever the previous end
+                return next(line_ends, length)
+
+            bucket = 1
+        else:
+
+            def bucket_end(end: int) -> int:
+                return end + window
+
+            bucket = 0
+
+        size = len(self.token_names)
+        counts = [0] * size
+        end = bucket_end(0)
+        for priority, start, _ in self._scan(text, errors):
+            while start >= end:
+                yield bucket, counts
+                counts = [0] * size
+                bucket += 1
+                end = bucket_end(end)
+            counts[priority] += 1
 
-        return tokens
+        yield bucket, counts
+        while end < length:
+            bucket += 1
+            end = bucket_end(end)
+            yield bucket, [0] * size
 
     def check_overlaps(self) -> list[tuple[str, str]]:
         """
@@ -0,0 +1,67 @@
+"""
+Line and column of input offsets, from an index of line starts.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from bisect import bisect_right
+from collections.abc import Callable
+from functools import partial
+from mmap import mmap
+
+
+class LineIndex:
+    """
+    Offsets where the lines of an input start, built on first use.
+
+    The index takes one pass of str.find (or bytes.find) calls over the
+    input, so lexing never counts lines; each lookup is then a bisect.
+    Lines and columns are numbered from 1, and columns count characters
+    (bytes for bytes-like input) from the start of the line.
+    """
+
+    def __init__(self, text: str | bytes | bytearray | memoryview | mmap):
+        # Released once the index is built
+        self._text: str | bytes | bytearray | memoryview | mmap | None = text
+        self._length = len(text)
+        self._starts: list[int] | None = None
+
+    def _build(self) -> list[int]:
+        text = self._text
+        if isinstance(text, memoryview):
+            text = text.tobytes()
+        if isinstance(text, str):
+            find: Callable[[int], int] = partial(text.find, "\n")
+        elif text is not None:
+            find = partial(text.find, b"\n")
+        else:
+            raise ValueError("The input was released before the index was built")
+        starts = [0]
+        pos = find(0)
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = find(pos + 1)
+        # The index no longer needs the input
+        self._text = None
+        return starts
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines; text after the last line break is a line, even when empty."""
+        if self._starts is None:
+            self._starts = self._build()
+        return len(self._starts)
+
+    def location(self, offset: int) -> tuple[int, int]:
+        """(line, column) of offset. Raises ValueError outside 0..len(text)."""
+        if not 0 <= offset <= self._length:
+            raise ValueError(f"Offset {offset} is outside the input")
+        if self._starts is None:
+            self._starts = self._build()
+        line = bisect_right(self._starts, offset)
+        return line, offset - self._starts[line - 1] + 1
+
+    def describe(self, offset: int) -> str:
+        """Location of offset as it appears in messages."""
+        line, column = self.location(offset)
+        return f"line {line}, column {column}"
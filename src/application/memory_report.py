@@ -0,0 +1,185 @@
+"""
+Memory footprint of tags, their lazy DFA caches and the lexers that hold them.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import sys
+import tracemalloc
+import types
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from ..domain.tag import Tag
+from .compiled_lexer import CompiledLexer
+
+# Shared by everything that refers to them; never part of a footprint
+_OPAQUE = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+)
+
+
+def deep_size(obj: object, seen: set[int] | None = None) -> int:
+    """
+    Bytes held by obj and everything it references through containers,
+    instance attributes and slots, as sys.getsizeof counts them.
+    Objects whose id is in seen are not counted again, and the ids of counted
+    objects are added to it, so one seen set spreads shared objects over
+    several calls without counting them twice. Classes, modules and functions
+    are shared by everything and never counted.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _OPAQUE):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, list | tuple | set | frozenset):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+def trace_compile(tag: Tag) -> int:
+    """
+    Peak bytes allocated, as tracemalloc sees them, while parsing a fresh copy
+    of tag's expression and building its automata and simulators.
+    tracemalloc is started for the measurement unless it is already tracing.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        Tag(tag.name, tag.expression, tag.construction).warm()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+    return peak - before
+
+
+@dataclass
+class TagMemory:
+    """
+    Footprint of one tag. automaton_bytes covers its automata, simulators and
+    parsed expression; dfa_bytes the lazy DFA caches of the calling thread's
+    lexers, without the simulators they step. compile_peak is only measured
+    on request (see trace_compile).
+    """
+
+    name: str
+    states: int = 0
+    transitions: int = 0
+    epsilon_edges: int = 0
+    automaton_bytes: int = 0
+    dfa_states: int = 0
+    dfa_bytes: int = 0
+    compile_peak: int | None = None
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes held by the tag and its DFA caches."""
+        return self.automaton_bytes + self.dfa_bytes
+
+
+@dataclass
+class MemoryReport:
+    """
+    Footprint of a tag set: each tag, then what the lexers hold besides the
+    tags (literal trie, dispatch tables) and the bytes of a result cache.
+    """
+
+    tags: list[TagMemory] = field(default_factory=list)
+    lexer_bytes: int = 0
+    result_cache_bytes: int = 0
+
+    @property
+    def states(self) -> int:
+        """States of every tag's automaton."""
+        return sum(tag.states for tag in self.tags)
+
+    @property
+    def transitions(self) -> int:
+        """Symbol transitions of every tag's automaton."""
+        return sum(tag.transitions for tag in self.tags)
+
+    @property
+    def epsilon_edges(self) -> int:
+        """ε-transitions of every tag's automaton."""
+        return sum(tag.epsilon_edges for tag in self.tags)
+
+    @property
+    def automaton_bytes(self) -> int:
+        """Bytes of every tag's automata."""
+        return sum(tag.automaton_bytes for tag in self.tags)
+
+    @property
+    def dfa_bytes(self) -> int:
+        """Bytes of every tag's DFA caches."""
+        return sum(tag.dfa_bytes for tag in self.tags)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes of everything reported."""
+        return self.automaton_bytes + self.dfa_bytes + self.lexer_bytes + self.result_cache_bytes
+
+
+def measure(
+    snapshot: CompiledLexer,
+    tags: Iterable[Tag] | None = None,
+    trace: bool = False,
+    result_cache_bytes: int = 0,
+) -> MemoryReport:
+    """
+    Measure the tags of a snapshot, or the given ones among them, building the
+    automata of tags not compiled yet. Lexer bytes are only measured for the
+    whole tag set. With trace, each tag's compilation is also traced (see
+    trace_compile).
+    """
+    selected = snapshot.tags if tags is None else tuple(tags)
+    priority = {id(tag): i for i, tag in enumerate(snapshot.tags)}
+    lexers = snapshot.built_lexers()
+    caches = [lexer.dfa_caches() for lexer in lexers]
+
+    seen: set[int] = set()
+    report = MemoryReport(result_cache_bytes=result_cache_bytes)
+    for tag in selected:
+        tag.warm()
+        memory = TagMemory(tag.name, len(tag.automaton.states))
+        for _, symbol, _ in tag.automaton.iter_transitions():
+            if symbol is None:
+                memory.epsilon_edges += 1
+            else:
+                memory.transitions += 1
+        memory.automaton_bytes = deep_size(tag, seen)
+        for lexer_caches in caches:
+            cache = lexer_caches.get(priority[id(tag)])
+            if cache is not None:
+                memory.dfa_states += cache.stats.states
+                memory.dfa_bytes += deep_size(cache, seen)
+        if trace:
+            memory.compile_peak = trace_compile(tag)
+        report.tags.append(memory)
+
+    if tags is None:
+        # Whatever the tags and caches above did not already account for
+        report.lexer_bytes = sum(deep_size(lexer, seen) for lexer in lexers)
+    return report
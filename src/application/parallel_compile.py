@@ -0,0 +1,98 @@
+"""
+Parallel compilation of tag expressions.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+
+from ..domain.regex_parser import RegexParser
+from ..domain.tag import CompiledExpression
+
+# Fewest distinct expressions worth a process pool (see pool_workers)
+PARALLEL_THRESHOLD = 32
+
+
+def pool_workers(workers: int | None, jobs: int, threshold: int) -> int:
+    """
+    Processes to run jobs in: workers, or the CPU count for None, at most one
+    per job. Below threshold jobs, or with a single worker, a process pool
+    costs more than it saves and 0 is returned, for running them in this process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 2 or jobs < threshold:
+        return 0
+    return min(workers, jobs)
+
+
+def open_pool(workers: int, **options) -> ProcessPoolExecutor | None:
+    """
+    Process pool of workers processes, with other ProcessPoolExecutor options.
+    Returns None if the platform has no usable process pool.
+    """
+    try:
+        return ProcessPoolExecutor(max_workers=workers, **options)
+    except (OSError, NotImplementedError):
+        return None
+
+
+def compile_expression(expression: str, construction: str = RegexParser.THOMPSON) -> tuple | None:
+    """
+    Compile one expression into compact form (see CompiledExpression.to_compact).
+    Returns None if the expression is invalid. Runs in the worker processes.
+    """
+    try:
+        compact: tuple = CompiledExpression.compile(expression, construction).to_compact()
+    except Exception:
+        return None
+    return compact
+
+
+def _compile_serial(
+    expressions: list[str], construction: str
+) -> dict[str, CompiledExpression | None]:
+    """Compile expressions in this process."""
+    compiled: dict[str, CompiledExpression | None] = {}
+    for expression in expressions:
+        try:
+            compiled[expression] = CompiledExpression.compile(expression, construction)
+        except Exception:
+            compiled[expression] = None
+    return compiled
+
+
+def compile_expressions(
+    expressions: Iterable[str],
+    construction: str = RegexParser.THOMPSON,
+    workers: int | None = None,
+) -> dict[str, CompiledExpression | None]:
+    """
+    Compile each distinct expression once, in a process pool when there are many.
+    Returns a mapping from expression to its compiled form (None for invalid expressions).
+    workers defaults to the CPU count; 1 always compiles in this process.
+    """
+    unique = list(dict.fromkeys(expressions))
+    workers = pool_workers(workers, len(unique), PARALLEL_THRESHOLD)
+    pool = open_pool(workers) if workers else None
+    if pool is None:
+        return _compile_serial(unique, construction)
+
+    chunksize = max(1, len(unique) // (workers * 4))
+    try:
+        with pool:
+            compacts = list(
+                pool.map(compile_expression, unique, repeat(construction), chunksize=chunksize)
+            )
+    except (OSError, BrokenProcessPool):
+        # Workers could not be started, or died
+        return _compile_serial(unique, construction)
+
+    return {
+        expression: None if compact is None else CompiledExpression.from_compact(compact)
+        for expression, compact in zip(unique, compacts, strict=True)
+    }
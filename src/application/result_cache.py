@@ -0,0 +1,96 @@
+"""
+Bounded LRU cache of tokenization results.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import sys
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from .lexer import LexError
+
+
+@dataclass
+class ResultCacheStats:
+    """Counters of a result cache."""
+
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    bytes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered from the cache (0.0 before any lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """
+    Least recently used cache of (output, errors) results by key.
+
+    The size of an entry is the memory held by its output string and error
+    texts. Entries are evicted from the least recently used end until both
+    max_entries and max_bytes hold; a result larger than max_bytes is not kept.
+    """
+
+    DEFAULT_MAX_ENTRIES = 128
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache limits must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[str, tuple[LexError, ...], int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> tuple[str, list[LexError]] | None:
+        """Cached (output, errors) for key, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry[0], list(entry[1])
+
+    def put(self, key: Hashable, output: str, errors: list[LexError]):
+        """Store a result, evicting least recently used entries as needed."""
+        size = sys.getsizeof(output) + sum(sys.getsizeof(error.text) for error in errors)
+        if size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        self._entries[key] = (output, tuple(errors), size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self._evictions += 1
+
+    def clear(self):
+        """Drop every entry; the counters are kept."""
+        self._entries.clear()
+        self._bytes = 0
+
+    @property
+    def stats(self) -> ResultCacheStats:
+        """Current counters."""
+        return ResultCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            entries=len(self._entries),
+            bytes=self._bytes,
+            evictions=self._evictions,
+        )
@@ -0,0 +1,287 @@
+"""
+Compact binary token-stream format.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+
+Layout of one frame (frames may be concatenated in a file):
+
+    magic     4 bytes  b"LEXT"
+    version   1 byte
+    flags     1 byte   bit 0: records carry spans
+    names     varint count, then per name a varint byte length and UTF-8 bytes
+    records   varint (tag id + 1), followed with spans by varint gap (start minus
+              previous end) and varint length
+    end       varint 0
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from functools import partial
+from itertools import accumulate, repeat
+from operator import add, sub
+from typing import BinaryIO, NamedTuple
+
+MAGIC = b"LEXT"
+VERSION = 1
+FLAG_SPANS = 0x01
+
+# Records are buffered and written in chunks of about this many bytes
+CHUNK_SIZE = 1 << 16
+
+# Longest varint the reader accepts (enough for 64-bit values)
+MAX_VARINT_BYTES = 10
+
+# Maps a one-byte record (tag id + 1) to the tag id
+_PREDECESSOR = (-1).__add__
+
+# First byte of a varint longer than one byte
+_MULTI_BYTE = re.compile(rb"[\x80-\xff]")
+
+
+class Token(NamedTuple):
+    """A decoded token; start and end are None when the frame has no spans."""
+
+    name: str
+    start: int | None
+    end: int | None
+
+
+# Token from a (name, start, end) tuple without going through Python-level __new__
+_new_token = partial(tuple.__new__, Token)
+
+
+def encode_varint(value: int, out: bytearray):
+    """Append value as an unsigned LEB128 varint."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data: bytes | bytearray, pos: int) -> tuple[int, int]:
+    """Decode an unsigned LEB128 varint at pos. Returns (value, new_position)."""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint in token stream")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 7 * MAX_VARINT_BYTES:
+            raise ValueError("Varint too long in token stream")
+
+
+class BinaryTokenWriter:
+    """Writes one frame of the binary token format to a binary stream."""
+
+    def __init__(self, stream: BinaryIO, names: Iterable[str], spans: bool = False):
+        self.stream = stream
+        self.spans = spans
+        self._buffer = bytearray(MAGIC)
+        self._buffer.append(VERSION)
+        self._buffer.append(FLAG_SPANS if spans else 0)
+
+        names = list(names)
+        encode_varint(len(names), self._buffer)
+        for name in names:
+            data = name.encode("utf-8")
+            encode_varint(len(data), self._buffer)
+            self._buffer += data
+
+        self._last_end = 0
+
+    def write(self, token_id: int, start: int = 0, end: int = 0):
+        """Write one token record."""
+        buffer = self._buffer
+        encode_varint(token_id + 1, buffer)
+        if self.spans:
+            encode_varint(start - self._last_end, buffer)
+            encode_varint(end - start, buffer)
+            self._last_end = end
+        if len(buffer) >= CHUNK_SIZE:
+            self.stream.write(buffer)
+            buffer.clear()
+
+    def write_all(self, tokens: Iterable[tuple[int, int, int]]):
+        """Write (token id, start, end) tuples."""
+        for token_id, start, end in tokens:
+            self.write(token_id, start, end)
+
+    def close(self):
+        """Terminate the frame and flush buffered records."""
+        self._buffer.append(0)
+        self.stream.write(self._buffer)
+        self._buffer.clear()
+
+
+class BinaryTokenReader:
+    """
+    Streaming reader for the binary token format.
+
+    Iterating yields Token tuples across all frames of the stream; the input
+    is consumed in CHUNK_SIZE blocks, so memory does not depend on its size.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._buffer = b""
+        self._pos = 0
+        self._eof = False
+        self.names: list[str] = []
+        self.spans = False
+
+    def _fill(self, size: int) -> bool:
+        """Make at least size unread bytes available; False at end of input."""
+        while len(self._buffer) - self._pos < size and not self._eof:
+            chunk = self.stream.read(CHUNK_SIZE)
+            if not chunk:
+                self._eof = True
+                break
+            self._buffer = self._buffer[self._pos :] + chunk
+            self._pos = 0
+        return len(self._buffer) - self._pos >= size
+
+    def _varint(self) -> int:
+        """Read one varint."""
+        self._fill(MAX_VARINT_BYTES)
+        value, self._pos = decode_varint(self._buffer, self._pos)
+        return value
+
+    def _read_header(self) -> bool:
+        """Read a frame header. Returns False at a clean end of input."""
+        if not self._fill(1):
+            return False
+        if not self._fill(len(MAGIC) + 2):
+            raise ValueError("Truncated token stream header")
+
+        header = self._buffer[self._pos : self._pos + len(MAGIC) + 2]
+        self._pos += len(header)
+        if header[: len(MAGIC)] != MAGIC:
+            raise ValueError("Not a binary token stream")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"Unsupported token stream version: {header[len(MAGIC)]}")
+        self.spans = bool(header[len(MAGIC) + 1] & FLAG_SPANS)
+
+        self.names = []
+        for _ in range(self._varint()):
+            size = self._varint()
+            if not self._fill(size):
+                raise ValueError("Truncated tag name in token stream")
+            self.names.append(self._buffer[self._pos : self._pos + size].decode("utf-8"))
+            self._pos += size
+        return True
+
+    def _id_blocks(self) -> Iterator[Iterable[int]]:
+        """
+        Token ids of a frame without spans, a buffered block at a time.
+        Runs of one-byte varints are decoded in C; only longer varints
+        (ids of 127 and above) go through decode_varint.
+        """
+        need = 1
+        while True:
+            if not self._fill(need):
+                raise ValueError("Truncated token stream")
+            data, pos = self._buffer, self._pos
+            # Continuation bytes are >= 0x80, so the first zero byte ends the frame
+            end = data.find(0, pos)
+            stop = len(data) if end < 0 else end
+            if end < 0:
+                # Leave a varint split by the buffer end for the next block
+                while stop > pos and data[stop - 1] >= 0x80:
+                    stop -= 1
+
+            while pos < stop:
+                match = _MULTI_BYTE.search(data, pos, stop)
+                run_end = stop if match is None else match.start()
+                if run_end > pos:
+                    yield map(_PREDECESSOR, data[pos:run_end])
+                if match is None:
+                    break
+                record, pos = decode_varint(data, run_end)
+                yield (record - 1,)
+
+            if end >= 0:
+                self._pos = end + 1
+                return
+            self._pos = stop
+            need = len(data) - stop + 1
+
+    def _span_blocks(self) -> Iterator[tuple[Iterable[int], Iterable[int], Iterable[int]]]:
+        """
+        (ids, starts, ends) of a frame with spans, a buffered block at a time.
+        Runs of records made of one-byte varints are decoded in C.
+        """
+        # A whole record (id, gap, length) fits in this many bytes
+        record_size = 3 * MAX_VARINT_BYTES
+        end = 0
+        while True:
+            if len(self._buffer) - self._pos < record_size:
+                self._fill(record_size)
+            data, pos = self._buffer, self._pos
+            if pos >= len(data):
+                raise ValueError("Truncated token stream")
+
+            match = _MULTI_BYTE.search(data, pos)
+            count = ((len(data) if match is None else match.start()) - pos) // 3
+            if count:
+                run = data[pos : pos + 3 * count]
+                ids = run[0::3]
+                terminator = ids.find(0)
+                if terminator >= 0:
+                    count = terminator
+                sizes = run[2 : 3 * count : 3]
+                ends = list(accumulate(map(add, run[1 : 3 * count : 3], sizes), initial=end))
+                del ends[0]
+                if count:
+                    end = ends[-1]
+                    yield map(_PREDECESSOR, ids[:count]), map(sub, ends, sizes), ends
+                self._pos = pos + 3 * count
+                if terminator >= 0:
+                    self._pos += 1
+                    return
+                continue
+
+            # A record with a multi-byte varint
+            record, pos = decode_varint(data, pos)
+            if record == 0:
+                self._pos = pos
+                return
+            gap, pos = decode_varint(data, pos)
+            size, pos = decode_varint(data, pos)
+            self._pos = pos
+            start = end + gap
+            end = start + size
+            yield (record - 1,), (start,), (end,)
+
+    def iter_ids(self) -> Iterator[tuple[int, int | None, int | None]]:
+        """Yield (token id, start, end) records; ids index the current frame's names."""
+        while self._read_header():
+            if self.spans:
+                for ids, starts, ends in self._span_blocks():
+                    yield from zip(ids, starts, ends, strict=True)
+            else:
+                for ids in self._id_blocks():
+                    yield from zip(ids, repeat(None), repeat(None))
+
+    def __iter__(self) -> Iterator[Token]:
+        while self._read_header():
+            names = self.names
+            if self.spans:
+                for ids, starts, ends in self._span_blocks():
+                    yield from map(
+                        _new_token, zip(map(names.__getitem__, ids), starts, ends, strict=True)
+                    )
+            else:
+                # Without spans every token of a name is the same tuple
+                tokens = [Token(name, None, None) for name in names]
+                for ids in self._id_blocks():
+                    yield from map(tokens.__getitem__, ids)
+
+
+def read_tokens(stream: BinaryIO) -> Iterator[Token]:
+    """Iterate over the tokens of a binary token stream."""
+    return iter(BinaryTokenReader(stream))
@@ -0,0 +1,80 @@
+"""
+Compact token stream of interned tag ids.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from array import array
+from collections.abc import Iterator
+from itertools import repeat
+
+
+def id_typecode(name_count: int) -> str:
+    """Smallest unsigned array typecode able to hold ids below name_count."""
+    if name_count <= 1 << 8:
+        return "B"
+    if name_count <= 1 << 16:
+        return "H"
+    return "I"
+
+
+class TokenStream:
+    """
+    Sequence of tokens stored as small integer ids into a name table.
+
+    With run_length enabled, consecutive equal ids are stored once together
+    with a repeat count, which keeps whitespace- or digit-heavy streams small.
+    Names are only looked up when the stream is iterated or rendered.
+    """
+
+    def __init__(self, names: tuple[str, ...], run_length: bool = False):
+        self.names = names
+        self.run_length = run_length
+        self.ids = array(id_typecode(len(names)))
+        self.counts = array("L")
+        self._length = 0
+
+    def append(self, token_id: int):
+        """Append one token id."""
+        self._length += 1
+        if self.run_length:
+            ids = self.ids
+            if ids and ids[-1] == token_id:
+                self.counts[-1] += 1
+                return
+            self.counts.append(1)
+        self.ids.append(token_id)
+
+    def __len__(self):
+        return self._length
+
+    def runs(self) -> Iterator[tuple[int, int]]:
+        """Yield (token id, repeat count) runs."""
+        if self.run_length:
+            yield from zip(self.ids, self.counts, strict=True)
+        else:
+            for token_id in self.ids:
+                yield token_id, 1
+
+    def iter_ids(self) -> Iterator[int]:
+        """Yield every token id in order."""
+        if not self.run_length:
+            yield from self.ids
+            return
+        for token_id, count in zip(self.ids, self.counts, strict=True):
+            yield from repeat(token_id, count)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield every token name in order."""
+        names = self.names
+        for token_id in self.iter_ids():
+            yield names[token_id]
+
+    def to_text(self) -> str:
+        """Render the stream as space-separated tag names."""
+        names = self.names
+        if not self.run_length:
+            return " ".join([names[token_id] for token_id in self.ids])
+        return " ".join(
+            [" ".join(repeat(names[token_id], count)) for token_id, count in self.runs()]
+        )
@@ -5,6 +5,15 @@ Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 """
 
 from collections import defaultdict
+from collections.abc import Iterator
+
+from .bit_parallel import BitParallelNFA
+
+
+def _dot_id(text: str) -> str:
+    """Quote text as a DOT identifier."""
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
 
 
 class State:
@@ -98,23 +107,108 @@ class FiniteAutomaton:
 
         return longest_match
 
+    def to_compact(self) -> tuple:
+        """
+        Serialize to plain tuples, cheap to pickle between processes:
+        (state count, start index, final indices, transitions, epsilon transitions).
+        """
+        index = {state: i for i, state in enumerate(self.states)}
+        start = index[self.start_state] if self.start_state else -1
+        finals = tuple(i for i, state in enumerate(self.states) if state.is_final)
+        transitions = tuple(
+            (i, symbol, index[target])
+            for i, state in enumerate(self.states)
+            for symbol, targets in state.transitions.items()
+            for target in targets
+        )
+        epsilons = tuple(
+            (i, index[target])
+            for i, state in enumerate(self.states)
+            for target in state.epsilon_transitions
+        )
+        return len(self.states), start, finals, transitions, epsilons
+
+    @classmethod
+    def from_compact(cls, data: tuple) -> "FiniteAutomaton":
+        """Rebuild an automaton serialized with to_compact."""
+        state_count, start, finals, transitions, epsilons = data
+        automaton = cls()
+        states = [automaton.create_state() for _ in range(state_count)]
+        for i in finals:
+            states[i].is_final = True
+        for source, symbol, target in transitions:
+            states[source].add_transition(symbol, states[target])
+        for source, target in epsilons:
+            states[source].add_epsilon_transition(states[target])
+        if start >= 0:
+            automaton.start_state = states[start]
+        return automaton
+
+    def bit_parallel(self) -> BitParallelNFA:
+        """
+        Build a bit-parallel simulator of the automaton as it is now.
+        The simulator is a snapshot: later edits to the states are not seen by it,
+        so build it once construction is finished and keep it alongside.
+        """
+        return BitParallelNFA(self)
+
     def get_formal_definition(self) -> str:
         """Get formal definition of the automaton."""
-        if not self.start_state:
-            return "Empty automaton"
-
-        lines = []
-        lines.append(f"States: {[s.id for s in self.states]}")
-        lines.append(f"Start state: {self.start_state.id}")
-        final_states = [s.id for s in self.states if s.is_final]
-        lines.append(f"Final states: {final_states}")
-        lines.append("Transitions:")
+        return "\n".join(self.iter_formal_definition())
 
+    def iter_transitions(self) -> Iterator[tuple[State, str | None, State]]:
+        """Yield (source, symbol, target) for each transition; symbol is None for ε."""
         for state in self.states:
             for symbol, targets in state.transitions.items():
                 for target in targets:
-                    lines.append(f"  δ({state.id}, '{symbol}') = {target.id}")
+                    yield state, symbol, target
             for target in state.epsilon_transitions:
-                lines.append(f"  δ({state.id}, ε) = {target.id}")
+                yield state, None, target
+
+    def iter_formal_definition(self, limit: int | None = None) -> Iterator[str]:
+        """
+        Yield the lines of the formal definition one at a time.
+        With limit, at most that many transitions are listed, followed by a
+        line counting the omitted ones.
+        """
+        if not self.start_state:
+            yield "Empty automaton"
+            return
 
-        return "\n".join(lines)
+        yield f"States: {[s.id for s in self.states]}"
+        yield f"Start state: {self.start_state.id}"
+        final_states = [s.id for s in self.states if s.is_final]
+        yield f"Final states: {final_states}"
+        yield "Transitions:"
+
+        omitted = 0
+        for count, (state, symbol, target) in enumerate(self.iter_transitions()):
+            if limit is not None and count >= limit:
+                omitted += 1
+            elif symbol is None:
+                yield f"  δ({state.id}, ε) = {target.id}"
+            else:
+                yield f"  δ({state.id}, '{symbol}') = {target.id}"
+        if omitted:
+            yield f"  ... {omitted} more transition(s)"
+
+    def iter_dot(self, name: str = "automaton") -> Iterator[str]:
+        """
+        Yield the automaton as a Graphviz DOT digraph, one line at a time.
+        Final states are double circles and ε-transitions are dashed edges.
+        """
+        yield f"digraph {_dot_id(name)} {{"
+        yield "  rankdir=LR;"
+        yield "  node [shape=circle];"
+        if self.start_state is not None:
+            yield '  __start [shape=point, label=""];'
+            yield f"  __start -> {self.start_state.id};"
+        for state in self.states:
+            if state.is_final:
+                yield f"  {state.id} [shape=doublecircle];"
+        for state, symbol, target in self.iter_transitions():
+            if symbol is None:
+                yield f'  {state.id} -> {target.id} [label="ε", style=dashed];'
+            else:
+                yield f"  {state.id} -> {target.id} [label={_dot_id(symbol)}];"
+        yield "}"
@@ -0,0 +1,150 @@
+"""
+Bit-parallel NFA simulation using Python ints as state bitsets.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .automaton import FiniteAutomaton
+
+# Transitions on this symbol match any input character
+WILDCARD = "."
+
+
+class BitParallelNFA:
+    """
+    NFA simulator that represents the set of active states as a single int.
+
+    Every state of the source automaton is numbered by its position in
+    ``automaton.states``; bit ``i`` of a mask is set when state ``i`` is active.
+    Epsilon closures are folded into the precomputed follow masks, so a step is
+    an AND with the states that can move on the symbol followed by ORs of
+    table entries, without allocating any sets.
+    """
+
+    def __init__(self, automaton: FiniteAutomaton):
+        states = automaton.states
+        index = {state: i for i, state in enumerate(states)}
+        self.state_count = len(states)
+
+        # Epsilon closure of every single state, as a mask
+        closures = []
+        for state in states:
+            mask = 0
+            for reached in automaton.epsilon_closure({state}):
+                mask |= 1 << index[reached]
+            closures.append(mask)
+
+        self.final_mask = 0
+        for i, state in enumerate(states):
+            if state.is_final:
+                self.final_mask |= 1 << i
+
+        self.start_mask = 0
+        if automaton.start_state is not None:
+            self.start_mask = closures[index[automaton.start_state]]
+
+        # Closed targets on the wildcard symbol, per source state
+        wildcard: dict[int, int] = {}
+        for i, state in enumerate(states):
+            targets = state.transitions.get(WILDCARD)
+            if targets:
+                mask = 0
+                for target in targets:
+                    mask |= closures[index[target]]
+                wildcard[i] = mask
+
+        # Closed targets per explicit symbol, merged with the wildcard moves
+        follow: dict[str, dict[int, int]] = {}
+        for i, state in enumerate(states):
+            for symbol, targets in state.transitions.items():
+                if symbol == WILDCARD or not targets:
+                    continue
+                mask = 0
+                for target in targets:
+                    mask |= closures[index[target]]
+                follow.setdefault(symbol, {})[i] = mask
+        for table in follow.values():
+            for i, mask in wildcard.items():
+                table[i] = table.get(i, 0) | mask
+
+        self._wildcard = wildcard
+        self._wildcard_active = self._active_mask(wildcard)
+        self._follow = follow
+        self._active = {symbol: self._active_mask(table) for symbol, table in follow.items()}
+
+    @staticmethod
+    def _active_mask(table: dict[int, int]) -> int:
+        """Mask of the source states that have an entry in table."""
+        mask = 0
+        for i in table:
+            mask |= 1 << i
+        return mask
+
+    def step(self, mask: int, symbol: str) -> int:
+        """Return the (epsilon-closed) set of states reached from mask on symbol."""
+        table = self._follow.get(symbol)
+        if table is None:
+            table = self._wildcard
+            mask &= self._wildcard_active
+        else:
+            mask &= self._active[symbol]
+
+        result = 0
+        while mask:
+            low = mask & -mask
+            result |= table[low.bit_length() - 1]
+            mask ^= low
+        return result
+
+    def is_accepting(self, mask: int) -> bool:
+        """Check whether mask contains a final state."""
+        return bool(mask & self.final_mask)
+
+    def match(self, text: str, start_pos: int = 0) -> int | None:
+        """
+        Match against text starting at start_pos.
+        Returns the end position of the longest match, None if nothing matches.
+        """
+        mask = self.start_mask
+        if not mask:
+            return None
+
+        final_mask = self.final_mask
+        follow = self._follow
+        active = self._active
+        wildcard = self._wildcard
+        wildcard_active = self._wildcard_active
+
+        longest_match = start_pos if mask & final_mask else None
+
+        pos = start_pos
+        length = len(text)
+        while pos < length:
+            symbol = text[pos]
+            table = follow.get(symbol)
+            if table is None:
+                table = wildcard
+                mask &= wildcard_active
+            else:
+                mask &= active[symbol]
+
+            result = 0
+            while mask:
+                low = mask & -mask
+                result |= table[low.bit_length() - 1]
+                mask ^= low
+
+            if not result:
+                break
+
+            mask = result
+            pos += 1
+            if mask & final_mask:
+                longest_match = pos
+
+        return longest_match
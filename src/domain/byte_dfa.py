@@ -0,0 +1,157 @@
+"""
+Lazily determinized automaton over bytes with 256-entry transition rows.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from mmap import mmap
+
+from .bit_parallel import BitParallelNFA
+from .dfa_cache import DFACache, DFACacheStats
+
+# Inputs that index to byte values without decoding
+ByteInput = bytes | bytearray | memoryview | mmap
+
+# NFA symbol of every byte value; bytes without an explicit transition take wildcards
+_SYMBOLS = tuple(chr(byte) for byte in range(256))
+
+# Row entry of a transition that has not been computed yet
+_UNKNOWN = -1
+
+
+class ByteDFA(DFACache):
+    """
+    Lazy DFA like LazyDFA, stepping on byte values instead of characters.
+
+    DFA states are numbered and their rows are lists of 256 state ids indexed
+    by the input byte, so input from bytes, bytearray, memoryview or mmap is
+    matched with one list index per byte and no decoding. State 0 is the dead
+    state. Byte b is the NFA symbol chr(b): for ASCII this is the character
+    itself, and bytes 0x80-0xff can only be taken by wildcard transitions as
+    long as the tag only uses ASCII symbols.
+
+    The state budget, flushing and thrash fallback are DFACache's; a max_states
+    of None disables the cache and steps the NFA directly.
+    """
+
+    def __init__(self, nfa: BitParallelNFA, max_states: int | None = DFACache.DEFAULT_MAX_STATES):
+        super().__init__(nfa, max_states)
+        self._masks: list[int] = [0]
+        self._ids: dict[int, int] = {0: 0}
+        self._rows: list[list[int]] = [[0] * 256]
+        self._accepting: list[bool] = [False]
+
+    @property
+    def stats(self) -> DFACacheStats:
+        """Current counters; the dead state is not counted."""
+        rows = self._rows[1:]
+        return DFACacheStats(
+            states=len(rows),
+            transitions=sum(256 - row.count(_UNKNOWN) for row in rows),
+            chars=self._chars,
+            misses=self._misses,
+            flushes=self._flushes,
+            fallbacks=int(self.fallback and self.max_states is not None),
+        )
+
+    def _add(self, mask: int) -> int | None:
+        """
+        Number a new DFA state, flushing the cache when it is full.
+        Returns None once the cache thrashes and matching must use the NFA.
+        """
+        # The dead state does not count against the budget
+        if self._full(len(self._masks) - 1):
+            # Lists are cleared in place so running matches keep valid references
+            del self._masks[1:], self._rows[1:], self._accepting[1:]
+            self._ids = {0: 0}
+            if self.fallback:
+                return None
+
+        state = len(self._masks)
+        self._masks.append(mask)
+        self._rows.append([_UNKNOWN] * 256)
+        self._accepting.append(bool(mask & self.nfa.final_mask))
+        self._ids[mask] = state
+        return state
+
+    def _miss(self, state: int, byte: int) -> tuple[int | None, int]:
+        """
+        Compute and cache the transition of state on byte.
+        Returns (target state or None after a thrash fallback, target mask).
+        """
+        self._misses += 1
+        mask = self.nfa.step(self._masks[state], _SYMBOLS[byte])
+        target = self._ids.get(mask)
+        if target is None:
+            flushes = self._flushes
+            target = self._add(mask)
+            # A flush renumbered the states, so state's row no longer exists
+            if target is None or flushes != self._flushes:
+                return target, mask
+        self._rows[state][byte] = target
+        return target, mask
+
+    def step(self, mask: int, byte: int) -> int:
+        """Return the state mask reached from mask on byte, through the cache (0 when dead)."""
+        if self.fallback:
+            return self.nfa.step(mask, _SYMBOLS[byte])
+        self._chars += 1
+        state = self._ids.get(mask)
+        if state is None:
+            state = self._add(mask)
+            if state is None:
+                return self.nfa.step(mask, _SYMBOLS[byte])
+        target = self._rows[state][byte]
+        if target >= 0:
+            return self._masks[target]
+        return self._miss(state, byte)[1]
+
+    def match(self, data: ByteInput, start_pos: int = 0) -> int | None:
+        """
+        Match against bytes-like data starting at start_pos.
+        Returns the end position of the longest match, None if nothing matches.
+        """
+        nfa = self.nfa
+        mask = nfa.start_mask
+        if not mask:
+            return None
+
+        longest_match = start_pos if mask & nfa.final_mask else None
+        if self.fallback:
+            return self._finish_with_nfa(data, start_pos, mask, longest_match)
+
+        state = self._ids.get(mask)
+        if state is None:
+            state = self._add(mask)
+            if state is None:
+                return self._finish_with_nfa(data, start_pos, mask, longest_match)
+
+        rows = self._rows
+        accepting = self._accepting
+        pos = start_pos
+        length = len(data)
+        try:
+            while pos < length:
+                byte = data[pos]
+                target = rows[state][byte]
+                if target < 0:
+                    self._chars += pos - start_pos
+                    start_pos = pos
+                    missed, mask = self._miss(state, byte)
+                    if missed is None:
+                        pos += 1
+                        if mask & nfa.final_mask:
+                            longest_match = pos
+                        return self._finish_with_nfa(data, pos, mask, longest_match)
+                    target = missed
+                if not target:
+                    break
+
+                state = target
+                pos += 1
+                if accepting[state]:
+                    longest_match = pos
+        finally:
+            self._chars += pos - start_pos
+
+        return longest_match
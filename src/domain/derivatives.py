@@ -0,0 +1,90 @@
+"""
+Brzozowski-derivative matcher over the regular expression AST.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from . import regex_ast
+from .regex_ast import EMPTY, EPSILON, WILDCARD, Regex
+from .regex_parser import RegexParser
+
+
+def derive(node: Regex, symbol: str) -> Regex:
+    """Brzozowski derivative of node with respect to symbol."""
+    kind = node.kind
+    if kind == Regex.CHAR:
+        return EPSILON if node.symbol == symbol or node.symbol == WILDCARD else EMPTY
+    if kind == Regex.CONCAT:
+        # Walk the right-nested chain iteratively: each nullable item lets the
+        # derivative continue into the rest of the chain
+        terms = []
+        while node.kind == Regex.CONCAT:
+            left, node = node.children
+            terms.append(regex_ast.concat(derive(left, symbol), node))
+            if not left.nullable:
+                return regex_ast.union(*terms)
+        terms.append(derive(node, symbol))
+        return regex_ast.union(*terms)
+    if kind == Regex.UNION:
+        return regex_ast.union(*(derive(child, symbol) for child in node.children))
+    if kind == Regex.STAR:
+        return regex_ast.concat(derive(node.children[0], symbol), node)
+    # ∅ and λ
+    return EMPTY
+
+
+class DerivativeMatcher:
+    """
+    Lazy DFA whose states are interned derivatives of the start expression.
+
+    Transitions are memoized per character class: every symbol that does not
+    occur literally in a state's expression has the same derivative, so those
+    symbols share a single entry keyed by None.
+    """
+
+    def __init__(self, root: Regex):
+        self.start = root
+        self._transitions: dict[Regex, dict[str | None, Regex]] = {}
+
+    @classmethod
+    def from_expression(cls, expr: str) -> "DerivativeMatcher":
+        """Build a matcher directly from an RPN expression."""
+        return cls(RegexParser().parse(expr))
+
+    @property
+    def state_count(self) -> int:
+        """Number of DFA states discovered so far."""
+        return len(self._transitions)
+
+    def step(self, node: Regex, symbol: str) -> Regex:
+        """Return the state reached from node on symbol (∅ when dead)."""
+        table = self._transitions.get(node)
+        if table is None:
+            table = self._transitions[node] = {}
+        key = symbol if symbol in node.chars else None
+        target = table.get(key)
+        if target is None:
+            target = table[key] = derive(node, symbol)
+        return target
+
+    def match(self, text: str, start_pos: int = 0) -> int | None:
+        """
+        Match against text starting at start_pos.
+        Returns the end position of the longest match, None if nothing matches.
+        """
+        node = self.start
+        if node is EMPTY:
+            return None
+
+        longest_match = start_pos if node.nullable else None
+
+        pos = start_pos
+        while pos < len(text):
+            node = self.step(node, text[pos])
+            if node is EMPTY:
+                break
+            pos += 1
+            if node.nullable:
+                longest_match = pos
+
+        return longest_match
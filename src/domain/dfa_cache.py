@@ -0,0 +1,221 @@
+"""
+Lazily determinized automaton with a bounded state cache.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from mmap import mmap
+
+from .bit_parallel import BitParallelNFA
+
+
+@dataclass
+class DFACacheStats:
+    """Counters of a lazy DFA cache."""
+
+    states: int = 0
+    transitions: int = 0
+    chars: int = 0
+    misses: int = 0
+    flushes: int = 0
+    fallbacks: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Characters stepped through an already cached transition."""
+        return self.chars - self.misses
+
+    def __add__(self, other: "DFACacheStats") -> "DFACacheStats":
+        return DFACacheStats(
+            self.states + other.states,
+            self.transitions + other.transitions,
+            self.chars + other.chars,
+            self.misses + other.misses,
+            self.flushes + other.flushes,
+            self.fallbacks + other.fallbacks,
+        )
+
+
+class DFACache:
+    """
+    State budget shared by the lazy DFAs over a bit-parallel NFA.
+
+    A cache holds at most max_states states; when it is full it is flushed
+    and rebuilt as needed, as in RE2. If flushes come so often that fewer than
+    THRASH_CHARS characters per cached state are scanned between them, the
+    cache is not paying for itself (typically an exponential blow-up such as
+    (a+b)*.a.(a+b).(a+b)...) and fallback is set: matching uses plain NFA
+    simulation for the rest of the DFA's life, which keeps the cost per
+    character bounded. A max_states of None starts in fallback.
+    """
+
+    DEFAULT_MAX_STATES = 2048
+    THRASH_CHARS = 10
+
+    def __init__(self, nfa: BitParallelNFA, max_states: int | None = DEFAULT_MAX_STATES):
+        if max_states is not None and max_states < 1:
+            raise ValueError("max_states must be positive")
+        self.nfa = nfa
+        self.max_states = max_states
+        self.fallback = max_states is None
+        self._chars = 0
+        self._misses = 0
+        self._flushes = 0
+        self._chars_at_flush = 0
+
+    @property
+    def start_mask(self) -> int:
+        """Start state (see BitParallelNFA.start_mask)."""
+        return self.nfa.start_mask
+
+    @property
+    def final_mask(self) -> int:
+        """Final states (see BitParallelNFA.final_mask)."""
+        return self.nfa.final_mask
+
+    def _full(self, states: int) -> bool:
+        """
+        Check whether a cache of states states must be flushed before it takes
+        another one, counting the flush and setting fallback if it thrashes.
+        """
+        if self.max_states is None or states < self.max_states:
+            return False
+        self._flushes += 1
+        scanned = self._chars - self._chars_at_flush
+        self._chars_at_flush = self._chars
+        if scanned < self.THRASH_CHARS * self.max_states:
+            self.fallback = True
+        return True
+
+    def _finish_with_nfa(
+        self, text: str | Sequence[int] | mmap, pos: int, mask: int, longest_match: int | None
+    ) -> int | None:
+        """
+        Continue a match from an NFA state mask without caching.
+        Byte values in bytes-like text are the symbols of the same code (see ByteDFA).
+        """
+        step = self.nfa.step
+        final_mask = self.nfa.final_mask
+        length = len(text)
+        while pos < length and mask:
+            symbol = text[pos]
+            mask = step(mask, symbol if isinstance(symbol, str) else chr(symbol))
+            if not mask:
+                break
+            pos += 1
+            if mask & final_mask:
+                longest_match = pos
+        return longest_match
+
+
+class LazyDFA(DFACache):
+    """
+    DFA built on demand from a bit-parallel NFA.
+
+    DFA states are NFA state masks, and each transition is computed with
+    BitParallelNFA.step the first time it is taken. The cache is bounded,
+    flushed and given up for the NFA as DFACache describes.
+    """
+
+    def __init__(self, nfa: BitParallelNFA, max_states: int = DFACache.DEFAULT_MAX_STATES):
+        super().__init__(nfa, max_states)
+        self._states: dict[int, dict[str, int]] = {}
+
+    def step(self, mask: int, symbol: str) -> int:
+        """Return the state reached from mask on symbol, through the cache (0 when dead)."""
+        if self.fallback:
+            return self.nfa.step(mask, symbol)
+        self._chars += 1
+        row = self._states.get(mask)
+        if row is None:
+            row = self._row(mask)
+            if row is None:
+                return self.nfa.step(mask, symbol)
+        target = row.get(symbol)
+        if target is None:
+            self._misses += 1
+            target = row[symbol] = self.nfa.step(mask, symbol)
+        return target
+
+    @property
+    def stats(self) -> DFACacheStats:
+        """Current counters."""
+        return DFACacheStats(
+            states=len(self._states),
+            transitions=sum(len(row) for row in self._states.values()),
+            chars=self._chars,
+            misses=self._misses,
+            flushes=self._flushes,
+            fallbacks=int(self.fallback),
+        )
+
+    def _row(self, mask: int) -> dict[str, int] | None:
+        """
+        Transition row of mask, adding the state if it is new.
+        Returns None once the cache thrashes and matching must use the NFA.
+        """
+        states = self._states
+        if self._full(len(states)):
+            states.clear()
+            if self.fallback:
+                return None
+        row = states[mask] = {}
+        return row
+
+    def match(self, text: str, start_pos: int = 0) -> int | None:
+        """
+        Match against text starting at start_pos.
+        Returns the end position of the longest match, None if nothing matches.
+        """
+        nfa = self.nfa
+        if self.fallback:
+            return nfa.match(text, start_pos)
+
+        mask = nfa.start_mask
+        if not mask:
+            return None
+
+        final_mask = nfa.final_mask
+        states = self._states
+        longest_match = start_pos if mask & final_mask else None
+
+        row = states.get(mask)
+        if row is None:
+            row = self._row(mask)
+            if row is None:
+                return nfa.match(text, start_pos)
+
+        pos = start_pos
+        length = len(text)
+        misses = 0
+        try:
+            while pos < length:
+                symbol = text[pos]
+                target = row.get(symbol)
+                if target is None:
+                    misses += 1
+                    target = row[symbol] = nfa.step(mask, symbol)
+                if not target:
+                    break
+
+                mask = target
+                pos += 1
+                if mask & final_mask:
+                    longest_match = pos
+
+                row = states.get(mask)
+                if row is None:
+                    self._chars += pos - start_pos
+                    self._misses += misses
+                    start_pos = pos
+                    misses = 0
+                    row = self._row(mask)
+                    if row is None:
+                        return self._finish_with_nfa(text, pos, mask, longest_match)
+        finally:
+            self._chars += pos - start_pos
+            self._misses += misses
+
+        return longest_match
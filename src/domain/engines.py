@@ -0,0 +1,89 @@
+"""
+Registry of the engines that can run a tag's expression over text.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from .automaton import FiniteAutomaton
+from .bit_parallel import BitParallelNFA
+from .derivatives import DerivativeMatcher
+from .dfa_cache import LazyDFA
+from .regex_ast import Regex
+from .regex_parser import RegexParser
+
+# Anything with match(text, start_pos) -> end position or None, for str text
+Matcher = FiniteAutomaton | BitParallelNFA | LazyDFA | DerivativeMatcher
+
+
+class EngineSource(NamedTuple):
+    """Lazy views of one expression; an engine only builds what it uses."""
+
+    automaton: Callable[[], FiniteAutomaton]
+    simulator: Callable[[], BitParallelNFA]
+    syntax: Callable[[], Regex]
+
+
+@dataclass(frozen=True)
+class Engine:
+    """
+    A named way to match an expression.
+
+    build(source, max_states) returns the matcher; max_states is the lazy DFA
+    budget for engines that cache states. masks tells whether the matcher
+    steps integer state masks (start_mask, final_mask, step), which memoized
+    maximal munch requires.
+    """
+
+    name: str
+    build: Callable[[EngineSource, int | None], Matcher]
+    masks: bool
+
+
+def _dfa(source: EngineSource, max_states: int | None) -> Matcher:
+    if max_states is None:
+        return source.simulator()
+    return LazyDFA(source.simulator(), max_states)
+
+
+def _glushkov(source: EngineSource, max_states: int | None) -> Matcher:
+    parser = RegexParser(RegexParser.GLUSHKOV)
+    return parser.build_automaton_from_ast(source.syntax()).bit_parallel()
+
+
+_ENGINES: dict[str, Engine] = {}
+
+
+def register_engine(engine: Engine):
+    """Make an engine selectable by name, replacing any engine of the same name."""
+    _ENGINES[engine.name] = engine
+
+
+def get_engine(name: str) -> Engine:
+    """Registered engine called name. Raises ValueError if there is none."""
+    engine = _ENGINES.get(name)
+    if engine is None:
+        raise ValueError(f"Unknown engine: {name}")
+    return engine
+
+
+def engine_names() -> tuple[str, ...]:
+    """Names of the registered engines, in registration order."""
+    return tuple(_ENGINES)
+
+
+# Set simulation over the automaton's states, the reference implementation
+register_engine(Engine("nfa", lambda source, max_states: source.automaton(), masks=False))
+# Bit-parallel simulation of the automaton
+register_engine(Engine("bitparallel", lambda source, max_states: source.simulator(), masks=True))
+# Lazy DFA over the bit-parallel simulation; the bit-parallel one when max_states is None
+register_engine(Engine("dfa", _dfa, masks=True))
+# Brzozowski derivatives of the expression tree, without any automaton
+register_engine(
+    Engine("derivative", lambda source, max_states: DerivativeMatcher(source.syntax()), masks=False)
+)
+# Bit-parallel simulation of the Glushkov automaton of the expression tree
+register_engine(Engine("glushkov", _glushkov, masks=True))
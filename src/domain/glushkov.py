@@ -0,0 +1,88 @@
+"""
+Glushkov (position automaton) construction for regular expressions.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from dataclasses import dataclass
+
+from .automaton import FiniteAutomaton
+
+
+@dataclass(frozen=True)
+class Positions:
+    """Nullable flag and first/last position sets of a subexpression."""
+
+    nullable: bool
+    first: frozenset[int]
+    last: frozenset[int]
+
+
+class GlushkovBuilder:
+    """
+    Builds an epsilon-free automaton with one state per symbol occurrence.
+
+    Used as the builder for RegexParser.evaluate: every character of the
+    expression becomes a numbered position, and the operators combine the
+    nullable/first/last sets while recording the follow set of each position.
+    finish then emits an initial state plus one state per position.
+    """
+
+    def __init__(self):
+        self.symbols: list[str] = []
+        self.follow: list[set[int]] = []
+
+    def single_character(self, char: str) -> Positions:
+        """Create a new position for a character occurrence."""
+        position = len(self.symbols)
+        self.symbols.append(char)
+        self.follow.append(set())
+        only = frozenset((position,))
+        return Positions(False, only, only)
+
+    def empty_string(self) -> Positions:
+        """Lambda: nullable, no positions."""
+        return Positions(True, frozenset(), frozenset())
+
+    def empty_language(self) -> FiniteAutomaton:
+        """Create automaton for empty language."""
+        automaton = FiniteAutomaton()
+        automaton.start_state = automaton.create_state()
+        return automaton
+
+    def union(self, a: Positions, b: Positions) -> Positions:
+        """Positions of a + b."""
+        return Positions(a.nullable or b.nullable, a.first | b.first, a.last | b.last)
+
+    def concatenation(self, a: Positions, b: Positions) -> Positions:
+        """Positions of a . b; every last position of a is followed by b's first."""
+        for position in a.last:
+            self.follow[position].update(b.first)
+        first = a.first | b.first if a.nullable else a.first
+        last = a.last | b.last if b.nullable else b.last
+        return Positions(a.nullable and b.nullable, first, last)
+
+    def kleene_star(self, a: Positions) -> Positions:
+        """Positions of a*; every last position loops back to the first ones."""
+        for position in a.last:
+            self.follow[position].update(a.first)
+        return Positions(True, a.first, a.last)
+
+    def finish(self, root: Positions) -> FiniteAutomaton:
+        """Emit the position automaton for the whole expression."""
+        automaton = FiniteAutomaton()
+        start = automaton.create_state()
+        start.is_final = root.nullable
+        automaton.start_state = start
+
+        states = [automaton.create_state() for _ in self.symbols]
+        for position in root.last:
+            states[position].is_final = True
+
+        for position in sorted(root.first):
+            start.add_transition(self.symbols[position], states[position])
+        for position, targets in enumerate(self.follow):
+            for target in sorted(targets):
+                states[position].add_transition(self.symbols[target], states[target])
+
+        return automaton
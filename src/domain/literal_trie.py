@@ -0,0 +1,65 @@
+"""
+Trie of literal words for dictionary-speed keyword matching.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+
+class TrieNode:
+    """Trie node: outgoing edges and the best priority of a word ending here."""
+
+    __slots__ = ("children", "priority")
+
+    def __init__(self):
+        self.children: dict[str, TrieNode] = {}
+        self.priority: int | None = None
+
+
+class LiteralTrie:
+    """
+    Shared trie of the literal words of several tags.
+
+    Each word carries the priority (definition index) of its tag; when several
+    tags define the same word the lowest priority is kept, so a lookup returns
+    the longest word at a position and the earliest defined tag among equals.
+    """
+
+    def __init__(self):
+        self.root = TrieNode()
+        self.word_count = 0
+
+    def add(self, word: str, priority: int):
+        """Insert a non-empty word for the tag with the given priority."""
+        node = self.root
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = TrieNode()
+            node = child
+
+        if node.priority is None:
+            self.word_count += 1
+            node.priority = priority
+        elif priority < node.priority:
+            node.priority = priority
+
+    def longest_match(self, text: str, start_pos: int = 0) -> tuple[int, int] | None:
+        """
+        Find the longest word of the trie starting at start_pos.
+        Returns (priority, end_pos) or None.
+        """
+        node = self.root
+        best = None
+        pos = start_pos
+        length = len(text)
+
+        while pos < length:
+            child = node.children.get(text[pos])
+            if child is None:
+                break
+            node = child
+            pos += 1
+            if node.priority is not None:
+                best = (node.priority, pos)
+
+        return best
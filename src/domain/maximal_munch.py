@@ -0,0 +1,64 @@
+"""
+Memoized maximal munch: linear-time longest-match scanning.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+
+Repeated longest-match scans can read far past the end of each token and
+restart right after it, which is quadratic on inputs such as "aaaa" with
+the tags a*.b and a. Following Reps ("Maximal-munch tokenization in linear
+time", TOPLAS 1998), each scan records the (state, position) pairs it
+visited after its last accepting position: from those pairs no further
+match is possible, so later scans that reach one stop there. Each pair is
+recorded at most once, which bounds the total work per tag by the number
+of states times the input length.
+"""
+
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class DeterministicMatcher(Protocol):
+    """Matcher with integer states, such as BitParallelNFA or LazyDFA (0 is dead)."""
+
+    start_mask: int
+    final_mask: int
+
+    def step(self, mask: int, symbol: str) -> int: ...
+
+
+def match_memoized(
+    matcher: DeterministicMatcher, text: str, start_pos: int, failed: set[tuple[int, int]]
+) -> int | None:
+    """
+    Longest match of matcher at start_pos, like its match method.
+    failed holds the (state, position) pairs known not to lead to a match
+    further on in text; it is shared by every scan of the same text and
+    matcher, and extended with the pairs this scan proves to fail.
+    """
+    mask = matcher.start_mask
+    if not mask:
+        return None
+
+    step = matcher.step
+    final_mask = matcher.final_mask
+    longest_match = start_pos if mask & final_mask else None
+    # Pairs visited since the last accepting position
+    visited: list[tuple[int, int]] = []
+
+    pos = start_pos
+    length = len(text)
+    while pos < length:
+        mask = step(mask, text[pos])
+        if not mask:
+            break
+        pos += 1
+        if mask & final_mask:
+            longest_match = pos
+            visited.clear()
+        key = (mask, pos)
+        if key in failed:
+            break
+        visited.append(key)
+
+    failed.update(visited)
+    return longest_match
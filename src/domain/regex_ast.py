@@ -0,0 +1,362 @@
+"""
+Hash-consed abstract syntax tree for regular expressions.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+from __future__ import annotations
+
+import itertools
+import weakref
+from typing import Any
+
+# Character that matches any input symbol
+WILDCARD = "."
+
+
+class Regex:
+    """
+    Immutable regular expression node.
+
+    Nodes are only created through the constructors below, which intern them:
+    two structurally equal expressions are always the same object, so nodes
+    can be compared and hashed by identity.
+    """
+
+    __slots__ = ("__weakref__", "chars", "children", "first", "kind", "nullable", "symbol", "uid")
+
+    EMPTY = "empty"
+    EPSILON = "epsilon"
+    CHAR = "char"
+    CONCAT = "concat"
+    UNION = "union"
+    STAR = "star"
+
+    def __init__(self, kind: str, symbol: str, children: tuple[Regex, ...], uid: int):
+        self.kind = kind
+        self.symbol = symbol
+        self.children = children
+        self.uid = uid
+
+        # chars: every symbol occurring in the expression
+        # first: symbols that can start a non-empty word of the language
+        if kind == Regex.CHAR:
+            self.nullable = False
+            self.chars: frozenset[str] = frozenset((symbol,))
+            self.first: frozenset[str] = self.chars
+        else:
+            if kind in (Regex.EPSILON, Regex.STAR):
+                self.nullable = True
+            elif kind == Regex.CONCAT:
+                self.nullable = all(child.nullable for child in children)
+            elif kind == Regex.UNION:
+                self.nullable = any(child.nullable for child in children)
+            else:
+                self.nullable = False
+            self.chars = frozenset().union(*(child.chars for child in children))
+            if kind == Regex.CONCAT:
+                left, right = children
+                self.first = left.first | right.first if left.nullable else left.first
+            else:
+                self.first = frozenset().union(*(child.first for child in children))
+
+    def __repr__(self):
+        if self.kind == Regex.CHAR:
+            return f"Regex({self.symbol!r})"
+        if self.kind in (Regex.EMPTY, Regex.EPSILON):
+            return f"Regex({self.kind})"
+        return f"Regex({self.kind}, {list(self.children)})"
+
+
+_uids = itertools.count()
+_interned: weakref.WeakValueDictionary[tuple, Regex] = weakref.WeakValueDictionary()
+
+
+def _intern(kind: str, symbol: str = "", children: tuple[Regex, ...] = ()) -> Regex:
+    """Return the unique node with this structure, creating it if needed."""
+    key = (kind, symbol, tuple(child.uid for child in children))
+    node = _interned.get(key)
+    if node is None:
+        node = Regex(kind, symbol, children, next(_uids))
+        _interned[key] = node
+    return node
+
+
+EMPTY = _intern(Regex.EMPTY)
+EPSILON = _intern(Regex.EPSILON)
+
+
+def char(symbol: str) -> Regex:
+    """Node for a single character (WILDCARD matches any character)."""
+    return _intern(Regex.CHAR, symbol)
+
+
+def concat(a: Regex, b: Regex) -> Regex:
+    """
+    Concatenation a . b.
+    ∅ annihilates, λ is the identity, and chains are kept right-nested.
+    """
+    if a is EMPTY or b is EMPTY:
+        return EMPTY
+    if a is EPSILON:
+        return b
+    if b is EPSILON:
+        return a
+
+    items = []
+    while a.kind == Regex.CONCAT:
+        items.append(a.children[0])
+        a = a.children[1]
+    items.append(a)
+
+    result = b
+    for item in reversed(items):
+        result = _intern(Regex.CONCAT, "", (item, result))
+    return result
+
+
+def union(*operands: Regex) -> Regex:
+    """
+    Union of operands.
+    Nested unions are flattened, duplicates and ∅ dropped, and members sorted.
+    """
+    members: set[Regex] = set()
+    for operand in operands:
+        if operand.kind == Regex.UNION:
+            members.update(operand.children)
+        elif operand is not EMPTY:
+            members.add(operand)
+
+    if not members:
+        return EMPTY
+    if len(members) == 1:
+        return members.pop()
+    return _intern(Regex.UNION, "", tuple(sorted(members, key=lambda node: node.uid)))
+
+
+def star(a: Regex) -> Regex:
+    """Kleene star a*, with ∅* = λ* = λ and (a*)* = a*."""
+    if a is EMPTY or a is EPSILON:
+        return EPSILON
+    if a.kind == Regex.STAR:
+        return a
+    return _intern(Regex.STAR, "", (a,))
+
+
+def _star_body(node: Regex) -> Regex:
+    """
+    Simplest r with r* equal to node*: λ members are dropped, stars inside
+    a union are unwrapped ((r* + s)* = (r + s)*), and a chain of stars
+    becomes a union ((r*.s*)* = (r + s)*).
+    """
+    if node.kind == Regex.STAR:
+        return node.children[0]
+    if node.kind == Regex.UNION:
+        return union(*(_star_body(member) for member in node.children if member is not EPSILON))
+    if node.kind == Regex.CONCAT:
+        items = []
+        rest = node
+        while rest.kind == Regex.CONCAT:
+            items.append(rest.children[0])
+            rest = rest.children[1]
+        items.append(rest)
+        if all(item.kind == Regex.STAR for item in items):
+            return union(*(item.children[0] for item in items))
+    return node
+
+
+def _simplify_node(node: Regex, children: list[Regex]) -> Regex:
+    """Rebuild node from already simplified children, applying algebraic identities."""
+    kind = node.kind
+    if kind == Regex.STAR:
+        return star(_star_body(children[0]))
+
+    if kind == Regex.CONCAT:
+        left, right = children
+        # r*.r* = r*
+        if left.kind == Regex.STAR and (
+            right is left or (right.kind == Regex.CONCAT and right.children[0] is left)
+        ):
+            return right
+        return concat(left, right)
+
+    result = union(*children)
+    if result.kind != Regex.UNION:
+        return result
+    members = set(result.children)
+    # r is subsumed by r* in the same union
+    for member in result.children:
+        if member.kind == Regex.STAR:
+            members.discard(member.children[0])
+    # λ is subsumed by any other nullable member
+    if EPSILON in members and any(m.nullable for m in members if m is not EPSILON):
+        members.discard(EPSILON)
+    return union(*members)
+
+
+def simplify(node: Regex) -> Regex:
+    """
+    Apply algebraic simplifications bottom-up, on top of the identities the
+    constructors already enforce: subsumption in unions, λ removal and star
+    unwrapping under stars, and r*.r* = r*. Shared subexpressions are
+    simplified once.
+    """
+    simplified: dict[Regex, Regex] = {}
+    stack = [(node, False)]
+
+    while stack:
+        current, expanded = stack.pop()
+        if current in simplified:
+            continue
+        if not current.children:
+            simplified[current] = current
+        elif not expanded:
+            stack.append((current, True))
+            for child in current.children:
+                if child not in simplified:
+                    stack.append((child, False))
+        else:
+            children = [simplified[child] for child in current.children]
+            simplified[current] = _simplify_node(current, children)
+
+    return simplified[node]
+
+
+class AstBuilder:
+    """
+    Builder for RegexParser.evaluate that produces interned AST nodes.
+
+    RPN concatenations arrive left-nested, so chains are collected in plain
+    lists and only turned into right-nested nodes when an operator or finish
+    needs them; building each prefix as a node would be quadratic.
+    """
+
+    def _node(self, operand: Regex | list[Regex]) -> Regex:
+        """Materialize a pending concatenation chain."""
+        if isinstance(operand, Regex):
+            return operand
+        result = operand[-1]
+        for item in reversed(operand[:-1]):
+            result = concat(item, result)
+        return result
+
+    def finish(self, result: Regex | list[Regex]) -> Regex:
+        """Root node of the expression."""
+        return self._node(result)
+
+    def single_character(self, symbol: str) -> Regex:
+        """Character node."""
+        return char(symbol)
+
+    def empty_string(self) -> Regex:
+        """Lambda node."""
+        return EPSILON
+
+    def union(self, a: Regex | list[Regex], b: Regex | list[Regex]) -> Regex:
+        """Union node."""
+        return union(self._node(a), self._node(b))
+
+    def concatenation(self, a: Regex | list[Regex], b: Regex | list[Regex]) -> list[Regex]:
+        """Pending concatenation chain (operands are consumed, so a is extended in place)."""
+        chain = a if isinstance(a, list) else [a]
+        if isinstance(b, list):
+            chain.extend(b)
+        else:
+            chain.append(b)
+        return chain
+
+    def kleene_star(self, a: Regex | list[Regex]) -> Regex:
+        """Kleene star node."""
+        return star(self._node(a))
+
+
+def evaluate(node: Regex, builder: Any) -> Any:
+    """
+    Evaluate a non-empty AST bottom-up with the constructors of builder.
+    Same builder interface as RegexParser.evaluate; n-ary unions are folded pairwise.
+    """
+    results: list[Any] = []
+    stack = [(node, False)]
+
+    while stack:
+        current, expanded = stack.pop()
+        kind = current.kind
+        if kind == Regex.CHAR:
+            results.append(builder.single_character(current.symbol))
+        elif kind == Regex.EPSILON:
+            results.append(builder.empty_string())
+        elif kind == Regex.EMPTY:
+            raise ValueError("The empty language cannot appear inside an expression")
+        elif not expanded:
+            stack.append((current, True))
+            for child in reversed(current.children):
+                stack.append((child, False))
+        else:
+            count = len(current.children)
+            operands = results[-count:]
+            del results[-count:]
+            if kind == Regex.STAR:
+                results.append(builder.kleene_star(operands[0]))
+            elif kind == Regex.CONCAT:
+                results.append(builder.concatenation(operands[0], operands[1]))
+            else:
+                result = operands[0]
+                for operand in operands[1:]:
+                    result = builder.union(result, operand)
+                results.append(result)
+
+    return results[0]
+
+
+def _product(left: frozenset[str], right: frozenset[str], limit: int) -> frozenset[str] | None:
+    """All concatenations of left and right words, None if above limit."""
+    if len(left) * len(right) > limit:
+        return None
+    return frozenset(a + b for a in left for b in right)
+
+
+def finite_language(node: Regex, limit: int) -> frozenset[str] | None:
+    """
+    Words of node when it denotes a finite set of literal strings.
+    Returns None for wildcards, stars, or more than limit words.
+    """
+    # Any infinite or oversized subexpression makes the whole expression so,
+    # which lets the iterative walk stop at the first None
+    words_of: dict[Regex, frozenset[str]] = {}
+    stack = [(node, False)]
+
+    while stack:
+        current, expanded = stack.pop()
+        if current in words_of:
+            continue
+        kind = current.kind
+        words: frozenset[str] | None
+        if kind == Regex.EMPTY:
+            words = frozenset()
+        elif kind == Regex.EPSILON:
+            words = frozenset(("",))
+        elif kind == Regex.CHAR:
+            words = None if current.symbol == WILDCARD else frozenset((current.symbol,))
+        elif kind == Regex.STAR:
+            # Stars of anything but λ/∅ (already simplified away) are infinite
+            words = None
+        elif not expanded:
+            stack.append((current, True))
+            for child in current.children:
+                if child not in words_of:
+                    stack.append((child, False))
+            continue
+        elif kind == Regex.CONCAT:
+            left, right = current.children
+            words = _product(words_of[left], words_of[right], limit)
+        else:
+            members: set[str] = set()
+            for child in current.children:
+                members.update(words_of[child])
+            words = frozenset(members) if len(members) <= limit else None
+
+        if words is None:
+            return None
+        words_of[current] = words
+
+    return words_of[node]
@@ -4,9 +4,12 @@ Regular Expression Parser for Reverse Polish Notation.
 Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 """
 
-from typing import ClassVar
+from typing import Any, ClassVar
 
+from . import regex_ast
 from .automaton import FiniteAutomaton
+from .glushkov import GlushkovBuilder
+from .regex_ast import AstBuilder, Regex
 
 
 class RegexParser:
@@ -22,8 +25,24 @@ class RegexParser:
         "l": "",  # lambda (empty string)
     }
 
-    def __init__(self):
+    # Token kinds produced by tokenize
+    CHAR = "char"
+    LAMBDA = "lambda"
+    UNION = "union"
+    CONCAT = "concat"
+    STAR = "star"
+
+    # Automaton constructions
+    THOMPSON = "thompson"
+    GLUSHKOV = "glushkov"
+    CONSTRUCTIONS = (THOMPSON, GLUSHKOV)
+
+    def __init__(self, construction: str = THOMPSON, simplify: bool = True):
+        if construction not in self.CONSTRUCTIONS:
+            raise ValueError(f"Unknown automaton construction: {construction}")
         self.alphabet = {chr(i) for i in range(32, 127)}  # ASCII 32-126
+        self.construction = construction
+        self.simplify = simplify
 
     def parse_escape_sequence(self, expr: str, pos: int) -> tuple[str, int]:
         """
@@ -53,71 +72,128 @@ class RegexParser:
         else:
             return expr[pos], pos + 1
 
-    def build_automaton(self, expr: str) -> FiniteAutomaton:
+    def tokenize(self, expr: str) -> list[tuple[str, str]]:
         """
-        Build a finite automaton from a regular expression in RPN.
-
-        Operators:
-        - + : union (e1 + e2)
-        - . : concatenation (e1 . e2)
-        - * : Kleene star (e*)
-        - a : character (a ∈ Σ)
-        - λ : empty string
-        - ∅ : empty language
+        Split an RPN expression into (kind, value) tokens.
+        Kinds are CHAR, LAMBDA, UNION, CONCAT and STAR; value is the character for CHAR.
         """
-        if not expr:
-            # Empty expression = empty language
-            return self._empty_language()
-
-        stack: list[FiniteAutomaton] = []
+        tokens: list[tuple[str, str]] = []
         pos = 0
 
         while pos < len(expr):
             # Check if next character is backslash (escape)
-            if pos < len(expr) and expr[pos] == "\\":
+            if expr[pos] == "\\":
                 # Check for lambda (empty string) escape sequence
                 if pos + 1 < len(expr) and expr[pos + 1] == "l":
                     # Lambda (empty string)
                     pos += 2  # Skip \l
-                    stack.append(self._empty_string())
+                    tokens.append((self.LAMBDA, ""))
                 else:
                     # Parse escape sequence - this will be a literal character
                     char, pos = self.parse_character(expr, pos)
-                    stack.append(self._single_character(char))
-            elif pos < len(expr) and expr[pos] == "+":  # Union operator
+                    tokens.append((self.CHAR, char))
+            elif expr[pos] == "+":  # Union operator
+                pos += 1
+                tokens.append((self.UNION, "+"))
+            elif expr[pos] == ".":  # Concatenation operator
                 pos += 1
+                tokens.append((self.CONCAT, "."))
+            elif expr[pos] == "*":  # Kleene star operator
+                pos += 1
+                tokens.append((self.STAR, "*"))
+            else:
+                # Parse as regular character
+                char, pos = self.parse_character(expr, pos)
+                tokens.append((self.CHAR, char))
+
+        return tokens
+
+    def evaluate(self, expr: str, builder: Any) -> Any:
+        """
+        Evaluate an RPN expression bottom-up with the constructors of builder.
+
+        The builder provides single_character, empty_string, union,
+        concatenation and kleene_star; this keeps operand checking in one place
+        for every construction.
+        """
+        stack: list[Any] = []
+
+        for kind, value in self.tokenize(expr):
+            if kind == self.CHAR:
+                stack.append(builder.single_character(value))
+            elif kind == self.LAMBDA:
+                stack.append(builder.empty_string())
+            elif kind == self.UNION:
                 if len(stack) < 2:
                     raise ValueError("Not enough operands for union operator")
                 b = stack.pop()
                 a = stack.pop()
-                result = self._union(a, b)
-                stack.append(result)
-            elif pos < len(expr) and expr[pos] == ".":  # Concatenation operator
-                pos += 1
+                stack.append(builder.union(a, b))
+            elif kind == self.CONCAT:
                 if len(stack) < 2:
                     raise ValueError("Not enough operands for concatenation operator")
                 b = stack.pop()
                 a = stack.pop()
-                result = self._concatenation(a, b)
-                stack.append(result)
-            elif pos < len(expr) and expr[pos] == "*":  # Kleene star operator
-                pos += 1
+                stack.append(builder.concatenation(a, b))
+            else:
                 if len(stack) < 1:
                     raise ValueError("Not enough operands for Kleene star operator")
                 a = stack.pop()
-                result = self._kleene_star(a)
-                stack.append(result)
-            else:
-                # Parse as regular character
-                char, pos = self.parse_character(expr, pos)
-                stack.append(self._single_character(char))
+                stack.append(builder.kleene_star(a))
 
         if len(stack) != 1:
             raise ValueError(f"Invalid expression: {len(stack)} automata left on stack")
 
         return stack[0]
 
-    def _single_character(self, char: str) -> FiniteAutomaton:
+    def parse(self, expr: str) -> Regex:
+        """
+        Parse an RPN expression into an AST (the empty expression is ∅).
+        The AST is simplified unless the parser was created with simplify=False.
+        """
+        if not expr:
+            return regex_ast.EMPTY
+        builder = AstBuilder()
+        node = builder.finish(self.evaluate(expr, builder))
+        return regex_ast.simplify(node) if self.simplify else node
+
+    def _new_builder(self) -> "ThompsonBuilder | GlushkovBuilder":
+        """Builder for the selected construction."""
+        return GlushkovBuilder() if self.construction == self.GLUSHKOV else ThompsonBuilder()
+
+    def build_automaton_from_ast(self, node: Regex) -> FiniteAutomaton:
+        """Build a finite automaton from an expression AST."""
+        builder = self._new_builder()
+        if node is regex_ast.EMPTY:
+            return builder.empty_language()
+        return builder.finish(regex_ast.evaluate(node, builder))
+
+    def build_automaton(self, expr: str) -> FiniteAutomaton:
+        """
+        Build a finite automaton from a regular expression in RPN.
+
+        Operators:
+        - + : union (e1 + e2)
+        - . : concatenation (e1 . e2)
+        - * : Kleene star (e*)
+        - a : character (a ∈ Σ)
+        - λ : empty string
+        - ∅ : empty language
+
+        The expression is parsed into a simplified AST first, and the
+        selected construction runs from that AST.
+        """
+        return self.build_automaton_from_ast(self.parse(expr))
+
+
+class ThompsonBuilder:
+    """Thompson's construction: one small automaton per operand, glued with epsilons."""
+
+    def finish(self, automaton: FiniteAutomaton) -> FiniteAutomaton:
+        """Return the automaton built for the whole expression."""
+        return automaton
+
+    def single_character(self, char: str) -> FiniteAutomaton:
         """Create automaton for a single character."""
         automaton = FiniteAutomaton()
         start = automaton.create_state()
@@ -129,7 +205,7 @@ class RegexParser:
 
         return automaton
 
-    def _empty_string(self) -> FiniteAutomaton:
+    def empty_string(self) -> FiniteAutomaton:
         """Create automaton for empty string (lambda)."""
         automaton = FiniteAutomaton()
         state = automaton.create_state()
@@ -137,7 +213,7 @@ class RegexParser:
         automaton.start_state = state
         return automaton
 
-    def _empty_language(self) -> FiniteAutomaton:
+    def empty_language(self) -> FiniteAutomaton:
         """Create automaton for empty language."""
         automaton = FiniteAutomaton()
         state = automaton.create_state()
@@ -145,7 +221,7 @@ class RegexParser:
         # No final states = empty language
         return automaton
 
-    def _union(self, a: FiniteAutomaton, b: FiniteAutomaton) -> FiniteAutomaton:
+    def union(self, a: FiniteAutomaton, b: FiniteAutomaton) -> FiniteAutomaton:
         """Create automaton for union (a + b)."""
         automaton = FiniteAutomaton()
         new_start = automaton.create_state()
@@ -187,7 +263,7 @@ class RegexParser:
 
         return automaton
 
-    def _concatenation(self, a: FiniteAutomaton, b: FiniteAutomaton) -> FiniteAutomaton:
+    def concatenation(self, a: FiniteAutomaton, b: FiniteAutomaton) -> FiniteAutomaton:
         """Create automaton for concatenation (a . b)."""
         automaton = FiniteAutomaton()
 
@@ -230,7 +306,7 @@ class RegexParser:
 
         return automaton
 
-    def _kleene_star(self, a: FiniteAutomaton) -> FiniteAutomaton:
+    def kleene_star(self, a: FiniteAutomaton) -> FiniteAutomaton:
         """Create automaton for Kleene star (a*)."""
         automaton = FiniteAutomaton()
         new_start = automaton.create_state()
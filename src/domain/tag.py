@@ -4,38 +4,353 @@ Tag definition and management.
 Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 """
 
+import threading
+from collections.abc import Iterator
+
+from . import regex_ast
 from .automaton import FiniteAutomaton
+from .bit_parallel import BitParallelNFA
+from .dfa_cache import LazyDFA
+from .engines import EngineSource, Matcher, get_engine
+from .regex_ast import WILDCARD, Regex
 from .regex_parser import RegexParser
 
 
+class CompiledExpression:
+    """
+    Everything a tag derives from its expression: the automaton, the FIRST set
+    and nullability used for dispatch, and the literal/residual split.
+
+    Building the automata is the expensive part of defining a tag. analyze
+    only parses the expression and splits it, and the automata are built on
+    first access to automaton or residual (see build); compile builds them at
+    once, possibly elsewhere (see parallel_compile), and the result can travel
+    as plain tuples via to_compact.
+    """
+
+    # Largest literal set extracted from the union branches of one tag
+    MAX_LITERALS = 256
+
+    def __init__(
+        self,
+        automaton: FiniteAutomaton | None,
+        first_chars: frozenset[str],
+        nullable: bool,
+        literals: frozenset[str],
+        residual: FiniteAutomaton | None,
+    ):
+        self._automaton = automaton
+        self.first_chars = first_chars
+        self.nullable = nullable
+        self.literals = literals
+        self._residual = residual
+        # Syntax trees of the expression and of its non-literal branches, kept
+        # for engines that match from the tree; None when rebuilt from_compact
+        self.syntax: Regex | None = None
+        self.residual_syntax: Regex | None = None
+        # Parser and syntax trees (whole, residual) of automata still to build
+        self._pending: tuple[RegexParser, Regex, Regex | None] | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def analyze(
+        cls, expression: str, construction: str = RegexParser.THOMPSON
+    ) -> "CompiledExpression":
+        """
+        Parse an RPN expression, deferring its automata to first use.
+        Raises ValueError if it is invalid.
+        """
+        parser = RegexParser(construction)
+        try:
+            syntax = parser.parse(expression)
+            literals, rest = cls._split_literals(syntax)
+        except Exception as e:
+            raise ValueError(f"Invalid regular expression: {e}") from e
+
+        compiled = cls(None, syntax.first, syntax.nullable, literals, None)
+        compiled.syntax = syntax
+        if rest:
+            compiled.residual_syntax = regex_ast.union(*rest) if literals else syntax
+        compiled._pending = (parser, syntax, compiled.residual_syntax)
+        return compiled
+
+    @classmethod
+    def compile(
+        cls, expression: str, construction: str = RegexParser.THOMPSON
+    ) -> "CompiledExpression":
+        """Compile an RPN expression with its automata. Raises ValueError if it is invalid."""
+        compiled = cls.analyze(expression, construction)
+        compiled.build()
+        return compiled
+
+    def build(self):
+        """Build the automata of an analyzed expression, once, from any thread."""
+        with self._lock:
+            if self._pending is None:
+                return
+            parser, syntax, residual_syntax = self._pending
+            try:
+                automaton = parser.build_automaton_from_ast(syntax)
+                # residual covers the non-literal branches: the whole automaton when
+                # no branch is literal, None when the expression is purely literal
+                residual: FiniteAutomaton | None
+                if residual_syntax is None:
+                    residual = None
+                elif residual_syntax is syntax:
+                    residual = automaton
+                else:
+                    residual = parser.build_automaton_from_ast(residual_syntax)
+            except Exception as e:
+                raise ValueError(f"Invalid regular expression: {e}") from e
+            self._automaton = automaton
+            self._residual = residual
+            self._pending = None
+
+    @property
+    def is_built(self) -> bool:
+        """Check whether the automata exist."""
+        return self._pending is None
+
+    @property
+    def has_residual(self) -> bool:
+        """Check whether some branch is not literal, without building the automata."""
+        if self._pending is not None:
+            return self._pending[2] is not None
+        return self._residual is not None
+
+    @property
+    def automaton(self) -> FiniteAutomaton:
+        """Automaton of the whole expression."""
+        if self._pending is not None:
+            self.build()
+        automaton = self._automaton
+        if automaton is None:
+            raise ValueError("Expression has no automaton")
+        return automaton
+
+    @property
+    def residual(self) -> FiniteAutomaton | None:
+        """Automaton of the non-literal branches, None for purely literal expressions."""
+        if self._pending is not None:
+            self.build()
+        return self._residual
+
+    @classmethod
+    def _split_literals(cls, syntax: Regex) -> tuple[frozenset[str], list[Regex]]:
+        """
+        Separate the union branches that denote finite sets of literal words.
+        Returns their non-empty words (λ is covered by nullable) and the other branches.
+        """
+        branches = syntax.children if syntax.kind == Regex.UNION else (syntax,)
+        literals: set[str] = set()
+        rest = []
+        for branch in branches:
+            words = regex_ast.finite_language(branch, cls.MAX_LITERALS)
+            if words is None or len(literals) + len(words) > cls.MAX_LITERALS:
+                rest.append(branch)
+            else:
+                literals.update(words)
+        literals.discard("")
+        return frozenset(literals), rest
+
+    def to_compact(self) -> tuple:
+        """Serialize to plain tuples (see FiniteAutomaton.to_compact)."""
+        residual: tuple | None
+        if self.residual is None:
+            residual = None
+        elif self.residual is self.automaton:
+            residual = ()
+        else:
+            residual = self.residual.to_compact()
+        return (
+            self.automaton.to_compact(),
+            tuple(self.first_chars),
+            self.nullable,
+            tuple(self.literals),
+            residual,
+        )
+
+    @classmethod
+    def from_compact(cls, data: tuple) -> "CompiledExpression":
+        """Rebuild a compiled expression serialized with to_compact."""
+        automaton_data, first_chars, nullable, literals, residual_data = data
+        automaton = FiniteAutomaton.from_compact(automaton_data)
+        if residual_data is None:
+            residual = None
+        elif not residual_data:
+            residual = automaton
+        else:
+            residual = FiniteAutomaton.from_compact(residual_data)
+        return cls(automaton, frozenset(first_chars), nullable, frozenset(literals), residual)
+
+
 class Tag:
     """Represents a tag definition with its automaton."""
 
-    def __init__(self, name: str, expression: str):
+    def __init__(
+        self,
+        name: str,
+        expression: str,
+        construction: str = RegexParser.THOMPSON,
+        compiled: CompiledExpression | None = None,
+        engine: str = "bitparallel",
+        skip: bool = False,
+    ):
+        """
+        The expression is parsed here, so invalid syntax raises ValueError at
+        once; the automata are only built on first use (see warm).
+        engine names the registered engine match uses (see engines).
+        A skip tag takes part in longest match like any other, but lexers
+        never emit its tokens (whitespace, comments).
+        """
+        get_engine(engine)
         self.name = name
         self.expression = expression
-        self.automaton: FiniteAutomaton | None = None
-        self._parser = RegexParser()
-        self._build_automaton()
+        self.skip = skip
+        self.construction = construction
+        if compiled is None:
+            compiled = CompiledExpression.analyze(expression, construction)
+        self.compiled = compiled
 
-    def _build_automaton(self):
-        """Build the automaton from the regular expression."""
-        try:
-            self.automaton = self._parser.build_automaton(self.expression)
-        except Exception as e:
-            raise ValueError(f"Invalid regular expression: {e}") from e
+        # Characters that can start a non-empty match, and whether λ matches
+        self.first_chars: frozenset[str] = compiled.first_chars
+        self.nullable: bool = compiled.nullable
+        # Words matched through the lexer's shared trie
+        self.literals: frozenset[str] = compiled.literals
+
+        # Simulators are built on first use, and pure-literal tags never need
+        # theirs for lexing
+        self._matcher: BitParallelNFA | None = None
+        self._residual_matcher: BitParallelNFA | None = None
+        self.engine = engine
+        # Engines may cache DFA states, so each thread gets its own matcher
+        self._engine_matchers = threading.local()
+        # Tags are shared by every lexer snapshot that has them, in any thread
+        self._lock = threading.Lock()
+
+    @property
+    def automaton(self) -> FiniteAutomaton:
+        """Automaton of the tag, built on first access."""
+        return self.compiled.automaton
+
+    @property
+    def residual(self) -> FiniteAutomaton | None:
+        """Automaton for the branches not covered by literals, None if there are none."""
+        return self.compiled.residual
+
+    @property
+    def has_residual(self) -> bool:
+        """Check whether the lexer needs the residual automaton, without building it."""
+        return self.compiled.has_residual
+
+    @property
+    def is_compiled(self) -> bool:
+        """Check whether the automata have been built."""
+        return self.compiled.is_built
+
+    def adopt(self, compiled: CompiledExpression):
+        """Use automata compiled elsewhere (see parallel_compile) unless built already."""
+        with self._lock:
+            if not self.compiled.is_built:
+                self.compiled = compiled
+
+    def warm(self):
+        """Build the automata and simulators now rather than on first use."""
+        self.simulator()
+        self.residual_simulator()
+
+    @property
+    def starts_with_any(self) -> bool:
+        """Check whether a match can start with any character (wildcard)."""
+        return WILDCARD in self.first_chars
+
+    def simulator(self) -> BitParallelNFA:
+        """Bit-parallel simulator of the whole automaton."""
+        if self._matcher is None:
+            with self._lock:
+                if self._matcher is None:
+                    self._matcher = self.automaton.bit_parallel()
+        return self._matcher
+
+    def residual_simulator(self) -> BitParallelNFA | None:
+        """Bit-parallel simulator of the residual automaton, None for purely literal tags."""
+        if not self.has_residual:
+            return None
+        if self._residual_matcher is None:
+            residual = self.residual
+            with self._lock:
+                if self._residual_matcher is None and residual is not None:
+                    self._residual_matcher = residual.bit_parallel()
+        return self._residual_matcher
+
+    def syntax(self) -> Regex:
+        """Syntax tree of the expression, parsed again if the tag was compiled elsewhere."""
+        if self.compiled.syntax is None:
+            return RegexParser(self.construction).parse(self.expression)
+        return self.compiled.syntax
+
+    def residual_syntax(self) -> Regex:
+        """
+        Syntax tree of the non-literal branches. Without the split tree the whole
+        tree stands in, which matches the same tokens since literal matches of
+        the tag tie with themselves.
+        """
+        if self.compiled.residual_syntax is None:
+            return self.syntax()
+        return self.compiled.residual_syntax
+
+    def source(self, residual: bool = False) -> EngineSource:
+        """What engines build from: the whole expression, or its residual branches."""
+        if residual:
+            # Like residual_syntax, the whole expression stands in for purely literal tags
+            return EngineSource(
+                lambda: self.automaton if self.residual is None else self.residual,
+                lambda: self.residual_simulator() or self.simulator(),
+                self.residual_syntax,
+            )
+        return EngineSource(lambda: self.automaton, self.simulator, self.syntax)
+
+    def matcher(self) -> Matcher:
+        """The tag's engine over the whole expression, built on first use in each thread."""
+        matcher = getattr(self._engine_matchers, "matcher", None)
+        if matcher is None:
+            matcher = get_engine(self.engine).build(self.source(), LazyDFA.DEFAULT_MAX_STATES)
+            self._engine_matchers.matcher = matcher
+        return matcher
 
     def match(self, text: str, start_pos: int = 0) -> int | None:
         """Match the tag against text starting at start_pos. Returns end position or None."""
-        if not self.automaton:
+        return self.matcher().match(text, start_pos)
+
+    def match_residual(self, text: str, start_pos: int = 0) -> int | None:
+        """Match only the branches not covered by literals. Returns end position or None."""
+        simulator = self.residual_simulator()
+        if simulator is None:
             return None
-        return self.automaton.match(text, start_pos)
+        return simulator.match(text, start_pos)
 
     def get_formal_definition(self) -> str:
         """Get formal definition of the tag's automaton."""
-        if not self.automaton:
-            return f"Tag {self.name}: Invalid automaton"
-        return f"Tag: {self.name}\nExpression: {self.expression}\n{self.automaton.get_formal_definition()}"
+        return "\n".join(self.iter_formal_definition())
+
+    def iter_formal_definition(self, limit: int | None = None) -> Iterator[str]:
+        """
+        Yield the lines of the formal definition one at a time.
+        limit caps the transitions listed (see FiniteAutomaton.iter_formal_definition).
+        """
+        yield f"Tag: {self.name}"
+        yield f"Expression: {self.expression}"
+        yield from self.automaton.iter_formal_definition(limit)
+
+    def iter_dot(self) -> Iterator[str]:
+        """Yield the tag's automaton as a DOT digraph named after the tag."""
+        return self.automaton.iter_dot(self.name)
+
+    @property
+    def definition(self) -> str:
+        """The tag as a definition line, in the syntax TagDefinitionParser reads."""
+        prefix = TagDefinitionParser.SKIP_PREFIX if self.skip else ""
+        return f"{prefix}{self.name}: {self.expression}"
 
     def __repr__(self):
         return f"Tag(name='{self.name}', expression='{self.expression}')"
@@ -44,13 +359,32 @@ class Tag:
 class TagDefinitionParser:
     """Parser for tag definitions."""
 
+    # Marks a skip tag: ~TAGNAME: EXPRESSION
+    SKIP_PREFIX = "~"
+
     @staticmethod
     def parse(line: str) -> Tag | None:
         """
         Parse a tag definition line.
-        Format: TAGNAME: EXPRESSION
+        Format: TAGNAME: EXPRESSION, or ~TAGNAME: EXPRESSION for a skip tag
         Returns Tag if valid, None if invalid.
         """
+        parts = TagDefinitionParser.split(line)
+        if parts is None:
+            return None
+
+        name, expression, skip = parts
+        try:
+            return Tag(name, expression, skip=skip)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def split(line: str) -> tuple[str, str, bool] | None:
+        """
+        Check the layout of a tag definition line without compiling it.
+        Returns (name, expression, skip), or None if the line is malformed.
+        """
         line = line.strip()
         if not line:
             return None
@@ -74,13 +408,14 @@ class TagDefinitionParser:
         name = line[:colon_pos].strip()
         expression = line[colon_pos + 1 :].strip()
 
+        skip = name.startswith(TagDefinitionParser.SKIP_PREFIX)
+        if skip:
+            name = name[len(TagDefinitionParser.SKIP_PREFIX) :]
+
         if not name:
             return None
 
         if not expression:
             return None
 
-        try:
-            return Tag(name, expression)
-        except ValueError:
-            return None
+        return name, expression, skip
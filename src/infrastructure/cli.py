@@ -4,7 +4,14 @@ Command-line interface for the lexical analyzer.
 Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 """
 
+import argparse
+import sys
+
+from ..application.batch import expand_inputs
+from ..application.checkpoint import Checkpoint
 from ..application.command_handler import CommandHandler
+from ..application.memory_report import MemoryReport
+from ..domain.byte_dfa import ByteInput
 
 
 class CLI:
@@ -53,8 +60,8 @@ class CLI:
                 print("[ERROR] Command :p requires an argument")
                 return
             try:
-                result = self.handler.process_input(arg)
-                self.handler.write_output(result)
+                self.handler.write_tokens(arg)
+                self.report_errors()
             except ValueError as e:
                 print(f"[ERROR] {e}")
             except Exception as e:
@@ -64,9 +71,46 @@ class CLI:
             if not arg:
                 print("[ERROR] Command :d requires a file path")
                 return
+            # :d <file> checkpoint|resume: record checkpoints, or continue from the last one
+            parts = arg.rsplit(None, 1)
+            if len(parts) == 2 and parts[1] in ("checkpoint", "resume"):
+                try:
+                    self.process_file_resumable(parts[0], parts[1] == "resume")
+                except Exception as e:
+                    print(f"[ERROR] {e}")
+                return
+            # Directories and glob patterns name many files
+            paths, _ = expand_inputs([arg])
+            if paths != [arg]:
+                try:
+                    failed = self.process_files([arg])
+                    print(f"[INFO] Processed {len(paths)} file(s), {failed} failed")
+                except Exception as e:
+                    print(f"[ERROR] {e}")
+                return
+            try:
+                self.handler.write_file_tokens(arg)
+                self.report_errors()
+            except FileNotFoundError as e:
+                print(f"[ERROR] {e}")
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+            except Exception as e:
+                print(f"[ERROR] {e}")
+
+        elif command == ":n":
+            if not arg:
+                print("[ERROR] Command :n requires a file path")
+                return
+            # Optional trailing histogram: :n <file> [lines|<window size>]
+            path, histogram = arg, None
+            parts = arg.rsplit(None, 1)
+            if len(parts) == 2 and (parts[1] == "lines" or parts[1].isdigit()):
+                path, histogram = parts
             try:
-                result = self.handler.process_file(arg)
-                self.handler.write_output(result)
+                with self.handler.map_input_file(path) as data:
+                    self.count_tokens(data, histogram)
+                self.report_errors()
             except FileNotFoundError as e:
                 print(f"[ERROR] {e}")
             except ValueError as e:
@@ -95,12 +139,25 @@ class CLI:
             if not arg:
                 print("[ERROR] Command :o requires a file path")
                 return
+            # Optional trailing format: :o <file> [text|binary|binary-spans]
+            path, output_format = arg, "text"
+            parts = arg.rsplit(None, 1)
+            if len(parts) == 2 and parts[1] in CommandHandler.OUTPUT_FORMATS:
+                path, output_format = parts
             try:
-                self.handler.set_output_file(arg)
-                print(f"[INFO] Output file set to: {arg}")
+                self.handler.set_output_file(path, output_format)
+                print(f"[INFO] Output file set to: {path} ({output_format})")
             except Exception as e:
                 print(f"[ERROR] {e}")
 
+        elif command == ":r":
+            if arg not in (None, "on", "off"):
+                print("[ERROR] Command :r expects 'on' or 'off'")
+                return
+            enabled = not self.handler.recover if arg is None else arg == "on"
+            self.handler.set_recovery(enabled)
+            print(f"[INFO] Error recovery {'enabled' if enabled else 'disabled'}")
+
         elif command == ":l":
             tags = self.handler.list_tags()
             if tags:
@@ -111,15 +168,51 @@ class CLI:
                 print("[INFO] No tags defined")
 
         elif command == ":a":
-            automata = self.handler.list_automata()
-            if automata:
-                print("[INFO] Automata definitions:")
-                for i, automaton_def in enumerate(automata):
-                    if i > 0:
-                        print()
-                    print(automaton_def)
-            else:
+            # :a [NAME...] [limit]: a number that names no tag caps the transitions listed per tag
+            words = arg.split() if arg else []
+            limit = None
+            if words and words[-1].isdigit() and not self.is_tag_name(words[-1]):
+                limit = int(words.pop())
+            if not self.handler.tags:
                 print("[INFO] No automata defined")
+                return
+            try:
+                lines = self.handler.iter_automata(words or None, limit)
+                first = next(lines)
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                return
+            print("[INFO] Automata definitions:")
+            print(first)
+            for line in lines:
+                print(line)
+
+        elif command == ":g":
+            if not arg:
+                print("[ERROR] Command :g requires a file path")
+                return
+            path, *names = arg.split()
+            try:
+                self.handler.export_dot(path, names or None)
+                print(f"[INFO] Automata exported to: {path}")
+            except Exception as e:
+                print(f"[ERROR] {e}")
+
+        elif command == ":mem":
+            # :mem [NAME...] [compile]: compile, unless a tag is named so, also traces compilation
+            words = arg.split() if arg else []
+            trace = bool(words) and words[-1] == "compile" and not self.is_tag_name("compile")
+            if trace:
+                words.pop()
+            if not self.handler.tags:
+                print("[INFO] No tags defined")
+                return
+            try:
+                report = self.handler.memory_report(words or None, trace)
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                return
+            self.print_memory_report(report, totals=not words)
 
         elif command == ":s":
             if not arg:
@@ -134,11 +227,110 @@ class CLI:
         else:
             print(f"[ERROR] Unknown command: {command}")
 
+    def is_tag_name(self, word: str) -> bool:
+        """Check whether a defined tag is named word, so the word selects it."""
+        return any(tag.name == word for tag in self.handler.tags)
+
+    def count_tokens(self, text: str | ByteInput, histogram: str | None = None):
+        """
+        Print the token count of each tag, or one histogram line per bucket
+        ("lines" for lines, a number for windows of that many characters).
+        """
+        if histogram is None:
+            for name, count in self.handler.count_tokens(text).items():
+                print(f"{name} {count}")
+            return
+
+        window = None if histogram == "lines" else int(histogram)
+        for bucket, counts in self.handler.token_histograms(text, window):
+            print(" ".join([str(bucket), *(f"{name}={count}" for name, count in counts.items())]))
+
+    def print_memory_report(self, report: MemoryReport, totals: bool = True):
+        """Print one line per tag and, with totals, the whole tag set's line."""
+        print("[INFO] Memory footprint:")
+        for tag in report.tags:
+            line = (
+                f"  {tag.name}: {tag.states} states, {tag.transitions} transitions, "
+                f"{tag.epsilon_edges} ε-edges, {tag.automaton_bytes} bytes; "
+                f"DFA cache {tag.dfa_states} states, {tag.dfa_bytes} bytes"
+            )
+            if tag.compile_peak is not None:
+                line += f"; compile peak {tag.compile_peak} bytes"
+            print(line)
+        if totals:
+            print(
+                f"  Total: {report.states} states, {report.transitions} transitions, "
+                f"{report.epsilon_edges} ε-edges; automata {report.automaton_bytes} bytes, "
+                f"DFA caches {report.dfa_bytes} bytes, lexers {report.lexer_bytes} bytes, "
+                f"result cache {report.result_cache_bytes} bytes, "
+                f"{report.total_bytes} bytes in all"
+            )
+
+    def report_errors(self, file=None, source: str | None = None):
+        """Report the untokenizable runs skipped by the last tokenization of source."""
+        errors = self.handler.last_errors
+        if not errors:
+            return
+        prefix = f"{source}: " if source else ""
+        print(f"[WARNING] {prefix}{len(errors)} untokenizable run(s)", file=file)
+        for error in errors:
+            print(f"[WARNING] {prefix}Untokenizable input at {error}", file=file)
+
+    def process_files(
+        self, patterns: list[str], workers: int | None = None, progress: bool = False, file=None
+    ) -> int:
+        """
+        Tokenize the files named by paths, directories and glob patterns (see
+        CommandHandler.process_files), reporting failures, recovery errors and,
+        with progress, each finished file. Returns the number of failures.
+        """
+        paths, unmatched = expand_inputs(patterns)
+        failed = len(unmatched)
+        for pattern in unmatched:
+            print(f"[ERROR] No files match: {pattern}", file=file)
+        if not paths:
+            return failed
+
+        for done, result in enumerate(self.handler.process_files(paths, workers), 1):
+            if result.failure is not None:
+                print(f"[ERROR] {result.path}: {result.failure}", file=file)
+                failed += 1
+            else:
+                self.report_errors(file=file, source=result.path)
+            if progress:
+                print(f"[INFO] {done}/{len(paths)} {result.path}", file=file)
+        return failed
+
+    def process_file_resumable(
+        self, path: str, resume: bool = False, progress: bool = False, file=None
+    ):
+        """
+        Tokenize one file with checkpoints (see CommandHandler.write_file_tokens_resumable),
+        reporting each checkpoint with progress.
+        """
+
+        def report(state: Checkpoint):
+            print(
+                f"[INFO] {path}: checkpoint at character {state.input_offset}, "
+                f"{state.tokens} token(s)",
+                file=file,
+            )
+
+        self.handler.write_file_tokens_resumable(
+            path, resume, on_checkpoint=report if progress else None
+        )
+        self.report_errors(file=file)
+
     def handle_tag_definition(self, line: str):
         """Handle a tag definition line."""
         tag = self.handler.parse_tag_line(line)
         if tag:
-            if self.handler.add_tag(tag):
+            try:
+                added = self.handler.add_tag(tag)
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                return
+            if added:
                 print(f"[INFO] Tag '{tag.name}' defined successfully")
                 # Check for overlaps
                 overlaps = self.handler.check_overlaps()
@@ -150,9 +342,93 @@ class CLI:
             print(f"[ERROR] Invalid tag definition: {line}")
 
 
-def main():
+def build_argument_parser() -> argparse.ArgumentParser:
+    """Command-line options; without input files the interactive interpreter runs."""
+    parser = argparse.ArgumentParser(
+        prog="lexer", description="Tokenize input using tags defined in reverse Polish notation."
+    )
+    parser.add_argument(
+        "inputs", nargs="*", help="files, directories or glob patterns to tokenize in batch mode"
+    )
+    parser.add_argument("-t", "--tags", help="tag definition file to load first (as :c)")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="output file (as :o), or a directory for one output per input; stdout by default",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=CommandHandler.OUTPUT_FORMATS,
+        default="text",
+        help="output format (binary formats require --output)",
+    )
+    parser.add_argument(
+        "-r", "--recover", action="store_true", help="recover from untokenizable input (as :r)"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="worker processes for many files (CPU count by default)"
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="report each finished file, or each checkpoint, on stderr",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="record checkpoints while tokenizing a single input file to --output",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue from the last checkpoint of --checkpoint, if there is one",
+    )
+    return parser
+
+
+def run_batch(cli: CLI, args: argparse.Namespace) -> int:
+    """Tokenize the inputs given on the command line. Returns the exit status."""
+    if args.checkpoint or args.resume:
+        try:
+            cli.process_file_resumable(args.inputs[0], args.resume, args.progress, sys.stderr)
+        except Exception as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 1
+        return 0
+    try:
+        failed = cli.process_files(args.inputs, args.jobs, args.progress, file=sys.stderr)
+    except Exception as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    return 1 if failed else 0
+
+
+def main(argv: list[str] | None = None):
     """Main entry point."""
+    parser = build_argument_parser()
+    args = parser.parse_args(argv)
     cli = CLI()
+
+    if args.output:
+        cli.handler.set_output_file(args.output, args.format)
+    elif args.format != "text":
+        parser.error("binary formats require --output")
+    cli.handler.set_recovery(args.recover)
+    if (args.checkpoint or args.resume) and (len(args.inputs) != 1 or not args.output):
+        parser.error("--checkpoint and --resume take one input file and --output")
+
+    if args.tags:
+        try:
+            _, invalid_lines = cli.handler.load_tags_from_file(args.tags)
+        except Exception as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            sys.exit(1)
+        for line in invalid_lines:
+            print(f"[WARNING] {line}", file=sys.stderr)
+
+    if args.inputs:
+        sys.exit(run_batch(cli, args))
     cli.run()
 
 
@@ -0,0 +1,195 @@
+"""
+Tests for batch tokenization of many files.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.application.batch import PARALLEL_FILES, expand_inputs, tokenize_file, tokenize_files
+from src.application.command_handler import CommandHandler
+from src.application.compiled_lexer import CompiledLexer
+from src.application.token_format import read_tokens
+from src.domain.tag import Tag
+from src.infrastructure.cli import CLI, main
+
+
+class BatchTestCase(unittest.TestCase):
+    """Temporary directory with input files."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.tags = [Tag("A", "a"), Tag("B", "b"), Tag("NL", "\\n")]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def write_inputs(self, count):
+        """Files of different sizes; the fourth one cannot be tokenized."""
+        return [
+            self.write(f"in/{i:02}.txt", "x" if i == 3 else "ab" * (i + 1) + "\nb")
+            for i in range(count)
+        ]
+
+
+class TestExpandInputs(BatchTestCase):
+    """Test cases for expand_inputs."""
+
+    def test_directories_and_globs(self):
+        """Test that directories recurse and globs match files only."""
+        a = self.write("src/a.txt", "a")
+        b = self.write("src/sub/b.txt", "b")
+        c = self.write("src/sub/c.log", "c")
+        paths, unmatched = expand_inputs([os.path.join(self.root, "src")])
+        self.assertEqual(paths, [a, b, c])
+        self.assertEqual(unmatched, [])
+
+        paths, _ = expand_inputs([os.path.join(self.root, "src", "**", "*.txt")])
+        self.assertEqual(paths, [a, b])
+        paths, _ = expand_inputs([os.path.join(self.root, "src", "*")])
+        self.assertEqual(paths, [a])
+
+    def test_plain_paths_and_duplicates(self):
+        """Test that plain paths are kept even if missing, each once."""
+        a = self.write("a.txt", "a")
+        missing = os.path.join(self.root, "missing.txt")
+        pattern = os.path.join(self.root, "*.none")
+        paths, unmatched = expand_inputs([missing, a, os.path.join(self.root, "*.txt"), pattern])
+        self.assertEqual(paths, [missing, a])
+        self.assertEqual(unmatched, [pattern])
+
+    def test_file_named_like_a_glob(self):
+        """Test that an existing file with glob characters in its name is not globbed."""
+        bracketed = self.write("data[1].txt", "a")
+        other = self.write("data1.txt", "a")
+        paths, unmatched = expand_inputs([bracketed])
+        self.assertEqual((paths, unmatched), ([bracketed], []))
+        paths, _ = expand_inputs([os.path.join(self.root, "data[1].*")])
+        self.assertEqual(paths, [other])
+
+
+class TestTokenizeFiles(BatchTestCase):
+    """Test cases for tokenize_files."""
+
+    def test_pool_matches_serial(self):
+        """Test that pooled results equal in-process ones, in input order."""
+        paths = self.write_inputs(PARALLEL_FILES + 2)
+        snapshot = CompiledLexer(self.tags)
+        for output_format in ("text", "binary-spans"):
+            serial = list(tokenize_files(snapshot, paths, output_format=output_format, workers=1))
+            pooled = list(tokenize_files(snapshot, paths, output_format=output_format, workers=2))
+            with self.subTest(output_format=output_format):
+                self.assertEqual(pooled, serial)
+                self.assertEqual([result.path for result in pooled], paths)
+                self.assertIsNotNone(pooled[3].failure)
+                self.assertTrue(all(r.failure is None for i, r in enumerate(pooled) if i != 3))
+
+    def test_skip_tags_in_workers(self):
+        """Test that workers rebuild skip tags as skip tags."""
+        paths = self.write_inputs(PARALLEL_FILES)
+        tags = [Tag("A", "a"), Tag("B", "b"), Tag("NL", "\\n", skip=True)]
+        results = list(tokenize_files(CompiledLexer(tags), paths, workers=2))
+        self.assertEqual(results[0].output, "A B B")
+
+    def test_recovery_errors(self):
+        """Test that recovery errors come back located."""
+        path = self.write("in.txt", "a\nxb")
+        result = tokenize_file(CompiledLexer(self.tags), path, recover=True)
+        self.assertEqual(result.output, "A NL <error> B")
+        self.assertEqual((result.errors[0].line, result.errors[0].column), (2, 1))
+
+        missing = tokenize_file(CompiledLexer(self.tags), os.path.join(self.root, "none"))
+        self.assertIn("File not found", missing.failure)
+
+
+class TestCommandHandlerFiles(BatchTestCase):
+    """Test cases for CommandHandler.process_files."""
+
+    def setUp(self):
+        super().setUp()
+        self.handler = CommandHandler()
+        for tag in self.tags:
+            self.handler.add_tag(tag)
+
+    def test_aggregated_output(self):
+        """Test that outputs follow one another in the output file."""
+        paths = self.write_inputs(PARALLEL_FILES)
+        output = os.path.join(self.root, "out.txt")
+        self.handler.set_output_file(output)
+        results = list(self.handler.process_files(paths, workers=2))
+        with open(output, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        expected = [result.output for result in results if result.failure is None]
+        self.assertEqual(lines, expected)
+        self.assertEqual(lines[:2], ["A B NL B", "A B A B NL B"])
+
+    def test_per_file_outputs(self):
+        """Test one output per input under an output directory."""
+        a = self.write("in/a.txt", "ab")
+        b = self.write("in/sub/b.txt", "ba")
+        out = os.path.join(self.root, "out")
+        os.mkdir(out)
+        self.handler.set_output_file(out)
+        list(self.handler.process_files([a, b], workers=1))
+        with open(os.path.join(out, "sub", "b.txt.tokens"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "B A\n")
+
+        self.handler.set_output_file(out, "binary")
+        list(self.handler.process_files([a, b], workers=1))
+        with open(os.path.join(out, "a.txt.ltb"), "rb") as f:
+            self.assertEqual([token.name for token in read_tokens(f)], ["A", "B"])
+
+    def test_binary_requires_output(self):
+        """Test that binary formats need an output file or directory."""
+        self.handler.output_format = "binary"
+        with self.assertRaises(ValueError):
+            list(self.handler.process_files([]))
+
+
+class TestCLIFiles(BatchTestCase):
+    """Test cases for directories and globs on the command line."""
+
+    def setUp(self):
+        super().setUp()
+        self.tag_file = self.write("tags.txt", "A: a\nB: b\nNL: \\n\n")
+
+    def test_batch_directory(self):
+        """Test a directory of inputs with a worker pool and progress."""
+        paths = self.write_inputs(PARALLEL_FILES)
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err), self.assertRaises(SystemExit) as exit:
+            main(["-t", self.tag_file, "-j", "2", "--progress", os.path.join(self.root, "in")])
+        self.assertEqual(exit.exception.code, 1)
+        self.assertEqual(len(out.getvalue().splitlines()), len(paths) - 1)
+        self.assertIn(f"[ERROR] {paths[3]}:", err.getvalue())
+        self.assertIn(f"[INFO] {len(paths)}/{len(paths)} {paths[-1]}", err.getvalue())
+
+    def test_d_with_glob(self):
+        """Test :d with a glob pattern."""
+        self.write_inputs(3)
+        cli = CLI()
+        cli.handler.load_tags_from_file(self.tag_file)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            cli.process_line(f":d {os.path.join(self.root, 'in', '*.txt')}")
+            cli.process_line(f":d {os.path.join(self.root, '*.none')}")
+        output = out.getvalue()
+        self.assertIn("A B NL B", output)
+        self.assertIn("[INFO] Processed 3 file(s), 0 failed", output)
+        self.assertIn("[ERROR] No files match", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
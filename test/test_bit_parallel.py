@@ -0,0 +1,65 @@
+"""
+Tests for bit-parallel NFA simulation.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import unittest
+
+from src.domain.bit_parallel import BitParallelNFA
+from src.domain.regex_parser import RegexParser
+
+
+class TestBitParallelNFA(unittest.TestCase):
+    """Test cases for BitParallelNFA."""
+
+    def setUp(self):
+        self.parser = RegexParser()
+
+    def test_matches_set_simulation(self):
+        """Test that bitset simulation agrees with the set-based NFA."""
+        digits = "01+2+3+4+5+6+7+8+9+"
+        expressions = ["a", "ab+", "ab.", "a*", "ab.ba.+*", "bc+a.*", f"{digits}{digits}*.", "\\l"]
+        inputs = ["", "a", "b", "ab", "ba", "abba", "abab", "aab", "ac", "1000", "12a", "x"]
+        for expr in expressions:
+            automaton = self.parser.build_automaton(expr)
+            simulator = BitParallelNFA(automaton)
+            for text in inputs:
+                for start in range(len(text) + 1):
+                    with self.subTest(expr=expr, text=text, start=start):
+                        self.assertEqual(simulator.match(text, start), automaton.match(text, start))
+
+    def test_wildcard_transition(self):
+        """Test that '.' transitions match any character."""
+        automaton = self.parser.build_automaton("\\.a.")
+        simulator = automaton.bit_parallel()
+        self.assertEqual(simulator.match("xa", 0), 2)
+        self.assertEqual(simulator.match("éa", 0), 2)
+        self.assertIsNone(simulator.match("xb", 0))
+
+    def test_empty_language(self):
+        """Test that the empty language never matches."""
+        simulator = BitParallelNFA(self.parser.build_automaton(""))
+        self.assertIsNone(simulator.match("", 0))
+        self.assertIsNone(simulator.match("a", 0))
+
+    def test_step(self):
+        """Test stepping the active state mask one symbol at a time."""
+        simulator = BitParallelNFA(self.parser.build_automaton("ab."))
+        mask = simulator.step(simulator.start_mask, "a")
+        self.assertFalse(simulator.is_accepting(mask))
+        mask = simulator.step(mask, "b")
+        self.assertTrue(simulator.is_accepting(mask))
+        self.assertEqual(simulator.step(mask, "b"), 0)
+
+    def test_built_from_current_automaton(self):
+        """Test that a simulator built after editing the automaton sees the edits."""
+        automaton = self.parser.build_automaton("a")
+        self.assertIsNone(automaton.bit_parallel().match("b", 0))
+        automaton.start_state.add_transition("b", automaton.states[-1])
+        self.assertEqual(automaton.match("b", 0), 1)
+        self.assertEqual(automaton.bit_parallel().match("b", 0), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests for byte-mode lexing.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import mmap
+import random
+import tempfile
+import unittest
+
+from src.application.byte_lexer import ByteLexicalAnalyzer
+from src.application.lexer import LexError, LexicalAnalyzer
+from src.domain.byte_dfa import ByteDFA
+from src.domain.dfa_cache import LazyDFA
+from src.domain.regex_parser import RegexParser
+from src.domain.tag import Tag
+
+DIGITS = "01+2+3+4+5+6+7+8+9+"
+
+
+class TestByteDFA(unittest.TestCase):
+    """Test cases for ByteDFA."""
+
+    def setUp(self):
+        self.parser = RegexParser()
+
+    def dfa(self, expr, max_states=LazyDFA.DEFAULT_MAX_STATES):
+        return ByteDFA(self.parser.build_automaton(expr).bit_parallel(), max_states)
+
+    def test_matches_nfa(self):
+        """Test that the byte DFA agrees with the NFA on the decoded text."""
+        expressions = ["ab+*a.", "ab.ba.+*", "\\.a.*b.", "a*b*.", "\\l", ""]
+        rng = random.Random(38)
+        for expr in expressions:
+            for max_states in (None, 2, 64):
+                dfa = self.dfa(expr, max_states)
+                for _ in range(100):
+                    text = "".join(rng.choice("abx\xe9") for _ in range(rng.randint(0, 12)))
+                    data = text.encode("latin-1")
+                    with self.subTest(expr=expr, max_states=max_states, text=text):
+                        self.assertEqual(dfa.match(data, 0), dfa.nfa.match(text, 0))
+
+    def test_rows_indexed_by_byte(self):
+        """Test that transitions are cached in 256-entry rows."""
+        dfa = self.dfa("ab+*")
+        self.assertEqual(dfa.match(b"abab", 0), 4)
+        first = dfa.stats
+        self.assertEqual(dfa.match(bytearray(b"abab"), 0), 4)
+        stats = dfa.stats
+        self.assertEqual(stats.misses, first.misses)
+        self.assertEqual(stats.chars, 8)
+        self.assertTrue(all(len(row) == 256 for row in dfa._rows))
+
+    def test_step(self):
+        """Test stepping state masks on byte values."""
+        dfa = self.dfa("ab.")
+        mask = dfa.step(dfa.start_mask, ord("a"))
+        self.assertTrue(mask)
+        self.assertTrue(dfa.step(mask, ord("b")) & dfa.final_mask)
+        self.assertEqual(dfa.step(mask, ord("a")), 0)
+        self.assertEqual(dfa.step(mask, ord("a")), 0)
+
+    def test_fallback_on_thrashing(self):
+        """Test that an exponential DFA falls back to NFA simulation."""
+        dfa = self.dfa("ab+*a." + "ab+." * 12, max_states=64)
+        rng = random.Random(3)
+        text = "".join(rng.choice("ab") for _ in range(2000))
+        self.assertEqual(dfa.match(text.encode(), 0), dfa.nfa.match(text, 0))
+        self.assertTrue(dfa.fallback)
+        self.assertEqual(dfa.stats.fallbacks, 1)
+
+    def test_same_policy_as_lazy_dfa(self):
+        """Test that caching, flushes and the thrash fallback happen as in LazyDFA."""
+        expr = "ab+*a." + "ab+." * 6
+        rng = random.Random(5)
+        for max_states in (8, 64, 512):
+            byte_dfa = self.dfa(expr, max_states)
+            lazy = LazyDFA(byte_dfa.nfa, max_states)
+            for _ in range(20):
+                text = "".join(rng.choice("ab") for _ in range(300))
+                self.assertEqual(byte_dfa.match(text.encode(), 0), lazy.match(text, 0))
+            with self.subTest(max_states=max_states):
+                self.assertEqual(byte_dfa.stats, lazy.stats)
+
+    def test_invalid_budget(self):
+        """Test that the state budget must be positive."""
+        with self.assertRaises(ValueError):
+            self.dfa("a", max_states=0)
+
+
+class TestByteLexicalAnalyzer(unittest.TestCase):
+    """Test cases for ByteLexicalAnalyzer."""
+
+    def setUp(self):
+        self.tags = [
+            Tag("IF", "if."),
+            Tag("ID", f"ab+c+f+i+ab+c+f+i+{DIGITS}+*."),
+            Tag("INT", f"{DIGITS}{DIGITS}*."),
+            Tag("SPACE", " \\n+"),
+        ]
+        rng = random.Random(38)
+        self.text = " ".join(
+            "".join(rng.choice("abcif01") for _ in range(rng.randint(1, 12))) for _ in range(500)
+        )
+
+    def test_same_tokens_as_text_mode(self):
+        """Test that every bytes-like input tokenizes like the decoded text."""
+        expected = LexicalAnalyzer(self.tags).tokenize(self.text)
+        data = self.text.encode("ascii")
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                inputs = [data, bytearray(data), memoryview(data), mapped]
+                for linear_time in (False, True):
+                    lexer = ByteLexicalAnalyzer(self.tags, linear_time=linear_time)
+                    for source in inputs:
+                        with self.subTest(kind=type(source).__name__, linear_time=linear_time):
+                            self.assertEqual(lexer.tokenize(source), expected)
+
+    def test_spans_are_byte_offsets(self):
+        """Test token spans and ids over bytes."""
+        lexer = ByteLexicalAnalyzer(self.tags)
+        spans = list(lexer.iter_token_spans(b"if a1\n7"))
+        self.assertEqual(spans, [(0, 0, 2), (3, 2, 3), (1, 3, 5), (3, 5, 6), (2, 6, 7)])
+        self.assertEqual(list(lexer.tokenize_ids(b"if if")), ["IF", "SPACE", "IF"])
+
+    def test_non_ascii_error(self):
+        """Test that the error policy rejects non-ASCII input before scanning."""
+        lexer = ByteLexicalAnalyzer(self.tags)
+        with self.assertRaisesRegex(ValueError, "Non-ASCII byte 0xc3 at position 3"):
+            lexer.tokenize("if é".encode())
+        with self.assertRaisesRegex(ValueError, "position 1: 'x'"):
+            lexer.tokenize(b"ax")
+
+    def test_non_ascii_wildcard(self):
+        """Test that the wildcard policy matches each non-ASCII byte as a wildcard."""
+        tags = [Tag("A", "a"), Tag("ANY", "\\.")]
+        lexer = ByteLexicalAnalyzer(tags, non_ascii=ByteLexicalAnalyzer.WILDCARD)
+        self.assertEqual(lexer.tokenize("aé".encode()), ["A", "ANY", "ANY"])
+
+        errors = []
+        strict = ByteLexicalAnalyzer([Tag("A", "a")], non_ascii="wildcard")
+        stream = strict.tokenize_ids(b"a\xffa", errors=errors)
+        self.assertEqual(list(stream), ["A", "<error>", "A"])
+        self.assertEqual(errors, [LexError(1, "\\xff")])
+
+    def test_invalid_configuration(self):
+        """Test that non-ASCII tags and unknown policies are rejected."""
+        with self.assertRaises(ValueError):
+            ByteLexicalAnalyzer([Tag("E", "é")])
+        with self.assertRaises(ValueError):
+            ByteLexicalAnalyzer(self.tags, non_ascii="latin-1")
+
+    def test_candidates(self):
+        """Test the dispatch index keyed by byte values."""
+        lexer = ByteLexicalAnalyzer(self.tags)
+        self.assertEqual([tag.name for tag in lexer.candidates("i")], ["IF", "ID"])
+        self.assertEqual(lexer.candidates("z"), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
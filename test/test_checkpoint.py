@@ -0,0 +1,254 @@
+"""
+Tests for resumable tokenization checkpoints.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.application.checkpoint import (
+    Checkpoint,
+    checkpoint_path,
+    tag_set_hash,
+    tokenize_resumable,
+)
+from src.application.command_handler import CommandHandler
+from src.application.compiled_lexer import CompiledLexer
+from src.domain.tag import Tag
+from src.infrastructure.cli import CLI, main
+
+DIGITS = "01+2+3+4+5+6+7+8+9+"
+
+
+class CrashError(Exception):
+    """Stands in for a crash."""
+
+
+def interrupt_after(count):
+    """on_checkpoint callback that raises CrashError at the count-th checkpoint."""
+    seen = []
+
+    def on_checkpoint(state):
+        seen.append(state)
+        if len(seen) == count:
+            raise CrashError
+
+    return on_checkpoint
+
+
+class CheckpointTestCase(unittest.TestCase):
+    """Temporary input and output files."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.tags = [
+            Tag("INT", f"{DIGITS}{DIGITS}*."),
+            Tag("ID", "abc++abc++*."),
+            Tag("SP", ",", skip=True),
+            Tag("NL", "\\n"),
+        ]
+        self.text = "".join(f"abc,{i},cab{i % 7}\n" for i in range(300))
+        self.input = os.path.join(self.root, "in.txt")
+        with open(self.input, "w", encoding="utf-8") as f:
+            f.write(self.text)
+        self.output = os.path.join(self.root, "out.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_output(self):
+        with open(self.output, encoding="utf-8") as f:
+            return f.read()
+
+
+class TestTokenizeResumable(CheckpointTestCase):
+    """Test cases for tokenize_resumable."""
+
+    def run_job(self, snapshot, text, **options):
+        return tokenize_resumable(snapshot, text, self.input, self.output, **options)
+
+    def test_uninterrupted(self):
+        """Test that the output is the text output, after what the file held."""
+        snapshot = CompiledLexer(self.tags)
+        with open(self.output, "w", encoding="utf-8") as f:
+            f.write("earlier\n")
+        states = []
+        state, errors = self.run_job(snapshot, self.text, interval=500, on_checkpoint=states.append)
+        expected, _ = snapshot.tokenize_to_text(self.text)
+        self.assertEqual(self.read_output(), f"earlier\n{expected}\n")
+        self.assertEqual(state.tokens, len(expected.split()))
+        self.assertEqual(state.input_offset, len(self.text))
+        self.assertEqual(errors, [])
+        self.assertGreater(len(states), 5)
+        self.assertFalse(os.path.exists(checkpoint_path(self.output)))
+
+    def test_resume_matches_uninterrupted(self):
+        """Test that a resumed run writes the same output as an uninterrupted one."""
+        snapshot = CompiledLexer(self.tags)
+        text = self.text + "?" + self.text[:200]
+        self.run_job(snapshot, text, recover=True, interval=400)
+        expected = self.read_output()
+        os.remove(self.output)
+
+        with self.assertRaises(CrashError):
+            self.run_job(
+                snapshot, text, recover=True, interval=400, on_checkpoint=interrupt_after(4)
+            )
+        saved = Checkpoint.load(checkpoint_path(self.output))
+        self.assertEqual(saved.output_offset, os.path.getsize(self.output))
+        self.assertEqual(saved.tag_hash, tag_set_hash(self.tags))
+        # Bytes written after the checkpoint, before the crash
+        with open(self.output, "a", encoding="utf-8") as f:
+            f.write(" ID INT")
+
+        # A second crash after a resume
+        with self.assertRaises(CrashError):
+            self.run_job(
+                snapshot,
+                text,
+                recover=True,
+                resume=True,
+                interval=400,
+                on_checkpoint=interrupt_after(3),
+            )
+        state, errors = self.run_job(snapshot, text, recover=True, resume=True, interval=400)
+        self.assertEqual(self.read_output(), expected)
+        self.assertEqual(state.tokens, len(expected.split()))
+        self.assertEqual(state.errors, 1)
+        self.assertEqual([error.position for error in errors], [len(self.text)])
+
+    def test_resume_checks(self):
+        """Test that a checkpoint of a changed input, another tag set or mode is refused."""
+        with self.assertRaises(CrashError):
+            self.run_job(
+                CompiledLexer(self.tags), self.text, interval=400, on_checkpoint=interrupt_after(1)
+            )
+        other = CompiledLexer([*self.tags[:2], Tag("SP", ","), self.tags[3]])
+        with self.assertRaisesRegex(ValueError, "different tag set"):
+            self.run_job(other, self.text, resume=True)
+        with self.assertRaisesRegex(ValueError, "recovery mode"):
+            self.run_job(CompiledLexer(self.tags), self.text, resume=True, recover=True)
+
+        # The same input, changed after the checkpoint
+        info = os.stat(self.input)
+        with open(self.input, "a", encoding="utf-8") as f:
+            f.write("abc\n")
+        with self.assertRaisesRegex(ValueError, "changed since checkpoint"):
+            self.run_job(CompiledLexer(self.tags), self.text, resume=True)
+        with open(self.input, "w", encoding="utf-8") as f:
+            f.write(self.text)
+        os.utime(self.input, ns=(info.st_atime_ns, info.st_mtime_ns + 1))
+        with self.assertRaisesRegex(ValueError, "changed since checkpoint"):
+            self.run_job(CompiledLexer(self.tags), self.text, resume=True)
+
+        with open(checkpoint_path(self.output), "w", encoding="utf-8") as f:
+            f.write("{")
+        with self.assertRaisesRegex(ValueError, "Invalid checkpoint"):
+            self.run_job(CompiledLexer(self.tags), self.text, resume=True)
+
+    def test_resume_without_checkpoint(self):
+        """Test that resuming with no checkpoint runs from the start."""
+        snapshot = CompiledLexer(self.tags)
+        self.run_job(snapshot, "abc,12\n", resume=True)
+        self.assertEqual(self.read_output(), "ID INT NL\n")
+
+    def test_failed_scan_leaves_no_partial_line(self):
+        """Test that a scan error after checkpoints removes the line and the checkpoint."""
+        snapshot = CompiledLexer([Tag("A", "a")])
+        with open(self.output, "w", encoding="utf-8") as f:
+            f.write("earlier\n")
+        states = []
+        with self.assertRaisesRegex(ValueError, "position 50"):
+            self.run_job(
+                snapshot, "a" * 50 + "b" + "a" * 5, interval=10, on_checkpoint=states.append
+            )
+        self.assertGreater(len(states), 2)
+        self.assertEqual(self.read_output(), "earlier\n")
+        self.assertFalse(os.path.exists(checkpoint_path(self.output)))
+
+        # A resumed run that fails drops the line begun before the crash too
+        with self.assertRaises(CrashError):
+            self.run_job(snapshot, "a" * 50 + "b", interval=10, on_checkpoint=interrupt_after(2))
+        with self.assertRaises(ValueError):
+            self.run_job(snapshot, "a" * 50 + "b", resume=True, interval=10)
+        self.assertEqual(self.read_output(), "earlier\n")
+        self.assertFalse(os.path.exists(checkpoint_path(self.output)))
+
+    def test_tag_set_hash(self):
+        """Test that the hash follows definitions, skip marks and order."""
+        a, b = Tag("A", "a"), Tag("B", "b")
+        self.assertEqual(tag_set_hash([a, b]), tag_set_hash([Tag("A", "a"), Tag("B", "b")]))
+        self.assertNotEqual(tag_set_hash([a, b]), tag_set_hash([b, a]))
+        self.assertNotEqual(tag_set_hash([a]), tag_set_hash([Tag("A", "a", skip=True)]))
+        self.assertNotEqual(tag_set_hash([a]), tag_set_hash([Tag("A", "a", "glushkov")]))
+
+
+class TestResumableCommands(CheckpointTestCase):
+    """Test cases for checkpoints through CommandHandler and the CLI."""
+
+    def setUp(self):
+        super().setUp()
+        self.tag_file = os.path.join(self.root, "tags.lex")
+        with open(self.tag_file, "w", encoding="utf-8") as f:
+            f.write(f"INT: {DIGITS}{DIGITS}*.\nID: abc++abc++*.\n~SP: ,\nNL: \\n\n")
+        self.handler = CommandHandler()
+        for tag in self.tags:
+            self.handler.add_tag(tag)
+
+    def test_requires_text_file_output(self):
+        """Test that checkpoints need text output to a file."""
+        with self.assertRaisesRegex(ValueError, "text output to a file"):
+            self.handler.write_file_tokens_resumable(self.input)
+        self.handler.set_output_file(self.output, "binary")
+        with self.assertRaisesRegex(ValueError, "text output to a file"):
+            self.handler.write_file_tokens_resumable(self.input)
+
+    def test_d_resume(self):
+        """Test :d with checkpoint and resume."""
+        cli = CLI()
+        for tag in self.tags:
+            cli.handler.add_tag(tag)
+        cli.handler.set_output_file(self.output)
+        with self.assertRaises(CrashError):
+            cli.handler.write_file_tokens_resumable(
+                self.input, interval=100, on_checkpoint=interrupt_after(2)
+            )
+        out = io.StringIO()
+        with redirect_stdout(out):
+            cli.process_line(f":d {self.input} resume")
+        self.assertEqual(out.getvalue(), "")
+        expected, _ = self.handler.snapshot.tokenize_to_text(self.text)
+        self.assertEqual(self.read_output(), expected + "\n")
+
+    def test_command_line(self):
+        """Test --checkpoint with --progress, and its argument checks."""
+        err = io.StringIO()
+        with redirect_stderr(err), self.assertRaises(SystemExit) as exit:
+            main(
+                [
+                    "-t",
+                    self.tag_file,
+                    "-o",
+                    self.output,
+                    "--checkpoint",
+                    "--resume",
+                    "--progress",
+                    self.input,
+                ]
+            )
+        self.assertEqual(exit.exception.code, 0)
+        self.assertEqual(self.read_output().split(), self.handler.process_input(self.text).split())
+        self.assertNotIn("checkpoint at", err.getvalue())
+
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as exit:
+            main(["-t", self.tag_file, "--checkpoint", self.input])
+        self.assertEqual(exit.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+Tests for the command-line interface.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.application.token_format import read_tokens
+from src.infrastructure.cli import CLI, main
+
+
+class TestCLI(unittest.TestCase):
+    """Test cases for interactive commands."""
+
+    def setUp(self):
+        self.cli = CLI()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_lines(self, *lines):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            for line in lines:
+                self.cli.process_line(line)
+        return out.getvalue()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_recovery_toggle(self):
+        """Test :r with on, off, no argument and an invalid argument."""
+        self.assertIn("enabled", self.run_lines(":r on"))
+        self.assertTrue(self.cli.handler.recover)
+        self.assertIn("disabled", self.run_lines(":r"))
+        self.assertFalse(self.cli.handler.recover)
+        self.run_lines(":r")
+        self.assertTrue(self.cli.handler.recover)
+        self.assertIn("disabled", self.run_lines(":r off"))
+        self.assertIn("[ERROR]", self.run_lines(":r maybe"))
+        self.assertFalse(self.cli.handler.recover)
+
+    def test_recovery_reports_errors(self):
+        """Test that :p in recovery mode prints error tokens and warnings."""
+        output = self.run_lines("A: a", ":r on", ":p aba")
+        self.assertIn("A <error> A", output)
+        self.assertIn("[WARNING] Untokenizable input at position 1: 'b' (line 1, column 2)", output)
+
+    def test_output_format_argument(self):
+        """Test the optional format after the :o path."""
+        self.run_lines(f":o {self.path('out.ltb')} binary-spans")
+        self.assertEqual(self.cli.handler.output_file, self.path("out.ltb"))
+        self.assertEqual(self.cli.handler.output_format, "binary-spans")
+
+        # A last word that is not a format is part of the path
+        self.run_lines(f":o {self.path('my out.txt')}")
+        self.assertEqual(self.cli.handler.output_file, self.path("my out.txt"))
+        self.assertEqual(self.cli.handler.output_format, "text")
+
+    def test_binary_output(self):
+        """Test tokenizing with :p into a binary output file."""
+        output = self.run_lines("A: a", "B: b", f":o {self.path('out.ltb')} binary", ":p abba")
+        self.assertNotIn("[ERROR]", output)
+        with open(self.path("out.ltb"), "rb") as f:
+            self.assertEqual([token.name for token in read_tokens(f)], ["A", "B", "B", "A"])
+
+    def test_count_command(self):
+        """Test :n with totals, line histograms and window histograms."""
+        with open(self.path("input.txt"), "w", encoding="utf-8") as f:
+            f.write("ab\nbb")
+        self.run_lines("A: a", "B: b", "NL: \\n")
+        self.assertEqual(
+            self.run_lines(f":n {self.path('input.txt')}").splitlines(), ["A 1", "B 3", "NL 1"]
+        )
+        self.assertEqual(
+            self.run_lines(f":n {self.path('input.txt')} lines").splitlines(),
+            ["1 A=1 B=1 NL=1", "2 B=2"],
+        )
+        self.assertEqual(
+            self.run_lines(f":n {self.path('input.txt')} 4").splitlines(),
+            ["0 A=1 B=2 NL=1", "1 B=1"],
+        )
+        self.assertIn("[ERROR]", self.run_lines(f":n {self.path('missing.txt')}"))
+
+    def test_automata_commands(self):
+        """Test :a with names and a limit, and :g."""
+        self.run_lines("A: ab.", "B: b*")
+        output = self.run_lines(":a B 1").splitlines()
+        self.assertEqual(output[:2], ["[INFO] Automata definitions:", "Tag: B"])
+        self.assertEqual(sum(line.startswith("  δ") for line in output), 1)
+        self.assertIn("more transition(s)", output[-1])
+        self.assertIn("[ERROR] Unknown tag: C", self.run_lines(":a C"))
+        # A tag named by digits is selected, not read as a limit
+        self.run_lines("7: a")
+        self.assertEqual(self.run_lines(":a 7").splitlines()[1], "Tag: 7")
+        self.assertEqual(self.run_lines(":a 7 0").splitlines()[1], "Tag: 7")
+
+        self.assertIn("[INFO]", self.run_lines(f":g {self.path('out.dot')} A"))
+        with open(self.path("out.dot"), encoding="utf-8") as f:
+            self.assertTrue(f.read().startswith('digraph "A" {'))
+
+    def test_reserved_tag_name(self):
+        """Test that defining the error token name is reported."""
+        self.assertIn("[ERROR]", self.run_lines("<error>: a"))
+        self.assertEqual(self.cli.handler.tags, [])
+
+
+class TestBatchMode(unittest.TestCase):
+    """Test cases for the non-interactive command line."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.tags = self.write("tags.txt", "A: a\nB: b\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def run_main(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err), self.assertRaises(SystemExit) as exit:
+            main(list(argv))
+        return exit.exception.code, out.getvalue(), err.getvalue()
+
+    def test_text_output(self):
+        """Test tokenizing several files to stdout."""
+        first = self.write("first.txt", "ab")
+        second = self.write("second.txt", "ba")
+        code, out, err = self.run_main("-t", self.tags, first, second)
+        self.assertEqual(code, 0)
+        self.assertEqual(out.splitlines(), ["A B", "B A"])
+        self.assertEqual(err, "")
+
+    def test_continues_after_errors(self):
+        """Test that a failing file is reported and the others still run."""
+        bad = self.write("bad.txt", "abc")
+        good = self.write("good.txt", "a")
+        missing = os.path.join(self.directory.name, "missing.txt")
+        code, out, err = self.run_main("-t", self.tags, bad, missing, good)
+        self.assertEqual(code, 1)
+        self.assertEqual(out.splitlines(), ["A"])
+        self.assertIn(bad, err)
+        self.assertIn(missing, err)
+
+    def test_recover_option(self):
+        """Test that --recover emits error tokens and warns on stderr."""
+        source = self.write("input.txt", "acb")
+        code, out, err = self.run_main("-t", self.tags, "-r", source)
+        self.assertEqual(code, 0)
+        self.assertEqual(out.strip(), "A <error> B")
+        self.assertIn("[WARNING]", err)
+
+    def test_binary_output(self):
+        """Test writing binary frames to the output file."""
+        source = self.write("input.txt", "aab")
+        output = os.path.join(self.directory.name, "out.ltb")
+        code, _, _ = self.run_main("-t", self.tags, "-o", output, "-f", "binary-spans", source)
+        self.assertEqual(code, 0)
+        with open(output, "rb") as f:
+            tokens = list(read_tokens(f))
+        self.assertEqual([token.name for token in tokens], ["A", "A", "B"])
+        self.assertEqual((tokens[2].start, tokens[2].end), (2, 3))
+
+    def test_binary_format_requires_output(self):
+        """Test that binary formats without --output are rejected."""
+        code, _, err = self.run_main("-f", "binary", "input.txt")
+        self.assertEqual(code, 2)
+        self.assertIn("--output", err)
+
+    def test_missing_tag_file(self):
+        """Test that an unreadable tag file stops before tokenizing."""
+        code, _, err = self.run_main("-t", "missing-tags.txt", "input.txt")
+        self.assertEqual(code, 1)
+        self.assertIn("[ERROR]", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,14 @@ Tests for command handler.
 Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 """
 
+import io
 import os
 import tempfile
 import unittest
+from contextlib import redirect_stdout
 
 from src.application.command_handler import CommandHandler
+from src.application.token_format import read_tokens
 from src.domain.tag import Tag
 
 
@@ -35,6 +38,23 @@ class TestCommandHandler(unittest.TestCase):
         self.assertFalse(result)
         self.assertEqual(len(self.handler.tags), 1)
 
+    def test_reserved_tag_name(self):
+        """Test rejecting the name of the recovery error token."""
+        with self.assertRaises(ValueError):
+            self.handler.add_tag(Tag("<error>", "a"))
+        self.assertEqual(self.handler.tags, [])
+
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
+            f.write("<error>: a\nVAR: b\n")
+            filepath = f.name
+
+        try:
+            valid, invalid = self.handler.load_tags_from_file(filepath)
+            self.assertEqual([tag.name for tag in valid], ["VAR"])
+            self.assertEqual(invalid, ["Line 1: Reserved tag name '<error>'"])
+        finally:
+            os.unlink(filepath)
+
     def test_parse_tag_line(self):
         """Test parsing tag line."""
         tag = self.handler.parse_tag_line("VAR: a*")
@@ -69,6 +89,53 @@ class TestCommandHandler(unittest.TestCase):
         finally:
             os.unlink(filepath)
 
+    def test_skip_tags(self):
+        """Test that skip tags are saved, loaded and left out of outputs and counts."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".lex") as f:
+            f.write("A: a\n~NL: \\n\nB: b\n")
+            filepath = f.name
+
+        try:
+            self.handler.load_tags_from_file(filepath)
+            self.assertEqual(self.handler.list_tags(), ["A: a", "~NL: \\n", "B: b"])
+            self.assertEqual(self.handler.process_input("a\nb\n\na"), "A B A")
+            self.assertEqual(self.handler.count_tokens("a\n\nb"), {"A": 1, "B": 1})
+            self.handler.save_tags_to_file(filepath)
+            reloaded = CommandHandler()
+            reloaded.load_tags_from_file(filepath)
+            self.assertTrue(reloaded.tags[1].skip)
+        finally:
+            os.unlink(filepath)
+
+    def test_compilation_modes(self):
+        """Test lazy, eager and background building of loaded tags."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".lex") as f:
+            f.write("A: ab+*\nB: bc.*\nC: c\n")
+            filepath = f.name
+
+        try:
+            lazy = CommandHandler()
+            lazy.load_tags_from_file(filepath)
+            self.assertFalse(any(tag.is_compiled for tag in lazy.tags))
+            self.assertEqual(lazy.process_input("abc"), "A C")
+            self.assertEqual([tag.is_compiled for tag in lazy.tags], [True, False, False])
+
+            eager = CommandHandler()
+            eager.set_compilation("eager")
+            eager.load_tags_from_file(filepath)
+            self.assertTrue(all(tag.is_compiled for tag in eager.tags))
+
+            background = CommandHandler()
+            background.load_tags_from_file(filepath)
+            background.warm(background=True).join()
+            self.assertTrue(all(tag.is_compiled for tag in background.tags))
+            self.assertEqual(background.process_input("abc"), "A C")
+        finally:
+            os.unlink(filepath)
+
+        with self.assertRaises(ValueError):
+            self.handler.set_compilation("sometimes")
+
     def test_process_input(self):
         """Test processing input."""
         tag = Tag("VAR", "a*")
@@ -85,6 +152,25 @@ class TestCommandHandler(unittest.TestCase):
         result = self.handler.process_input("aaa   ")
         self.assertEqual(result, "VAR SPACE")
 
+    def test_process_input_recovery(self):
+        """Test processing input with error recovery enabled."""
+        self.handler.add_tag(Tag("VAR", "a"))
+        self.handler.set_recovery(True)
+        result = self.handler.process_input("aaxa")
+        self.assertEqual(result, "VAR VAR <error> VAR")
+        self.assertEqual(len(self.handler.last_errors), 1)
+        self.assertEqual(self.handler.last_errors[0].position, 2)
+        self.assertEqual(self.handler.last_errors[0].column, 3)
+
+        self.handler.process_input("a\naxa")
+        self.assertEqual(
+            (self.handler.last_errors[-1].line, self.handler.last_errors[-1].column), (2, 2)
+        )
+
+        self.handler.set_recovery(False)
+        with self.assertRaises(ValueError):
+            self.handler.process_input("aaxa")
+
     def test_process_input_no_tags(self):
         """Test processing input without tags."""
         with self.assertRaises(ValueError):
@@ -109,6 +195,35 @@ class TestCommandHandler(unittest.TestCase):
         self.assertEqual(len(automata), 1)
         self.assertIn("VAR", automata[0])
 
+    def test_iter_automata(self):
+        """Test streaming selected formal definitions."""
+        self.handler.add_tag(Tag("A", "a"))
+        self.handler.add_tag(Tag("B", "b*"))
+        lines = list(self.handler.iter_automata())
+        self.assertEqual("\n".join(lines), "\n\n".join(self.handler.list_automata()))
+        self.assertEqual(
+            list(self.handler.iter_automata(["B"])),
+            list(self.handler.tags[1].iter_formal_definition()),
+        )
+        limited = list(self.handler.iter_automata(limit=0))
+        self.assertEqual(sum(line.startswith("  δ") for line in limited), 0)
+        with self.assertRaises(ValueError):
+            list(self.handler.iter_automata(["C"]))
+
+    def test_export_dot(self):
+        """Test writing DOT digraphs to a file."""
+        self.handler.add_tag(Tag("A", "a"))
+        self.handler.add_tag(Tag("B", "b*"))
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "automata.dot")
+            self.handler.export_dot(filepath)
+            with open(filepath, encoding="utf-8") as f:
+                content = f.read()
+            self.assertEqual(content.count("digraph"), 2)
+            self.handler.export_dot(filepath, ["B"])
+            with open(filepath, encoding="utf-8") as f:
+                self.assertTrue(f.read().startswith('digraph "B" {'))
+
     def test_set_output_file(self):
         """Test setting output file."""
         self.handler.set_output_file("output.txt")
@@ -129,6 +244,80 @@ class TestCommandHandler(unittest.TestCase):
         finally:
             os.unlink(filepath)
 
+    def test_write_tokens_binary(self):
+        """Test writing tokens in the binary format."""
+        self.handler.add_tag(Tag("VAR", "a*"))
+        self.handler.add_tag(Tag("SPACE", " "))
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".ltb") as f:
+            filepath = f.name
+
+        try:
+            self.handler.set_output_file(filepath, "binary-spans")
+            self.handler.write_tokens("aa a")
+            with self.assertRaises(ValueError):
+                self.handler.write_tokens("aab")
+            self.handler.write_tokens("a")
+
+            with open(filepath, "rb") as f:
+                tokens = list(read_tokens(f))
+            self.assertEqual([token.name for token in tokens], ["VAR", "SPACE", "VAR", "VAR"])
+            self.assertEqual((tokens[2].start, tokens[2].end), (3, 4))
+        finally:
+            os.unlink(filepath)
+
+    def test_write_tokens_text_streams(self):
+        """Test that text output is written in blocks while the scan runs."""
+        self.handler.add_tag(Tag("A", "a"))
+        self.handler.add_tag(Tag("B", "b"))
+        self.handler.OUTPUT_BUFFER = 4
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as f:
+            filepath = f.name
+
+        try:
+            self.handler.set_output_file(filepath)
+            self.handler.write_tokens("ab" * 50)
+            self.handler.write_tokens("")
+            with self.assertRaises(ValueError):
+                self.handler.write_tokens("ab" * 50 + "x")
+            self.handler.write_tokens("ba")
+            with open(filepath, encoding="utf-8") as f:
+                self.assertEqual(f.read(), " ".join(["A B"] * 50) + "\n\nB A\n")
+
+            # Blocks reach the file before the last piece is produced
+            seen = []
+
+            def pieces():
+                for piece in ("A", " B", " A", " B"):
+                    yield piece
+                    with open(filepath, encoding="utf-8") as f:
+                        seen.append(f.read())
+
+            self.handler.set_output_file(filepath)
+            self.handler.write_output_chunks(pieces())
+            self.assertTrue(seen[-1].endswith("B A\nA B A"))
+        finally:
+            os.unlink(filepath)
+
+    def test_write_tokens_stdout(self):
+        """Test streamed stdout output, ended with a newline if an error stops it."""
+        self.handler.add_tag(Tag("A", "a"))
+        self.handler.OUTPUT_BUFFER = 4
+        self.handler.snapshot.TEXT_CHUNK_TOKENS = 1
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.handler.write_tokens("aaa")
+            with self.assertRaises(ValueError):
+                self.handler.write_tokens("aaax")
+            with self.assertRaises(ValueError):
+                self.handler.write_tokens("x")
+        self.assertEqual(out.getvalue(), "A A A\nA A A\n")
+
+    def test_set_output_file_unknown_format(self):
+        """Test rejecting an unknown output format."""
+        with self.assertRaises(ValueError):
+            self.handler.set_output_file("output.bin", "xml")
+
     def test_check_overlaps(self):
         """Test checking overlaps."""
         tag1 = Tag("TAG1", "a*")
@@ -167,6 +356,43 @@ class TestCommandHandler(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             self.handler.process_file("nonexistent.txt")
 
+    def test_count_tokens(self):
+        """Test tag counts and histograms over text and mapped files."""
+        self.handler.add_tag(Tag("A", "a"))
+        self.handler.add_tag(Tag("B", "b"))
+        self.handler.add_tag(Tag("NL", "\\n"))
+        self.assertEqual(self.handler.count_tokens("aab"), {"A": 2, "B": 1, "NL": 0})
+
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+            f.write(b"ab\nbb")
+            filepath = f.name
+        try:
+            with self.handler.map_input_file(filepath) as data:
+                self.assertEqual(self.handler.count_tokens(data), {"A": 1, "B": 3, "NL": 1})
+                self.assertEqual(
+                    list(self.handler.token_histograms(data)),
+                    [(1, {"A": 1, "B": 1, "NL": 1}), (2, {"B": 2})],
+                )
+            self.assertIsNotNone(self.handler.byte_lexer)
+        finally:
+            os.unlink(filepath)
+
+    def test_count_tokens_decodes_non_ascii(self):
+        """Test that non-ASCII bytes are decoded and counted like text."""
+        self.handler.add_tag(Tag("E", "é"))
+        self.handler.add_tag(Tag("ANY", "\\."))
+        self.assertEqual(self.handler.count_tokens("éxé".encode()), {"E": 2, "ANY": 1})
+        self.handler.set_recovery(True)
+        self.handler.add_tag(Tag("X", "x"))
+        self.assertEqual(self.handler.count_tokens(b""), {"E": 0, "ANY": 0, "X": 0})
+
+    def test_count_tokens_recovery(self):
+        """Test that error tokens are counted in recovery mode."""
+        self.handler.add_tag(Tag("A", "a"))
+        self.handler.set_recovery(True)
+        self.assertEqual(self.handler.count_tokens(b"aza"), {"A": 2, "<error>": 1})
+        self.assertEqual(len(self.handler.last_errors), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
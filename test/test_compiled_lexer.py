@@ -0,0 +1,157 @@
+"""
+Tests for compiled lexer snapshots.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.application.command_handler import CommandHandler
+from src.application.compiled_lexer import CompiledLexer
+from src.application.lexer import LexError
+from src.domain.tag import Tag
+
+DIGITS = "01+2+3+4+5+6+7+8+9+"
+
+
+def in_thread(function):
+    """Result of calling function in a new thread."""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(function).result()
+
+
+class TestCompiledLexer(unittest.TestCase):
+    """Test cases for CompiledLexer."""
+
+    def setUp(self):
+        self.snapshot = CompiledLexer([Tag("A", "a"), Tag("INT", f"{DIGITS}{DIGITS}*.")])
+
+    def test_with_tags_copies(self):
+        """Test that adding tags makes a new snapshot and leaves the old one alone."""
+        newer = self.snapshot.with_tags([Tag("B", "b")])
+        self.assertEqual([tag.name for tag in newer.tags], ["A", "INT", "B"])
+        self.assertEqual(len(self.snapshot.tags), 2)
+        self.assertEqual(newer.version, self.snapshot.version + 1)
+        self.assertEqual(newer.token_names, ("A", "INT", "B", "<error>"))
+        with self.assertRaises(ValueError):
+            self.snapshot.lexer.tokenize("ab")
+        self.assertEqual(newer.lexer.tokenize("ab"), ["A", "B"])
+        self.assertFalse(CompiledLexer())
+
+    def test_lexers_per_thread(self):
+        """Test that each thread gets its own lexers, built once."""
+        lexer = self.snapshot.lexer
+        self.assertIs(self.snapshot.lexer, lexer)
+        self.assertIsNot(in_thread(lambda: self.snapshot.lexer), lexer)
+        self.assertIsNot(in_thread(lambda: self.snapshot.byte_lexer), self.snapshot.byte_lexer)
+
+    def test_lexer_for(self):
+        """Test byte mode for ASCII tags and decoding otherwise."""
+        lexer, text = self.snapshot.lexer_for(b"a12")
+        self.assertIs(lexer, self.snapshot.byte_lexer)
+        self.assertEqual(text, b"a12")
+
+        accented = CompiledLexer([Tag("E", "é"), Tag("A", "a")])
+        self.assertIsNone(accented.byte_lexer)
+        lexer, text = accented.lexer_for(b"a")
+        self.assertIs(lexer, accented.lexer)
+        self.assertEqual(text, "a")
+        self.assertEqual(accented.lexer_for("é".encode())[1], "é")
+
+    def test_tokenize_to_text(self):
+        """Test text output with located errors in recovery mode."""
+        self.assertEqual(self.snapshot.tokenize_to_text("a12a"), ("A INT A", []))
+        output, errors = self.snapshot.tokenize_to_text("a\nb", recover=True)
+        self.assertEqual(output, "A <error>")
+        self.assertEqual(errors, [LexError(1, "\nb")])
+        self.assertEqual((errors[0].line, errors[0].column), (1, 2))
+
+    def test_iter_text(self):
+        """Test that text chunks concatenate to the whole output."""
+        self.snapshot.TEXT_CHUNK_TOKENS = 2
+        text = "a12a" * 3 + "a"
+        chunks = list(self.snapshot.iter_text(text))
+        self.assertEqual(chunks[:2], ["A INT", " A A"])
+        self.assertEqual("".join(chunks), self.snapshot.tokenize_to_text(text)[0])
+        self.assertEqual(list(self.snapshot.iter_text("")), [])
+
+        errors = []
+        self.assertEqual(list(self.snapshot.iter_text("a?", errors)), ["A <error>"])
+        self.assertEqual(errors, [LexError(1, "?")])
+
+
+class TestCommandHandlerSnapshots(unittest.TestCase):
+    """Test cases for the snapshots published by CommandHandler."""
+
+    def setUp(self):
+        self.handler = CommandHandler()
+        self.handler.add_tag(Tag("A", "a"))
+
+    def test_snapshot_replaced_on_change(self):
+        """Test that changing the tags publishes a new snapshot."""
+        before = self.handler.snapshot
+        self.handler.add_tag(Tag("B", "b"))
+        after = self.handler.snapshot
+        self.assertIsNot(before, after)
+        self.assertEqual(after.version, before.version + 1)
+        self.assertEqual(self.handler.tag_version, after.version)
+        self.assertEqual([tag.name for tag in before.tags], ["A"])
+
+        # A duplicate changes nothing
+        self.assertFalse(self.handler.add_tag(Tag("B", "a")))
+        self.assertIs(self.handler.snapshot, after)
+
+    def test_tags_are_a_copy(self):
+        """Test that the tag list cannot modify the published snapshot."""
+        self.handler.tags.append(Tag("B", "b"))
+        self.assertEqual(len(self.handler.tags), 1)
+
+    def test_concurrent_tokenization_while_loading(self):
+        """Test threads tokenizing while tags are added, each with a consistent tag set."""
+        letters = "bcdefghij"
+        text = "a" + letters
+        stop = threading.Event()
+        outputs: set[str] = set()
+
+        def tokenize():
+            handler = self.handler
+            while not stop.is_set():
+                snapshot = handler.snapshot
+                output, _ = snapshot.tokenize_to_text(text, recover=True)
+                known = len(snapshot.tags) - 1
+                expected = " ".join(["A", *(char.upper() for char in letters[:known])])
+                if known < len(letters):
+                    expected += " <error>"
+                self.assertEqual(output, expected)
+                outputs.add(output)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(tokenize) for _ in range(4)]
+            for char in letters:
+                self.handler.add_tag(Tag(char.upper(), char))
+                stop.wait(0.005)
+            stop.set()
+            for future in futures:
+                future.result()
+
+        self.assertEqual(self.handler.process_input(text), " ".join(text.upper()))
+        self.assertGreater(len(outputs), 1)
+
+    def test_shared_tag_built_once(self):
+        """Test that threads racing to build a tag's simulator get the same one."""
+        tag = Tag("INT", f"{DIGITS}{DIGITS}*.")
+        barrier = threading.Barrier(8)
+
+        def build():
+            barrier.wait()
+            return tag.simulator()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            simulators = list(pool.map(lambda _: build(), range(8)))
+        self.assertTrue(all(simulator is simulators[0] for simulator in simulators))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests for the Brzozowski-derivative matcher.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import unittest
+
+from src.domain import regex_ast
+from src.domain.derivatives import DerivativeMatcher, derive
+from src.domain.regex_ast import EMPTY, EPSILON
+from src.domain.regex_parser import RegexParser
+
+
+class TestDerivativeMatcher(unittest.TestCase):
+    """Test cases for DerivativeMatcher."""
+
+    def test_derive(self):
+        """Test single derivatives."""
+        node = RegexParser().parse("ab.")
+        self.assertIs(derive(node, "a"), regex_ast.char("b"))
+        self.assertIs(derive(node, "b"), EMPTY)
+        self.assertIs(derive(regex_ast.char("."), "x"), EPSILON)
+
+    def test_agrees_with_nfa(self):
+        """Test that derivative matching agrees with the Thompson NFA."""
+        parser = RegexParser()
+        digits = "01+2+3+4+5+6+7+8+9+"
+        expressions = [
+            "",
+            "\\l",
+            "a",
+            "ab+",
+            "ab.",
+            "a*",
+            "ab.ba.+*",
+            "bc+a.*",
+            "a*b*.*",
+            "\\.a.",
+            f"{digits}{digits}*.",
+        ]
+        inputs = ["", "a", "b", "ab", "ba", "abba", "aab", "ac", "1000", "12a", "xa", "éa"]
+        for expr in expressions:
+            automaton = parser.build_automaton(expr)
+            matcher = DerivativeMatcher.from_expression(expr)
+            for text in inputs:
+                for start in range(len(text) + 1):
+                    with self.subTest(expr=expr, text=text, start=start):
+                        self.assertEqual(matcher.match(text, start), automaton.match(text, start))
+
+    def test_character_class_memoization(self):
+        """Test that symbols outside the expression share one transition."""
+        matcher = DerivativeMatcher.from_expression("ab.*")
+        matcher.match("xyz", 0)
+        matcher.match("qrs", 0)
+        self.assertEqual(matcher.state_count, 1)
+        self.assertEqual(len(matcher._transitions[matcher.start]), 1)
+
+    def test_states_are_finite(self):
+        """Test that repeated derivatives converge to a few interned states."""
+        matcher = DerivativeMatcher.from_expression("ab+*a.ab+.ab+.")
+        matcher.match("ab" * 200, 0)
+        self.assertLessEqual(matcher.state_count, 16)
+
+    def test_long_nullable_chain(self):
+        """Test deriving a concatenation chain longer than the recursion limit."""
+        expr = "ab." + "a*.b*." * 600
+        matcher = DerivativeMatcher.from_expression(expr)
+        self.assertEqual(matcher.match("abbab", 0), 5)
+        self.assertIsNone(matcher.match("ba", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
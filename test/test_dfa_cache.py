@@ -0,0 +1,112 @@
+"""
+Tests for the lazily determinized, bounded DFA cache.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import random
+import unittest
+
+from src.application.lexer import LexicalAnalyzer
+from src.domain.dfa_cache import DFACacheStats, LazyDFA
+from src.domain.regex_parser import RegexParser
+from src.domain.tag import Tag
+
+
+class TestLazyDFA(unittest.TestCase):
+    """Test cases for LazyDFA."""
+
+    def setUp(self):
+        self.parser = RegexParser()
+
+    def dfa(self, expr, max_states=LazyDFA.DEFAULT_MAX_STATES):
+        return LazyDFA(self.parser.build_automaton(expr).bit_parallel(), max_states)
+
+    def test_matches_nfa(self):
+        """Test that the cached DFA agrees with the NFA, across repeated matches."""
+        expressions = ["ab+*a.", "ab.ba.+*", "\\.a.*b.", "a*b*.", "\\l", ""]
+        rng = random.Random(36)
+        for expr in expressions:
+            dfa = self.dfa(expr)
+            for _ in range(200):
+                text = "".join(rng.choice("abx") for _ in range(rng.randint(0, 12)))
+                with self.subTest(expr=expr, text=text):
+                    self.assertEqual(dfa.match(text, 0), dfa.nfa.match(text, 0))
+
+    def test_caches_transitions(self):
+        """Test that repeated input is served from cached transitions."""
+        dfa = self.dfa("ab+*")
+        dfa.match("abab", 0)
+        first = dfa.stats
+        dfa.match("abab", 0)
+        stats = dfa.stats
+        self.assertEqual(stats.misses, first.misses)
+        self.assertEqual(stats.chars, 8)
+        self.assertEqual(stats.hits, 8 - first.misses)
+        self.assertLessEqual(stats.states, 3)
+
+    def test_flush_when_full(self):
+        """Test that a full cache is flushed and keeps matching correctly."""
+        dfa = self.dfa("ab+*a.ab+.ab+.ab+.", max_states=4)
+        dfa.THRASH_CHARS = 0
+        rng = random.Random(7)
+        for _ in range(50):
+            text = "".join(rng.choice("ab") for _ in range(20))
+            self.assertEqual(dfa.match(text, 0), dfa.nfa.match(text, 0))
+        stats = dfa.stats
+        self.assertGreater(stats.flushes, 0)
+        self.assertLessEqual(stats.states, 4)
+        self.assertFalse(dfa.fallback)
+
+    def test_fallback_on_thrashing(self):
+        """Test that an exponential DFA falls back to NFA simulation."""
+        expr = "ab+*a." + "ab+." * 12
+        dfa = self.dfa(expr, max_states=64)
+        rng = random.Random(3)
+        text = "".join(rng.choice("ab") for _ in range(2000))
+        self.assertEqual(dfa.match(text, 0), dfa.nfa.match(text, 0))
+        self.assertTrue(dfa.fallback)
+        self.assertEqual(dfa.stats.fallbacks, 1)
+        self.assertEqual(dfa.stats.states, 0)
+        self.assertEqual(dfa.match(text, 5), dfa.nfa.match(text, 5))
+
+    def test_invalid_budget(self):
+        """Test that the state budget must be positive."""
+        with self.assertRaises(ValueError):
+            self.dfa("a", max_states=0)
+
+
+class TestLexerDFACache(unittest.TestCase):
+    """Test cases for the DFA caches of LexicalAnalyzer."""
+
+    def test_same_tokens_with_and_without_cache(self):
+        """Test that the cache budget never changes tokenization."""
+        digits = "01+2+3+4+5+6+7+8+9+"
+        tags = [
+            Tag("ID", f"ab+c+ab+c+{digits}+*."),
+            Tag("INT", f"{digits}{digits}*."),
+            Tag("HOSTILE", "ab+*a." + "ab+." * 10 + "c."),
+            Tag("SPACE", " "),
+        ]
+        rng = random.Random(36)
+        text = " ".join(
+            "".join(rng.choice("abc01") for _ in range(rng.randint(1, 30))) for _ in range(300)
+        )
+        expected = LexicalAnalyzer(tags, max_dfa_states=None).tokenize(text)
+        for budget in (1, 16, LazyDFA.DEFAULT_MAX_STATES):
+            with self.subTest(budget=budget):
+                lexer = LexicalAnalyzer(tags, max_dfa_states=budget)
+                self.assertEqual(lexer.tokenize(text), expected)
+
+    def test_stats(self):
+        """Test that the lexer sums the counters of its caches."""
+        lexer = LexicalAnalyzer([Tag("A", "a*b."), Tag("B", "b")])
+        lexer.tokenize("aabbab")
+        stats = lexer.dfa_stats()
+        self.assertIsInstance(stats, DFACacheStats)
+        self.assertGreater(stats.chars, 0)
+        self.assertEqual(LexicalAnalyzer([Tag("A", "a")], max_dfa_states=None).dfa_stats().chars, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
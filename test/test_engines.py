@@ -0,0 +1,120 @@
+"""
+Tests for the engine registry and the differential harness.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import random
+import unittest
+
+from src.application.differential import random_expression, run_differential
+from src.application.lexer import LexicalAnalyzer
+from src.domain import engines
+from src.domain.derivatives import DerivativeMatcher
+from src.domain.engines import Engine, engine_names, get_engine, register_engine
+from src.domain.regex_parser import RegexParser
+from src.domain.tag import CompiledExpression, Tag
+
+DIGITS = "01+2+3+4+5+6+7+8+9+"
+
+
+class TestEngineRegistry(unittest.TestCase):
+    """Test cases for engine selection."""
+
+    def test_registered_engines(self):
+        """Test the built-in engines and unknown names."""
+        self.assertEqual(engine_names(), ("nfa", "bitparallel", "dfa", "derivative", "glushkov"))
+        self.assertFalse(get_engine("nfa").masks)
+        self.assertTrue(get_engine("dfa").masks)
+        with self.assertRaisesRegex(ValueError, "Unknown engine: re"):
+            get_engine("re")
+        with self.assertRaises(ValueError):
+            Tag("A", "a", engine="re")
+        with self.assertRaises(ValueError):
+            LexicalAnalyzer([Tag("A", "a")], engine="re")
+
+    def test_tag_engine(self):
+        """Test that Tag.match runs the selected engine."""
+        expression = f"{DIGITS}{DIGITS}*."
+        for name in engine_names():
+            tag = Tag("INT", expression, engine=name)
+            with self.subTest(engine=name):
+                self.assertEqual(tag.match("x1037y", 1), 5)
+                self.assertIsNone(tag.match("x1037y", 0))
+        tag = Tag("INT", expression, engine="derivative")
+        self.assertIsInstance(tag.matcher(), DerivativeMatcher)
+        # Matching from the syntax tree builds no automaton
+        self.assertEqual(tag.match("1037", 0), 4)
+        self.assertFalse(tag.is_compiled)
+
+    def test_tag_compiled_elsewhere(self):
+        """Test that tree-based engines parse again when only automata were shipped."""
+        compiled = CompiledExpression.from_compact(
+            CompiledExpression.compile("ab.c+*").to_compact()
+        )
+        tag = Tag("T", "ab.c+*", compiled=compiled, engine="derivative")
+        self.assertEqual(tag.match("abcab", 0), 5)
+        self.assertIs(tag.residual_syntax(), tag.syntax())
+
+    def test_lexer_engine(self):
+        """Test that every engine tokenizes alike, and linear_time needs state masks."""
+        tags = [
+            Tag("IF", "if."),
+            Tag("ID", f"fi+fi+{DIGITS}+*."),
+            Tag("INT", f"{DIGITS}{DIGITS}*."),
+            Tag("SPACE", " "),
+        ]
+        text = "if iff f1 42 fi"
+        expected = LexicalAnalyzer(tags).tokenize(text)
+        for name in engine_names():
+            with self.subTest(engine=name):
+                self.assertEqual(LexicalAnalyzer(tags, engine=name).tokenize(text), expected)
+        self.assertEqual(
+            LexicalAnalyzer(tags, engine="glushkov", linear_time=True).tokenize(text), expected
+        )
+        with self.assertRaisesRegex(ValueError, "linear_time"):
+            LexicalAnalyzer(tags, engine="derivative", linear_time=True)
+
+
+class TestDifferential(unittest.TestCase):
+    """Test cases for the differential harness."""
+
+    def test_random_expression(self):
+        """Test that random expressions are valid and reproducible."""
+        rng = random.Random(1)
+        expressions = [random_expression(rng, "ab", size) for size in range(1, 40)]
+        for expression in expressions:
+            RegexParser().parse(expression)
+        rng = random.Random(1)
+        self.assertEqual(expressions, [random_expression(rng, "ab", size) for size in range(1, 40)])
+
+    def test_engines_agree(self):
+        """Test that every registered engine agrees on random cases."""
+        report = run_differential(cases=150, seed=43)
+        self.assertEqual(report.cases, 150)
+        self.assertEqual(report.mismatches, [])
+        self.assertEqual(set(report.timings), set(engine_names()))
+        self.assertTrue(all(seconds > 0 for seconds in report.timings.values()))
+
+    def test_detects_disagreement(self):
+        """Test that an engine matching one character short is reported."""
+
+        class Short:
+            def __init__(self, matcher):
+                self.matcher = matcher
+
+            def match(self, text, start_pos=0):
+                end = self.matcher.match(text, start_pos)
+                return end - 1 if end and end > start_pos else end
+
+        register_engine(
+            Engine("short", lambda source, max_states: Short(source.automaton()), False)
+        )
+        self.addCleanup(engines._ENGINES.pop, "short")
+        report = run_differential(cases=50, seed=43, engines=["nfa", "short"])
+        self.assertTrue(report.mismatches)
+        self.assertEqual({mismatch.engine for mismatch in report.mismatches}, {"short"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the Glushkov position automaton construction.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import unittest
+
+from src.domain.regex_parser import RegexParser
+from src.domain.tag import Tag
+
+
+class TestGlushkovBuilder(unittest.TestCase):
+    """Test cases for GlushkovBuilder."""
+
+    def setUp(self):
+        self.thompson = RegexParser()
+        self.glushkov = RegexParser(RegexParser.GLUSHKOV)
+
+    def test_one_state_per_symbol(self):
+        """Test that the automaton has an initial state plus one per occurrence."""
+        automaton = self.glushkov.build_automaton("ab.ba.+*")
+        self.assertEqual(len(automaton.states), 5)
+
+    def test_epsilon_free(self):
+        """Test that no epsilon transitions are emitted."""
+        digits = "01+2+3+4+5+6+7+8+9+"
+        automaton = self.glushkov.build_automaton(f"{digits}{digits}*.")
+        self.assertTrue(all(not state.epsilon_transitions for state in automaton.states))
+
+    def test_same_language_as_thompson(self):
+        """Test that both constructions accept the same prefixes."""
+        digits = "01+2+3+4+5+6+7+8+9+"
+        expressions = [
+            "a",
+            "ab+",
+            "ab.",
+            "a*",
+            "a**",
+            "ab.ba.+*",
+            "bc+a.*",
+            "\\la.",
+            "a\\l+b.",
+            "a*b*.*",
+            f"{digits}{digits}*.",
+            "\\\\\\.+",
+        ]
+        inputs = ["", "a", "b", "ab", "ba", "abba", "aab", "ac", "1000", "12a", "\\x", "b"]
+        for expr in expressions:
+            expected = self.thompson.build_automaton(expr)
+            actual = self.glushkov.build_automaton(expr)
+            for text in inputs:
+                with self.subTest(expr=expr, text=text):
+                    self.assertEqual(actual.match(text, 0), expected.match(text, 0))
+                    self.assertEqual(actual.bit_parallel().match(text, 0), expected.match(text, 0))
+
+    def test_lambda_and_empty_language(self):
+        """Test lambda and empty-language expressions."""
+        self.assertEqual(self.glushkov.build_automaton("\\l").match("a", 0), 0)
+        self.assertIsNone(self.glushkov.build_automaton("").match("", 0))
+
+    def test_invalid_expression(self):
+        """Test that operand errors are reported as for Thompson."""
+        with self.assertRaises(ValueError):
+            self.glushkov.build_automaton("a+")
+
+    def test_tag_construction_flag(self):
+        """Test selecting the construction on a Tag."""
+        tag = Tag("VAR", "ab.ba.+*", construction=RegexParser.GLUSHKOV)
+        self.assertEqual(tag.match("abba", 0), 4)
+        self.assertEqual(len(tag.automaton.states), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
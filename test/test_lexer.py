@@ -6,7 +6,7 @@ Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 
 import unittest
 
-from src.application.lexer import LexicalAnalyzer
+from src.application.lexer import LexError, LexicalAnalyzer
 from src.domain.tag import Tag
 
 
@@ -105,6 +105,174 @@ class TestLexicalAnalyzer(unittest.TestCase):
             len(overlaps), 0
         )  # May or may not detect depending on implementation
 
+    def test_dispatch_candidates(self):
+        """Test that only tags able to start with a character are candidates."""
+        any_tag = Tag("ANY", "\\.")
+        tags = [self.var_tag, self.int_tag, self.space_tag, self.equals_tag, any_tag]
+        lexer = LexicalAnalyzer(tags)
+        self.assertEqual(lexer.candidates("a"), (self.var_tag, any_tag))
+        self.assertEqual(lexer.candidates("7"), (self.int_tag, any_tag))
+        self.assertEqual(lexer.candidates("="), (self.equals_tag, any_tag))
+        self.assertEqual(lexer.candidates("x"), (any_tag,))
+
+    def test_dispatch_preserves_priority(self):
+        """Test that dispatching keeps longest match and definition order."""
+        tags = [Tag("A", "a"), Tag("AB", "ab."), Tag("ANY", "\\."), Tag("A2", "a")]
+        lexer = LexicalAnalyzer(tags)
+        self.assertEqual(lexer.tokenize("abaxa"), ["AB", "A", "ANY", "A"])
+
+    def test_literal_and_regular_tags(self):
+        """Test that trie-matched literals combine with automaton tags by priority."""
+        keyword = Tag("IF", "if.")
+        ident = Tag("ID", "fi+fi+*.")
+        operators = Tag("OP", "==.=+")
+        space = Tag("SPACE", " ")
+        lexer = LexicalAnalyzer([keyword, ident, operators, space])
+        self.assertEqual(
+            lexer.tokenize("if iff == f"), ["IF", "SPACE", "ID", "SPACE", "OP", "SPACE", "ID"]
+        )
+        # Same tags with the identifier first: it wins the tie on "if"
+        lexer = LexicalAnalyzer([ident, keyword, operators, space])
+        self.assertEqual(lexer.tokenize("if="), ["ID", "OP"])
+
+    def test_matches_reference_tokenization(self):
+        """Test the optimized lexer against trying every tag's automaton."""
+        tags = [
+            Tag("KW", "if.in.+"),
+            Tag("MIX", "ab.a*+"),
+            Tag("ID", "abfin++++abfin++++*."),
+            Tag("ANY", "\\."),
+            Tag("SP", " "),
+        ]
+        lexer = LexicalAnalyzer(tags)
+        for text in ["if in ifa", "aab ab b", "x fin", "abab a", "in.if"]:
+            expected = []
+            pos = 0
+            while pos < len(text):
+                best = None
+                for tag in tags:
+                    end_pos = tag.automaton.match(text, pos)
+                    if end_pos is not None and (best is None or end_pos > best[1]):
+                        best = (tag, end_pos)
+                expected.append(best[0].name)
+                pos = best[1]
+            with self.subTest(text=text):
+                self.assertEqual(lexer.tokenize(text), expected)
+
+    def test_recovery_mode(self):
+        """Test that untokenizable runs become error tokens and scanning resumes."""
+        tags = [self.var_tag, self.space_tag, self.equals_tag, self.int_tag]
+        lexer = LexicalAnalyzer(tags)
+        tokens, errors = lexer.tokenize_with_recovery("ab = xyz 10 ?")
+        self.assertEqual(
+            tokens,
+            ["VAR", "SPACE", "EQUALS", "SPACE", "<error>", "SPACE", "INT", "SPACE", "<error>"],
+        )
+        self.assertEqual(errors, [LexError(5, "xyz"), LexError(12, "?")])
+
+    def test_recovery_mode_clean_input(self):
+        """Test that recovery mode matches tokenize on valid input."""
+        tags = [self.var_tag, self.space_tag, self.equals_tag, self.int_tag]
+        lexer = LexicalAnalyzer(tags)
+        tokens, errors = lexer.tokenize_with_recovery("ab = 1000")
+        self.assertEqual(tokens, lexer.tokenize("ab = 1000"))
+        self.assertEqual(errors, [])
+
+    def test_nullable_tag_cannot_advance(self):
+        """Test the error raised when only the empty prefix matches."""
+        lexer = LexicalAnalyzer([Tag("VAR", "a*")])
+        with self.assertRaisesRegex(ValueError, "Cannot advance past position 1"):
+            lexer.tokenize("ab")
+
+    def test_error_locations(self):
+        """Test that errors carry their line and column once located."""
+        lexer = LexicalAnalyzer([Tag("VAR", "ab.ba.+"), Tag("NL", "\\n"), self.equals_tag])
+        with self.assertRaisesRegex(ValueError, r"position 4: 'x' \(line 2, column 2\)"):
+            lexer.tokenize("ab\n=x")
+
+        text = "ab\n=x\nbax"
+        _, errors = lexer.tokenize_with_recovery(text)
+        located = lexer.locate_errors(text, errors)
+        self.assertEqual(located, errors)
+        self.assertEqual([(e.line, e.column) for e in located], [(2, 2), (3, 3)])
+        self.assertEqual(str(located[1]), "position 8: 'x' (line 3, column 3)")
+        self.assertEqual(str(errors[1]), "position 8: 'x'")
+
+    def test_token_locations(self):
+        """Test token spans with the line and column where each token starts."""
+        lexer = LexicalAnalyzer([Tag("VAR", "ab.ba.+"), Tag("NL", "\\n"), self.equals_tag])
+        locations = list(lexer.iter_token_locations("ab\n=ba"))
+        self.assertEqual(
+            locations, [(0, 0, 2, 1, 1), (1, 2, 3, 1, 3), (2, 3, 4, 2, 1), (0, 4, 6, 2, 2)]
+        )
+
+    def test_token_spans_from_boundary(self):
+        """Test that a scan from a token boundary yields the rest of a full scan."""
+        lexer = LexicalAnalyzer([self.var_tag, self.space_tag, self.equals_tag, self.int_tag])
+        text = "ab = 10 ba ? 7"
+        errors = []
+        spans = list(lexer.iter_token_spans(text, errors))
+        for i, (_, _, end) in enumerate(spans):
+            with self.subTest(end=end):
+                self.assertEqual(list(lexer.iter_token_spans(text, [], end)), spans[i + 1 :])
+
+    def test_count_tokens(self):
+        """Test counting tokens per id without storing them."""
+        tags = [self.var_tag, self.space_tag, self.equals_tag, self.int_tag]
+        lexer = LexicalAnalyzer(tags)
+        text = "ab = 10 ba = 7"
+        counts = lexer.count_tokens(text)
+        expected = [lexer.tokenize(text).count(name) for name in lexer.token_names]
+        self.assertEqual(counts, expected)
+
+        errors = []
+        self.assertEqual(lexer.count_tokens("ab ? 1", errors), [1, 2, 0, 1, 1])
+        self.assertEqual(errors, [LexError(3, "?")])
+
+    def test_histograms(self):
+        """Test per-line and per-window token histograms."""
+        lexer = LexicalAnalyzer([Tag("A", "a"), Tag("B", "b"), Tag("NL", "\\n")])
+        text = "ab\n\naa\nb"
+        self.assertEqual(
+            list(lexer.iter_histograms(text)),
+            [(1, [1, 1, 1, 0]), (2, [0, 0, 1, 0]), (3, [2, 0, 1, 0]), (4, [0, 1, 0, 0])],
+        )
+        self.assertEqual(
+            list(lexer.iter_histograms(text, window=3)),
+            [(0, [1, 1, 1, 0]), (1, [2, 0, 1, 0]), (2, [0, 1, 1, 0])],
+        )
+        # Windows past the last token start are still reported
+        self.assertEqual(
+            list(LexicalAnalyzer([Tag("AS", "aa*.")]).iter_histograms("aaaaa", window=2)),
+            [(0, [1, 0]), (1, [0, 0]), (2, [0, 0])],
+        )
+        self.assertEqual(list(lexer.iter_histograms("")), [])
+        with self.assertRaises(ValueError):
+            list(lexer.iter_histograms(text, window=0))
+
+    def test_skip_tags(self):
+        """Test that skip tags take part in longest match but are not emitted."""
+        space = Tag("SPACE", "  *.", skip=True)
+        lexer = LexicalAnalyzer([self.var_tag, self.equals_tag, Tag("ANY", "\\."), space])
+        # Two spaces are skipped, being longer than ANY; one space ties and ANY was defined first
+        self.assertEqual(lexer.tokenize("ab  = ba"), ["VAR", "EQUALS", "ANY", "VAR"])
+        self.assertEqual(list(lexer.iter_token_spans("ab  =")), [(0, 0, 2), (1, 4, 5)])
+        self.assertEqual(lexer.count_tokens("  ab  ab  "), [2, 0, 0, 0, 0])
+        tokens, errors = lexer.tokenize_with_recovery("  =")
+        self.assertEqual((tokens, errors), (["EQUALS"], []))
+
+    def test_matchers_built_on_first_use(self):
+        """Test that a tag's matcher is built by the first scan and then called directly."""
+        lexer = LexicalAnalyzer([self.var_tag, self.int_tag], linear_time=True)
+        self.assertFalse(self.var_tag.is_compiled)
+        self.assertEqual(lexer.dfa_caches(), {})
+
+        self.assertEqual(lexer.tokenize("ab12"), ["VAR", "INT"])
+        cache = lexer.dfa_caches()[0]
+        self.assertEqual(lexer._matchers[0].match, cache.match)
+        self.assertEqual(lexer._matchers[0].step, cache.step)
+        self.assertEqual(lexer._matchers[1].start_mask, lexer.dfa_caches()[1].start_mask)
+
 
 if __name__ == "__main__":
     unittest.main()
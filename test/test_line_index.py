@@ -0,0 +1,56 @@
+"""
+Tests for the line index.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import random
+import unittest
+
+from src.application.line_index import LineIndex
+
+
+class TestLineIndex(unittest.TestCase):
+    """Test cases for LineIndex."""
+
+    def test_locations(self):
+        """Test lines and columns around line breaks."""
+        index = LineIndex("ab\n\ncd\n")
+        self.assertEqual(index.location(0), (1, 1))
+        self.assertEqual(index.location(2), (1, 3))
+        self.assertEqual(index.location(3), (2, 1))
+        self.assertEqual(index.location(4), (3, 1))
+        self.assertEqual(index.location(6), (3, 3))
+        self.assertEqual(index.location(7), (4, 1))
+        self.assertEqual(index.line_count, 4)
+        self.assertEqual(index.describe(5), "line 3, column 2")
+
+    def test_matches_counting(self):
+        """Test against counting line breaks before each offset."""
+        rng = random.Random(44)
+        text = "".join(rng.choice("ab\n") for _ in range(500))
+        index = LineIndex(text)
+        for offset in range(len(text) + 1):
+            line = text.count("\n", 0, offset) + 1
+            column = offset - (text.rfind("\n", 0, offset) + 1) + 1
+            self.assertEqual(index.location(offset), (line, column))
+
+    def test_bytes_like(self):
+        """Test bytes, bytearray and memoryview input."""
+        for data in (b"a\nbc", bytearray(b"a\nbc"), memoryview(b"a\nbc")):
+            with self.subTest(kind=type(data).__name__):
+                self.assertEqual(LineIndex(data).location(3), (2, 2))
+
+    def test_out_of_range(self):
+        """Test offsets outside the input."""
+        index = LineIndex("ab")
+        self.assertEqual(index.location(2), (1, 3))
+        with self.assertRaises(ValueError):
+            index.location(3)
+        with self.assertRaises(ValueError):
+            index.location(-1)
+        self.assertEqual(LineIndex("").location(0), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Tests for the literal trie.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import unittest
+
+from src.domain.literal_trie import LiteralTrie
+
+
+class TestLiteralTrie(unittest.TestCase):
+    """Test cases for LiteralTrie."""
+
+    def setUp(self):
+        self.trie = LiteralTrie()
+        self.trie.add("if", 2)
+        self.trie.add("ifdef", 1)
+        self.trie.add("=", 3)
+        self.trie.add("==", 0)
+
+    def test_longest_match(self):
+        """Test that the longest word wins."""
+        self.assertEqual(self.trie.longest_match("ifdef x", 0), (1, 5))
+        self.assertEqual(self.trie.longest_match("ifde", 0), (2, 2))
+        self.assertEqual(self.trie.longest_match("a==b", 1), (0, 3))
+
+    def test_no_match(self):
+        """Test positions where no word starts."""
+        self.assertIsNone(self.trie.longest_match("xif", 0))
+        self.assertIsNone(self.trie.longest_match("i", 0))
+
+    def test_lowest_priority_kept(self):
+        """Test that a word defined by several tags keeps the earliest one."""
+        self.trie.add("if", 5)
+        self.trie.add("=", 1)
+        self.assertEqual(self.trie.longest_match("if", 0), (2, 2))
+        self.assertEqual(self.trie.longest_match("=", 0), (1, 1))
+        self.assertEqual(self.trie.word_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Tests for memoized maximal-munch tokenization.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import random
+import unittest
+
+from src.application.lexer import LexicalAnalyzer
+from src.domain.maximal_munch import match_memoized
+from src.domain.regex_parser import RegexParser
+from src.domain.tag import Tag
+
+
+class CountingMatcher:
+    """Wraps a matcher and counts its steps."""
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.start_mask = matcher.start_mask
+        self.final_mask = matcher.final_mask
+        self.steps = 0
+
+    def step(self, mask, symbol):
+        self.steps += 1
+        return self.matcher.step(mask, symbol)
+
+
+class TestMatchMemoized(unittest.TestCase):
+    """Test cases for match_memoized."""
+
+    def test_same_result_as_match(self):
+        """Test that memoized scans return the plain longest match."""
+        rng = random.Random(37)
+        for expr in ["a*b.", "ab.*a.", "ab+*c.", "\\.b.*", "a*"]:
+            simulator = RegexParser().build_automaton(expr).bit_parallel()
+            text = "".join(rng.choice("abc") for _ in range(300))
+            failed: set[tuple[int, int]] = set()
+            for start in range(len(text)):
+                with self.subTest(expr=expr, start=start):
+                    expected = simulator.match(text, start)
+                    self.assertEqual(match_memoized(simulator, text, start, failed), expected)
+
+    def test_linear_steps(self):
+        """Test that rescanning a failing suffix is cut short by the memo."""
+        simulator = RegexParser().build_automaton("a*b.").bit_parallel()
+        text = "a" * 2000
+        counting = CountingMatcher(simulator)
+        failed: set[tuple[int, int]] = set()
+        for start in range(len(text)):
+            self.assertIsNone(match_memoized(counting, text, start, failed))
+        self.assertLessEqual(counting.steps, 2 * len(text))
+
+
+class TestLinearTimeLexer(unittest.TestCase):
+    """Test cases for LexicalAnalyzer(linear_time=True)."""
+
+    def test_same_tokens(self):
+        """Test that the memoized lexer returns identical tokens and errors."""
+        digits = "01+2+3+4+5+6+7+8+9+"
+        tags = [
+            Tag("AB", "a*b."),
+            Tag("A", "a"),
+            Tag("INT", f"{digits}{digits}*."),
+            Tag("ID", f"ab+ab+{digits}+*."),
+            Tag("SPACE", " "),
+        ]
+        plain = LexicalAnalyzer(tags)
+        linear = LexicalAnalyzer(tags, linear_time=True)
+        rng = random.Random(37)
+        for _ in range(100):
+            text = "".join(rng.choice("aab01 ") for _ in range(rng.randint(0, 80)))
+            with self.subTest(text=text):
+                self.assertEqual(linear.tokenize(text), plain.tokenize(text))
+            text += rng.choice(["?", ""]) + text
+            with self.subTest(text=text):
+                self.assertEqual(
+                    linear.tokenize_with_recovery(text), plain.tokenize_with_recovery(text)
+                )
+
+    def test_pathological_input(self):
+        """Test the quadratic case of the plain scan."""
+        lexer = LexicalAnalyzer([Tag("AB", "a*b."), Tag("A", "a")], linear_time=True)
+        self.assertEqual(lexer.tokenize("a" * 5000), ["A"] * 5000)
+        self.assertEqual(lexer.tokenize("a" * 50 + "b"), ["AB"])
+
+
+if __name__ == "__main__":
+    unittest.main()
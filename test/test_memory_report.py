@@ -0,0 +1,140 @@
+"""
+Tests for memory footprint reports.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import io
+import sys
+import tracemalloc
+import unittest
+from contextlib import redirect_stdout
+
+from src.application.compiled_lexer import CompiledLexer
+from src.application.memory_report import deep_size, measure, trace_compile
+from src.application.result_cache import ResultCache
+from src.domain.tag import Tag
+from src.infrastructure.cli import CLI
+
+DIGITS = "01+2+3+4+5+6+7+8+9+"
+
+
+class TestDeepSize(unittest.TestCase):
+    """Test cases for deep_size."""
+
+    def test_nested_and_shared(self):
+        """Test that referenced objects are counted, and shared ones once."""
+        inner = [f"item {i}" for i in range(10)]
+        outer = {"a": inner, "b": inner}
+        self.assertGreater(deep_size(outer), sys.getsizeof(outer) + sys.getsizeof(inner))
+        self.assertEqual(deep_size(outer), deep_size(outer, set()))
+
+        seen: set[int] = set()
+        first = deep_size(inner, seen)
+        self.assertEqual(deep_size(outer, seen), deep_size(outer) - first)
+        self.assertEqual(deep_size(outer, seen), 0)
+
+    def test_instances(self):
+        """Test that instance attributes count and classes do not."""
+        tag = Tag("A", "ab+*")
+        tag.warm()
+        self.assertGreater(deep_size(tag), deep_size(tag.compiled) + deep_size(tag.simulator()))
+        self.assertEqual(deep_size(Tag), 0)
+
+
+class TestMeasure(unittest.TestCase):
+    """Test cases for measure and trace_compile."""
+
+    def setUp(self):
+        self.tags = [Tag("IF", "if."), Tag("INT", f"{DIGITS}{DIGITS}*."), Tag("ID", "fi+*")]
+        self.snapshot = CompiledLexer(self.tags)
+
+    def test_tag_counts(self):
+        """Test states, transitions and ε-edges of each tag's automaton."""
+        report = measure(self.snapshot)
+        self.assertEqual([tag.name for tag in report.tags], ["IF", "INT", "ID"])
+        for memory, tag in zip(report.tags, self.tags, strict=True):
+            edges = list(tag.automaton.iter_transitions())
+            with self.subTest(tag=tag.name):
+                self.assertEqual(memory.states, len(tag.automaton.states))
+                self.assertEqual(memory.epsilon_edges, sum(s is None for _, s, _ in edges))
+                self.assertEqual(memory.transitions + memory.epsilon_edges, len(edges))
+                self.assertGreater(memory.automaton_bytes, 0)
+                self.assertIsNone(memory.compile_peak)
+        self.assertEqual(report.states, sum(tag.states for tag in report.tags))
+
+    def test_dfa_caches_and_lexers(self):
+        """Test that DFA caches and lexers count once they are built."""
+        report = measure(self.snapshot)
+        self.assertEqual((report.dfa_bytes, report.lexer_bytes), (0, 0))
+
+        self.snapshot.lexer.tokenize("if12fif")
+        report = measure(self.snapshot)
+        self.assertGreater(report.tags[1].dfa_states, 0)
+        self.assertGreater(report.tags[1].dfa_bytes, 0)
+        self.assertGreater(report.lexer_bytes, 0)
+        self.assertEqual(
+            report.total_bytes, report.automaton_bytes + report.dfa_bytes + report.lexer_bytes
+        )
+
+        selected = measure(self.snapshot, [self.tags[1]])
+        self.assertEqual([tag.name for tag in selected.tags], ["INT"])
+        self.assertEqual(selected.lexer_bytes, 0)
+
+    def test_trace_compile(self):
+        """Test the traced compile peak and that tracing stops afterwards."""
+        report = measure(self.snapshot, trace=True)
+        self.assertTrue(all(tag.compile_peak > 0 for tag in report.tags))
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreater(trace_compile(self.tags[1]), trace_compile(self.tags[0]))
+
+
+class TestCommandHandlerMemory(unittest.TestCase):
+    """Test cases for CommandHandler.memory_report and :mem."""
+
+    def setUp(self):
+        self.cli = CLI()
+        self.handler = self.cli.handler
+        self.handler.add_tag(Tag("A", "a"))
+        self.handler.add_tag(Tag("INT", f"{DIGITS}{DIGITS}*."))
+
+    def test_totals_with_result_cache(self):
+        """Test that the full report counts the result cache."""
+        self.handler.result_cache = ResultCache()
+        self.handler.process_input("a12")
+        report = self.handler.memory_report()
+        self.assertEqual(report.result_cache_bytes, self.handler.result_cache.stats.bytes)
+        self.assertGreater(report.result_cache_bytes, 0)
+        self.assertEqual(self.handler.memory_report(["INT"]).result_cache_bytes, 0)
+        with self.assertRaisesRegex(ValueError, "Unknown tag: B"):
+            self.handler.memory_report(["B"])
+
+    def test_mem_command(self):
+        """Test :mem with and without names and compile tracing."""
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.cli.process_line(":mem")
+            self.cli.process_line(":mem INT compile")
+            self.cli.process_line(":mem B")
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "[INFO] Memory footprint:")
+        self.assertTrue(lines[1].startswith("  A: 2 states, 1 transitions, 0 ε-edges, "))
+        self.assertTrue(lines[3].startswith("  Total: "))
+        self.assertTrue(lines[5].startswith("  INT: "))
+        self.assertIn("compile peak", lines[5])
+        self.assertEqual(lines[6], "[ERROR] Unknown tag: B")
+
+    def test_mem_tag_named_compile(self):
+        """Test that :mem selects a tag named compile instead of tracing."""
+        self.handler.add_tag(Tag("compile", "c"))
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.cli.process_line(":mem compile")
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith("  compile: "))
+        self.assertNotIn("compile peak", lines[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
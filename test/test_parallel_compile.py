@@ -0,0 +1,116 @@
+"""
+Tests for parallel tag compilation.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.application.command_handler import CommandHandler
+from src.application.parallel_compile import (
+    PARALLEL_THRESHOLD,
+    compile_expression,
+    compile_expressions,
+    pool_workers,
+)
+from src.domain.automaton import FiniteAutomaton
+from src.domain.regex_parser import RegexParser
+from src.domain.tag import CompiledExpression, Tag
+
+
+class TestParallelCompile(unittest.TestCase):
+    """Test cases for compile_expressions."""
+
+    def test_compact_round_trip(self):
+        """Test that a serialized automaton matches like the original."""
+        automaton = RegexParser().build_automaton("ab.ba.+*")
+        copy = FiniteAutomaton.from_compact(automaton.to_compact())
+        self.assertEqual(len(copy.states), len(automaton.states))
+        for text in ["", "ab", "abba", "aab", "baab"]:
+            self.assertEqual(copy.match(text, 0), automaton.match(text, 0))
+
+    def test_parallel_matches_serial(self):
+        """Test that pooled and in-process compilation agree."""
+        expressions = [f"{chr(97 + i % 26)}{i % 10}.*" for i in range(PARALLEL_THRESHOLD * 2)]
+        expressions.append("a+")
+        serial = compile_expressions(expressions, workers=1)
+        parallel = compile_expressions(expressions, workers=2)
+        self.assertEqual(serial.keys(), parallel.keys())
+        self.assertIsNone(parallel["a+"])
+        for expression, compiled in serial.items():
+            if compiled is None:
+                continue
+            text = expression[:2] * 3
+            expected = compiled.automaton.match(text, 0)
+            self.assertEqual(parallel[expression].automaton.match(text, 0), expected)
+
+    def test_literal_split_round_trip(self):
+        """Test that literal words and the residual automaton survive serialization."""
+        compiled = CompiledExpression.compile("ab.cd*.+e+")
+        copy = CompiledExpression.from_compact(compile_expression("ab.cd*.+e+"))
+
+        self.assertEqual(copy.literals, frozenset({"ab", "e"}))
+        self.assertEqual((copy.first_chars, copy.nullable), (compiled.first_chars, False))
+        self.assertIsNot(copy.residual, copy.automaton)
+        for text in ["ab", "cddd", "e", "x"]:
+            self.assertEqual(copy.residual.match(text, 0), compiled.residual.match(text, 0))
+
+        tag = Tag("WORD", "ab.cd*.+e+", compiled=copy)
+        self.assertIs(tag.automaton, copy.automaton)
+        self.assertEqual(tag.match("cdd", 0), 3)
+        self.assertEqual(tag.match_residual("ab", 0), None)
+
+    def test_invalid_expressions_compile_to_none(self):
+        """Test that every kind of compile failure marks the expression invalid."""
+        self.assertIsNone(compile_expression("a+"))
+        self.assertIsNone(compile_expression("ab", construction="unknown"))
+
+    def test_pool_workers(self):
+        """Test that small jobs or a single worker run without a pool."""
+        self.assertEqual(pool_workers(4, 100, 32), 4)
+        self.assertEqual(pool_workers(8, 5, 4), 5)
+        self.assertEqual(pool_workers(4, 31, 32), 0)
+        self.assertEqual(pool_workers(1, 100, 32), 0)
+        cpus = os.cpu_count() or 1
+        self.assertEqual(pool_workers(None, 100, 32), min(cpus, 100) if cpus > 1 else 0)
+
+    def test_load_large_tag_file(self):
+        """Test bulk loading keeps line numbers, duplicates and definition order."""
+        lines = [f"T{i}: {chr(97 + i % 26)}{i % 10}.*" for i in range(PARALLEL_THRESHOLD * 2)]
+        lines.insert(5, "BROKEN: a+")
+        lines.insert(10, "T0: b")
+        lines.insert(12, "")
+
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".lex") as f:
+            f.write("\n".join(lines) + "\n")
+            filepath = f.name
+
+        try:
+            handler = CommandHandler()
+            valid_tags, invalid_lines = handler.load_tags_from_file(filepath, workers=2)
+        finally:
+            os.unlink(filepath)
+
+        self.assertEqual(
+            invalid_lines, ["Line 6: Invalid tag definition", "Line 11: Duplicate tag name 'T0'"]
+        )
+        self.assertEqual(
+            [tag.name for tag in valid_tags], [f"T{i}" for i in range(PARALLEL_THRESHOLD * 2)]
+        )
+        self.assertEqual(handler.process_input("a0a0b1"), "T0 T1")
+
+    def test_warm_in_process_pool(self):
+        """Test that warming many tags adopts the automata compiled by the pool."""
+        handler = CommandHandler()
+        for i in range(PARALLEL_THRESHOLD):
+            handler.add_tag(Tag(f"T{i}", f"{chr(97 + i % 26)}{i % 10}.*"))
+        self.assertFalse(any(tag.is_compiled for tag in handler.tags))
+        handler.warm(workers=2)
+        self.assertTrue(all(tag.is_compiled for tag in handler.tags))
+        self.assertEqual(handler.process_input("a0a0b1"), "T0 T1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for the hash-consed regular expression AST.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import itertools
+import random
+import unittest
+
+from src.domain import regex_ast
+from src.domain.regex_ast import EMPTY, EPSILON, Regex
+from src.domain.regex_parser import RegexParser
+
+
+class TestRegexAst(unittest.TestCase):
+    """Test cases for AST construction."""
+
+    def setUp(self):
+        self.parser = RegexParser()
+
+    def test_hash_consing(self):
+        """Test that equal expressions are the same node."""
+        self.assertIs(self.parser.parse("ab.ba.+*"), self.parser.parse("ab.ba.+*"))
+        self.assertIs(regex_ast.char("a"), regex_ast.char("a"))
+
+    def test_union_is_normalized(self):
+        """Test union flattening, deduplication and ordering."""
+        self.assertIs(self.parser.parse("ab+"), self.parser.parse("ba+"))
+        self.assertIs(self.parser.parse("ab+c+"), self.parser.parse("abc++"))
+        self.assertIs(self.parser.parse("aa+"), regex_ast.char("a"))
+
+    def test_concat_identities(self):
+        """Test lambda identity and right-nested chains."""
+        self.assertIs(self.parser.parse("\\la."), regex_ast.char("a"))
+        self.assertIs(self.parser.parse("ab.c."), self.parser.parse("abc.."))
+        self.assertIs(regex_ast.concat(regex_ast.char("a"), EMPTY), EMPTY)
+
+    def test_star_identities(self):
+        """Test nested stars and stars of lambda."""
+        self.assertIs(self.parser.parse("a**"), self.parser.parse("a*"))
+        self.assertIs(self.parser.parse("\\l*"), EPSILON)
+
+    def test_nullable_and_chars(self):
+        """Test computed node attributes."""
+        node = self.parser.parse("ab.c*+")
+        self.assertEqual(node.kind, Regex.UNION)
+        self.assertTrue(node.nullable)
+        self.assertEqual(node.chars, frozenset("abc"))
+        self.assertFalse(self.parser.parse("ab.").nullable)
+
+    def test_empty_expression(self):
+        """Test that the empty expression is the empty language."""
+        self.assertIs(self.parser.parse(""), EMPTY)
+
+    def test_invalid_expression(self):
+        """Test that invalid expressions raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.parser.parse("a+")
+
+    def test_finite_language(self):
+        """Test extracting the words of literal expressions."""
+        self.assertEqual(regex_ast.finite_language(self.parser.parse("ab.c+"), 8), {"ab", "c"})
+        self.assertIsNone(regex_ast.finite_language(self.parser.parse("ab*."), 8))
+        self.assertIsNone(regex_ast.finite_language(self.parser.parse("\\.a+"), 8))
+        self.assertIsNone(regex_ast.finite_language(self.parser.parse("ab+cd+."), 3))
+
+    def test_finite_language_deep_nesting(self):
+        """Test that deeply nested unions do not hit the recursion limit."""
+        node = self.parser.parse("a" + "b+c." * 1200)
+        self.assertEqual(len(regex_ast.finite_language(node, 2000)), 1201)
+        self.assertIsNone(regex_ast.finite_language(node, 256))
+
+
+class TestSimplify(unittest.TestCase):
+    """Test cases for the simplification pass."""
+
+    def setUp(self):
+        self.parser = RegexParser()
+        self.raw = RegexParser(simplify=False)
+
+    def test_identities(self):
+        """Test the algebraic identities applied before construction."""
+        cases = {
+            "a\\l+*": "a*",
+            "a*b+*": "ab+*",
+            "a*b*.*": "ab+*",
+            "a*a*.": "a*",
+            "a*a*b..": "a*b.",
+            "aa*+": "a*",
+            "\\la*+": "a*",
+            "\\lab.+": "\\lab.+",
+        }
+        for expr, expected in cases.items():
+            with self.subTest(expr=expr):
+                self.assertIs(self.parser.parse(expr), self.raw.parse(expected))
+
+    def test_fewer_states(self):
+        """Test that redundant forms build no extra states."""
+        self.assertEqual(
+            len(self.parser.build_automaton("a**").states),
+            len(self.parser.build_automaton("a*").states),
+        )
+        self.assertEqual(len(self.parser.build_automaton("\\la.").states), 2)
+        self.assertLess(
+            len(self.parser.build_automaton("a*b*.*").states),
+            len(self.raw.build_automaton("a*b*.*").states),
+        )
+
+    def test_random_expressions_keep_language(self):
+        """Test simplified and unsimplified automata on random expressions."""
+        rng = random.Random(146)
+        words = ["".join(w) for n in range(5) for w in itertools.product("ab", repeat=n)]
+
+        def random_expression(depth):
+            if depth == 0 or rng.random() < 0.3:
+                return rng.choice(["a", "b", "\\l"])
+            operator = rng.choice("+.*")
+            if operator == "*":
+                return random_expression(depth - 1) + "*"
+            return random_expression(depth - 1) + random_expression(depth - 1) + operator
+
+        for _ in range(200):
+            expr = random_expression(4)
+            expected = self.raw.build_automaton(expr)
+            actual = self.parser.build_automaton(expr)
+            for word in words:
+                with self.subTest(expr=expr, word=word):
+                    self.assertEqual(actual.match(word, 0), expected.match(word, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
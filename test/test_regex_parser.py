@@ -154,6 +154,26 @@ class TestRegexParser(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.parser.build_automaton("aaa")
 
+    def test_tokenize(self):
+        """Test splitting an expression into RPN tokens."""
+        tokens = self.parser.tokenize("a\\l+\\*.*")
+        self.assertEqual(
+            tokens,
+            [
+                (RegexParser.CHAR, "a"),
+                (RegexParser.LAMBDA, ""),
+                (RegexParser.UNION, "+"),
+                (RegexParser.CHAR, "*"),
+                (RegexParser.CONCAT, "."),
+                (RegexParser.STAR, "*"),
+            ],
+        )
+
+    def test_unknown_construction(self):
+        """Test that an unknown construction is rejected."""
+        with self.assertRaises(ValueError):
+            RegexParser("unknown")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests for the LRU cache of tokenization results.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.application.command_handler import CommandHandler
+from src.application.lexer import LexError
+from src.application.result_cache import ResultCache
+from src.domain.tag import Tag
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for ResultCache."""
+
+    def test_get_and_put(self):
+        """Test hits, misses and the hit ratio."""
+        cache = ResultCache()
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", "A B", [LexError(1, "x")])
+        self.assertEqual(cache.get("a"), ("A B", [LexError(1, "x")]))
+        stats = cache.stats
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (1, 1, 1))
+        self.assertEqual(stats.hit_ratio, 0.5)
+        self.assertGreater(stats.bytes, 0)
+        self.assertEqual(ResultCache().stats.hit_ratio, 0.0)
+
+    def test_least_recently_used_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", "A", [])
+        cache.put("b", "B", [])
+        cache.get("a")
+        cache.put("c", "C", [])
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_byte_budget(self):
+        """Test that the byte budget bounds the cache and skips huge results."""
+        small = ResultCache(max_bytes=200)
+        small.put("big", "A " * 500, [])
+        self.assertEqual(small.stats.entries, 0)
+        small.put("a", "A" * 100, [])
+        small.put("b", "B" * 100, [])
+        self.assertEqual(small.stats.entries, 1)
+        self.assertLessEqual(small.stats.bytes, 200)
+        small.clear()
+        self.assertEqual((small.stats.entries, small.stats.bytes), (0, 0))
+
+    def test_invalid_limits(self):
+        """Test that the limits must be positive."""
+        with self.assertRaises(ValueError):
+            ResultCache(max_entries=0)
+
+
+class TestCommandHandlerResultCache(unittest.TestCase):
+    """Test cases for the result cache of CommandHandler."""
+
+    def setUp(self):
+        self.handler = CommandHandler()
+        self.handler.result_cache = ResultCache()
+        self.handler.add_tag(Tag("A", "a"))
+        self.handler.add_tag(Tag("B", "b"))
+
+    def test_process_input(self):
+        """Test that repeated inputs are served from the cache."""
+        self.assertEqual(self.handler.process_input("ab"), "A B")
+        self.assertEqual(self.handler.process_input("ab"), "A B")
+        self.assertEqual(self.handler.process_input("ba"), "B A")
+        stats = self.handler.result_cache.stats
+        self.assertEqual((stats.hits, stats.misses), (1, 2))
+
+    def test_tag_changes_invalidate(self):
+        """Test that adding tags invalidates cached results."""
+        self.handler.set_recovery(True)
+        self.assertEqual(self.handler.process_input("abc"), "A B <error>")
+        self.handler.add_tag(Tag("C", "c"))
+        self.assertEqual(self.handler.process_input("abc"), "A B C")
+        self.assertEqual(self.handler.last_errors, [])
+
+    def test_recovery_mode_is_part_of_the_key(self):
+        """Test that cached results keep their errors and recovery mode."""
+        self.handler.set_recovery(True)
+        self.handler.process_input("azb")
+        self.assertEqual(self.handler.process_input("azb"), "A <error> B")
+        self.assertEqual(self.handler.last_errors, [LexError(1, "z")])
+        self.handler.set_recovery(False)
+        with self.assertRaises(ValueError):
+            self.handler.process_input("azb")
+
+    def test_process_file(self):
+        """Test that unchanged files are not read again and changed files are."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
+            f.write("ab")
+            filepath = f.name
+        try:
+            self.assertEqual(self.handler.process_file(filepath), "A B")
+            # Same size and modification time: the file is not read again
+            info = os.stat(filepath)
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write("ba")
+            os.utime(filepath, ns=(info.st_atime_ns, info.st_mtime_ns))
+            self.assertEqual(self.handler.process_file(filepath), "A B")
+
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write("bba")
+            self.assertEqual(self.handler.process_file(filepath), "B B A")
+            self.assertEqual(self.handler.result_cache.stats.hits, 1)
+        finally:
+            os.unlink(filepath)
+
+        with self.assertRaises(FileNotFoundError):
+            self.handler.process_file(filepath)
+
+
+if __name__ == "__main__":
+    unittest.main()
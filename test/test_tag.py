@@ -6,7 +6,7 @@ Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
 
 import unittest
 
-from src.domain.tag import Tag, TagDefinitionParser
+from src.domain.tag import CompiledExpression, Tag, TagDefinitionParser
 
 
 class TestTag(unittest.TestCase):
@@ -34,6 +34,61 @@ class TestTag(unittest.TestCase):
         with self.assertRaises(ValueError):
             Tag("INVALID", "+")  # Invalid regex
 
+    def test_tag_first_chars(self):
+        """Test the FIRST set and nullability computed at compile time."""
+        tag = Tag("VAR", "ab.ba.+*")
+        self.assertEqual(tag.first_chars, frozenset("ab"))
+        self.assertTrue(tag.nullable)
+        self.assertFalse(tag.starts_with_any)
+
+        tag = Tag("ANY", "\\.a.")
+        self.assertFalse(tag.nullable)
+        self.assertTrue(tag.starts_with_any)
+
+    def test_tag_literal_split(self):
+        """Test extracting literal words from union branches."""
+        tag = Tag("KEYWORD", "if.else...+")
+        self.assertEqual(tag.literals, frozenset({"if", "else"}))
+        self.assertIsNone(tag.residual)
+
+        tag = Tag("MIXED", "if.ab+*+")
+        self.assertEqual(tag.literals, frozenset({"if"}))
+        self.assertEqual(tag.match_residual("abba", 0), 4)
+        self.assertEqual(tag.match_residual("if", 0), 0)
+
+        tag = Tag("VAR", "ab.ba.+*")
+        self.assertEqual(tag.literals, frozenset())
+        self.assertIs(tag.residual, tag.automaton)
+
+    def test_lazy_compilation(self):
+        """Test that automata are built on first use and by warm."""
+        tag = Tag("MIXED", "if.ab+*+")
+        self.assertFalse(tag.is_compiled)
+        self.assertEqual(tag.literals, frozenset({"if"}))
+        self.assertTrue(tag.has_residual)
+        self.assertFalse(tag.is_compiled)
+        self.assertEqual(tag.match("abba", 0), 4)
+        self.assertTrue(tag.is_compiled)
+
+        tag = Tag("KEYWORD", "if.")
+        self.assertFalse(tag.has_residual)
+        self.assertIsNone(tag.residual_simulator())
+        self.assertFalse(tag.is_compiled)
+        tag.warm()
+        self.assertTrue(tag.is_compiled)
+
+    def test_adopt(self):
+        """Test that automata compiled elsewhere replace only unbuilt ones."""
+        compiled = CompiledExpression.compile("ab.")
+        tag = Tag("AB", "ab.")
+        tag.adopt(compiled)
+        self.assertIs(tag.automaton, compiled.automaton)
+
+        built = Tag("AB", "ab.")
+        automaton = built.automaton
+        built.adopt(compiled)
+        self.assertIs(built.automaton, automaton)
+
     def test_tag_formal_definition(self):
         """Test getting formal definition."""
         tag = Tag("VAR", "a*")
@@ -41,6 +96,30 @@ class TestTag(unittest.TestCase):
         self.assertIn("VAR", definition)
         self.assertIn("a*", definition)
 
+    def test_tag_formal_definition_limit(self):
+        """Test streaming the formal definition with a transition limit."""
+        tag = Tag("VAR", "ab.ba.+*")
+        lines = list(tag.iter_formal_definition())
+        self.assertEqual("\n".join(lines), tag.get_formal_definition())
+        transitions = [line for line in lines if line.startswith("  δ")]
+
+        limited = list(tag.iter_formal_definition(limit=3))
+        self.assertEqual(
+            limited[: len(lines) - len(transitions) + 3], lines[: -len(transitions) + 3]
+        )
+        self.assertEqual(limited[-1], f"  ... {len(transitions) - 3} more transition(s)")
+
+    def test_tag_dot(self):
+        """Test the DOT digraph of a tag's automaton."""
+        tag = Tag("Q", 'a".\\n.')
+        lines = list(tag.iter_dot())
+        self.assertEqual(lines[0], 'digraph "Q" {')
+        self.assertEqual(lines[-1], "}")
+        self.assertIn('label="\\""', "\n".join(lines))
+        self.assertIn('label="\\n"', "\n".join(lines))
+        self.assertTrue(any("doublecircle" in line for line in lines))
+        self.assertTrue(any("style=dashed" in line for line in lines))
+
 
 class TestTagDefinitionParser(unittest.TestCase):
     """Test cases for TagDefinitionParser."""
@@ -116,6 +195,14 @@ class TestTagDefinitionParser(unittest.TestCase):
         self.assertIsNotNone(tag)
         self.assertEqual(tag.name, "NEWLINE")
 
+    def test_skip_tag_definition(self):
+        """Test parsing a skip tag and writing it back."""
+        tag = TagDefinitionParser.parse("~NL: \\n")
+        self.assertEqual((tag.name, tag.skip), ("NL", True))
+        self.assertEqual(tag.definition, "~NL: \\n")
+        self.assertFalse(TagDefinitionParser.parse("NL: \\n").skip)
+        self.assertIsNone(TagDefinitionParser.parse("~: a"))
+
     def test_invalid_tag_name_empty(self):
         """Test tag with empty name."""
         tag = TagDefinitionParser.parse(": a*")
@@ -0,0 +1,125 @@
+"""
+Tests for the binary token-stream format.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import io
+import random
+import unittest
+
+from src.application.lexer import LexicalAnalyzer
+from src.application.token_format import (
+    BinaryTokenReader,
+    BinaryTokenWriter,
+    Token,
+    decode_varint,
+    encode_varint,
+    read_tokens,
+)
+from src.domain.tag import Tag
+
+
+class TestTokenFormat(unittest.TestCase):
+    """Test cases for the binary writer and reader."""
+
+    def setUp(self):
+        digits = "01+2+3+4+5+6+7+8+9+"
+        self.lexer = LexicalAnalyzer(
+            [Tag("INT", f"{digits}{digits}*."), Tag("SPACE", " "), Tag("EQUALS", "=")]
+        )
+
+    def encode(self, text, spans=False):
+        buffer = io.BytesIO()
+        writer = BinaryTokenWriter(buffer, self.lexer.token_names, spans=spans)
+        writer.write_all(self.lexer.iter_token_spans(text))
+        writer.close()
+        return buffer.getvalue()
+
+    def test_varint_round_trip(self):
+        """Test varint encoding of small and large values."""
+        for value in [0, 1, 127, 128, 300, 2**32, 2**63]:
+            out = bytearray()
+            encode_varint(value, out)
+            self.assertEqual(decode_varint(out, 0), (value, len(out)))
+
+    def test_round_trip_names(self):
+        """Test that names decode to the text format."""
+        data = self.encode("10 = 2")
+        names = [token.name for token in read_tokens(io.BytesIO(data))]
+        self.assertEqual(" ".join(names), " ".join(self.lexer.tokenize("10 = 2")))
+
+    def test_round_trip_spans(self):
+        """Test that delta-encoded spans decode to absolute offsets."""
+        data = self.encode("10 = 2", spans=True)
+        tokens = list(read_tokens(io.BytesIO(data)))
+        self.assertEqual(tokens[0], Token("INT", 0, 2))
+        self.assertEqual(tokens[-1], Token("INT", 5, 6))
+
+    def test_concatenated_frames(self):
+        """Test reading several frames appended to one file."""
+        data = self.encode("1") + self.encode("2 3", spans=True)
+        tokens = list(read_tokens(io.BytesIO(data)))
+        self.assertEqual([token.name for token in tokens], ["INT", "INT", "SPACE", "INT"])
+        self.assertEqual(tokens[0].start, None)
+        self.assertEqual(tokens[3].start, 2)
+
+    def test_large_stream_across_chunks(self):
+        """Test decoding a stream larger than the reader's chunk size."""
+        text = "12 = 3 " * 40000
+        data = self.encode(text, spans=True)
+        reader = BinaryTokenReader(io.BytesIO(data))
+        count = sum(1 for _ in reader)
+        self.assertEqual(count, len(self.lexer.tokenize(text)))
+        self.assertLess(len(data), len(" ".join(self.lexer.tokenize(text))))
+
+    def test_multi_byte_records_across_chunks(self):
+        """Test ids, gaps and lengths of 128 and above mixed with one-byte records."""
+        rng = random.Random(33)
+        names = [f"T{i}" for i in range(300)]
+        records = []
+        pos = 0
+        for _ in range(60000):
+            start = pos + rng.choice((0, 0, 1, 200))
+            pos = start + rng.choice((1, 2, 5, 130))
+            records.append((rng.choice((0, 1, 5, 126, 127, 299)), start, pos))
+
+        for spans in (False, True):
+            with self.subTest(spans=spans):
+                buffer = io.BytesIO()
+                writer = BinaryTokenWriter(buffer, names, spans=spans)
+                writer.write_all(records)
+                writer.close()
+                data = buffer.getvalue() * 2
+
+                decoded = list(BinaryTokenReader(io.BytesIO(data)).iter_ids())
+                if spans:
+                    self.assertEqual(decoded, records * 2)
+                else:
+                    self.assertEqual([record[0] for record in decoded], [r[0] for r in records] * 2)
+                tokens = list(read_tokens(io.BytesIO(data)))
+                self.assertEqual(tokens[-1].name, names[records[-1][0]])
+
+    def test_truncated_stream(self):
+        """Test that a frame cut before its terminator is rejected."""
+        for spans in (False, True):
+            data = self.encode("10 = 2", spans=spans)
+            with self.subTest(spans=spans), self.assertRaises(ValueError):
+                list(read_tokens(io.BytesIO(data[:-1])))
+
+    def test_invalid_stream(self):
+        """Test rejection of foreign data and unknown versions."""
+        with self.assertRaises(ValueError):
+            list(read_tokens(io.BytesIO(b"NOPE\x01\x00\x00\x00")))
+        data = bytearray(self.encode("1"))
+        data[4] = 99
+        with self.assertRaises(ValueError):
+            list(read_tokens(io.BytesIO(bytes(data))))
+
+    def test_empty_input(self):
+        """Test that an empty file holds no tokens."""
+        self.assertEqual(list(read_tokens(io.BytesIO(b""))), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
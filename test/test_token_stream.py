@@ -0,0 +1,62 @@
+"""
+Tests for the compact token stream.
+
+Authors: Fabrício de Sousa Guidine, Débora Izabel Duarte, Guilherme, Juarez
+"""
+
+import unittest
+
+from src.application.lexer import LexicalAnalyzer
+from src.application.token_stream import TokenStream, id_typecode
+from src.domain.tag import Tag
+
+
+class TestTokenStream(unittest.TestCase):
+    """Test cases for TokenStream."""
+
+    def setUp(self):
+        digits = "01+2+3+4+5+6+7+8+9+"
+        self.lexer = LexicalAnalyzer([Tag("INT", digits), Tag("SPACE", " "), Tag("EQUALS", "=")])
+        self.text = "1000 = 12  3"
+
+    def test_round_trip(self):
+        """Test that both encodings render the space-separated format exactly."""
+        expected = " ".join(self.lexer.tokenize(self.text))
+        plain = self.lexer.tokenize_ids(self.text)
+        encoded = self.lexer.tokenize_ids(self.text, run_length=True)
+        self.assertEqual(plain.to_text(), expected)
+        self.assertEqual(encoded.to_text(), expected)
+        self.assertEqual(list(encoded), list(plain))
+        self.assertEqual(len(encoded), len(plain))
+
+    def test_run_length_encoding(self):
+        """Test that repeated ids are stored once with a count."""
+        stream = self.lexer.tokenize_ids(self.text, run_length=True)
+        self.assertEqual(
+            list(stream.runs()), [(0, 4), (1, 1), (2, 1), (1, 1), (0, 2), (1, 2), (0, 1)]
+        )
+        self.assertEqual(len(stream.ids), 7)
+        self.assertEqual(len(stream), 12)
+
+    def test_error_token_id(self):
+        """Test that recovery errors use the id after the last tag."""
+        errors = []
+        stream = self.lexer.tokenize_ids("1x", errors=errors)
+        self.assertEqual(list(stream.iter_ids()), [0, 3])
+        self.assertEqual(stream.to_text(), "INT <error>")
+        self.assertEqual(len(errors), 1)
+
+    def test_typecode(self):
+        """Test the id array width for the size of the name table."""
+        self.assertEqual(id_typecode(3), "B")
+        self.assertEqual(id_typecode(300), "H")
+        self.assertEqual(id_typecode(70000), "I")
+        self.assertEqual(TokenStream(("A",)).ids.typecode, "B")
+
+    def test_empty_stream(self):
+        """Test rendering an empty stream."""
+        self.assertEqual(TokenStream(("A",), run_length=True).to_text(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()